@@ -196,7 +196,9 @@ class Panel(HorizonComponent):
         The ``nav`` attribute can be either boolean value or a callable
         which accepts a ``RequestContext`` object as a single argument
         to control whether or not this panel should appear in
-        automatically-generated navigation. Default: ``True``.
+        automatically-generated navigation. The navigation is cached for
+        each user token, so the callable should only depend on the user
+        (e.g. on their roles or service catalog). Default: ``True``.
 
     .. attribute:: index_url_name
 
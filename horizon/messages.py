@@ -27,7 +27,9 @@ from django.utils.safestring import SafeData  # noqa
 
 def add_message(request, level, message, extra_tags='', fail_silently=False):
     """Attempts to add a message to the request using the 'messages' app."""
-    if request.is_ajax():
+    # Messages added while a page is streamed are sent along with it, as
+    # they are for AJAX requests.
+    if request.is_ajax() or getattr(request, 'horizon', {}).get('streaming'):
         tag = constants.DEFAULT_TAGS[level]
         # if message is marked as safe, pass "safe" tag as extra_tags so that
         # client can skip HTML escape for the message when rendering
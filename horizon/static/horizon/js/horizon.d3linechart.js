@@ -43,6 +43,14 @@ Url has to return JSON in format:
   "settings": {}
 }
 
+The chart asks for the series to be downsampled to its width in pixels and
+sent in a columnar format, where the x values are seconds since the epoch:
+{
+  "series": [{"name": "instance-00000005",
+              "x": [1377084145, 1377084745], "y": [171, 171]}],
+  "settings": {}
+}
+
 Example of line-bar chart sparkline:
 
   <div class="overview_chart">
@@ -340,14 +348,31 @@ horizon.d3_line_chart = {
       var self = this;
 
       self.start_loading();
+      // Ask for no more points than the chart has pixels.
+      var url = self.final_url;
+      url += (url.indexOf('?') > -1) ? '&' : '?';
+      url += 'format=columnar';
+      var width = $(self.html_element).width();
+      if (width > 0) {
+        url += '&width=' + width;
+      }
       horizon.ajax.queue({
-        url: self.final_url,
+        url: url,
         success: function (data, textStatus, jqXHR) {
           // Clearing the old chart data.
           $(self.html_element).html('');
           $(self.legend_element).html('');
 
           self.series = data.series;
+          $.map(self.series, function (serie) {
+            if (serie.data === undefined && serie.x !== undefined) {
+              serie.data = $.map(serie.x, function (x, i) {
+                return {x: x, y: serie.y[i]};
+              });
+              delete serie.x;
+              delete serie.y;
+            }
+          });
           self.stats = data.stats;
           // The highest priority settings are sent with the data.
           self.apply_settings(data.settings);
@@ -387,9 +412,11 @@ horizon.d3_line_chart = {
       $.map(self.series, function (serie) {
         serie.color = last_point_color = self.color(serie.name);
         $.map(serie.data, function (statistic) {
-           // need to parse each date
-          statistic.x = d3.time.format('%Y-%m-%dT%H:%M:%S').parse(statistic.x);
-          statistic.x = statistic.x.getTime() / 1000;
+          if (typeof statistic.x === 'string') {
+            // need to parse each date
+            statistic.x = d3.time.format('%Y-%m-%dT%H:%M:%S').parse(statistic.x);
+            statistic.x = statistic.x.getTime() / 1000;
+          }
           last_point = statistic;
           last_point.color = serie.color;
         });
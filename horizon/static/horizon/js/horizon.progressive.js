@@ -0,0 +1,25 @@
+/* Support for progressively rendered pages, which are sent with a
+ * placeholder for each of their tables and tabs, followed by each table or
+ * tab as soon as its data is loaded (see horizon.utils.progressive). */
+horizon.progressive = {
+  // Replaces a placeholder with the fragment streamed in for it.
+  fill: function (id) {
+    var $fragment = $("#" + id + "__fragment");
+    $("#" + id).replaceWith($fragment.contents());
+    $fragment.remove();
+  },
+
+  // Shows messages added while the page was streamed, once the page and
+  // its client-side templates are ready.
+  alert: function (messages) {
+    $(function () {
+      $(messages).each(function (index, item) {
+        horizon.alert(item[0], item[1], item[2]);
+      });
+    });
+  },
+
+  redirect: function (url) {
+    window.location = url;
+  }
+};
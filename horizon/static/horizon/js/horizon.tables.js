@@ -15,98 +15,177 @@ horizon.datatables = {
         $table.removeAttr('decay_constant');
         return;
       }
-      // Trigger the update handlers.
-      $rows_to_update.each(function(index, row) {
-        var $row = $(this),
-            $table = $row.closest('table.datatable');
-        horizon.ajax.queue({
-          url: $row.attr('data-update-url'),
-          error: function (jqXHR, textStatus, errorThrown) {
-            switch (jqXHR.status) {
-              // A 404 indicates the object is gone, and should be removed from the table
-              case 404:
-                // Update the footer count and reset to default empty row if needed
-                var $footer, row_count, footer_text, colspan, template, params, $empty_row;
-
-                // existing count minus one for the row we're removing
-                row_count = horizon.datatables.update_footer_count($table, -1);
-
-                if(row_count === 0) {
-                  colspan = $table.find('th[colspan]').attr('colspan');
-                  template = horizon.templates.compiled_templates["#empty_row_template"];
-                  params = {"colspan": colspan};
-                  empty_row = template.render(params);
-                  $row.replaceWith(empty_row);
-                } else {
-                  $row.remove();
-                }
-                // Reset tablesorter's data cache.
-                $table.trigger("update");
-                break;
-              default:
-                horizon.utils.log(gettext("An error occurred while updating."));
-                $row.removeClass("ajax-update");
-                $row.find("i.ajax-updating").remove();
-                break;
-            }
-          },
-          success: function (data, textStatus, jqXHR) {
-            var $new_row = $(data);
-
-            if ($new_row.hasClass('status_unknown')) {
-              var spinner_elm = $new_row.find("td.status_unknown:last");
-
-              if ($new_row.find('a.btn-action-required').length > 0) {
-                spinner_elm.prepend(
-                     $("<div />")
-                     .addClass("action_required_img")
-                     .append(
-                         $("<img />")
-                         .attr("src", "/static/dashboard/img/action_required.png")));
-              } else {
-                // Replacing spin.js here with an animated gif to reduce CPU
-                spinner_elm.prepend(
-                     $("<div />")
-                     .addClass("loading_gif")
-                     .append(
-                         $("<img />")
-                         .attr("src", "/static/dashboard/img/loading.gif")));
-              }
-            }
-
-            // Only replace row if the html content has changed
-            if($new_row.html() != $row.html()) {
-              if($row.find('.table-row-multi-select:checkbox').is(':checked')) {
-                // Preserve the checkbox if it's already clicked
-                $new_row.find('.table-row-multi-select:checkbox').prop('checked', true);
-              }
-              $row.replaceWith($new_row);
-              // Reset tablesorter's data cache.
-              $table.trigger("update");
-              // Reset decay constant.
-              $table.removeAttr('decay_constant');
-            }
-          },
-          complete: function (jqXHR, textStatus) {
-            // Revalidate the button check for the updated table
-            horizon.datatables.validate_button();
-
-            // Set interval decay to this table, and increase if it already exist
-            if(decay_constant === undefined) {
-              decay_constant = 1;
-            } else {
-              decay_constant++;
-            }
-            $table.attr('decay_constant', decay_constant);
-            // Poll until there are no rows in an "unknown" state on the page.
-            next_poll = interval * decay_constant;
-            // Limit the interval to 30 secs
-            if(next_poll > 30 * 1000) next_poll = 30 * 1000;
-            setTimeout(horizon.datatables.update, next_poll);
+      // Trigger the update handlers, in a single request per table when
+      // the table supports it.
+      $rows_to_update.closest('table.datatable').each(function () {
+        var $table = $(this),
+            $rows = $rows_to_update.filter(function () {
+              return $(this).closest('table.datatable')[0] === $table[0];
+            });
+        if ($table.attr('data-batch-update-url')) {
+          horizon.datatables.update_rows($table, $rows, interval,
+                                         decay_constant);
+        } else {
+          $rows.each(function () {
+            horizon.datatables.update_row($table, $(this), interval,
+                                          decay_constant);
+          });
+        }
+      });
+    }
+  },
+
+  update_row: function ($table, $row, interval, decay_constant) {
+    horizon.ajax.queue({
+      url: $row.attr('data-update-url'),
+      // Send the row's ETag, so unchanged rows aren't sent back.
+      ifModified: true,
+      error: function (jqXHR, textStatus, errorThrown) {
+        switch (jqXHR.status) {
+          // A 404 indicates the object is gone, and should be removed from the table
+          case 404:
+            horizon.datatables.remove_row($table, $row);
+            break;
+          default:
+            horizon.datatables.row_update_failed($row);
+            break;
+        }
+      },
+      success: function (data, textStatus, jqXHR) {
+        if (textStatus !== 'notmodified') {
+          horizon.datatables.replace_row($table, $row, data);
+        }
+      },
+      complete: function (jqXHR, textStatus) {
+        horizon.datatables.schedule_update($table, interval, decay_constant);
+      }
+    });
+  },
+
+  update_rows: function ($table, $rows, interval, decay_constant) {
+    var ids = $rows.map(function () {
+          return $(this).attr('data-object-id');
+        }).get(),
+        etags = $rows.map(function () {
+          return $(this).attr('data-etag') || '';
+        }).get();
+    horizon.ajax.queue({
+      url: $table.attr('data-batch-update-url'),
+      data: {obj_ids: ids, etags: etags},
+      traditional: true,
+      dataType: 'json',
+      error: function (jqXHR, textStatus, errorThrown) {
+        $rows.each(function () {
+          horizon.datatables.row_update_failed($(this));
+        });
+      },
+      success: function (data, textStatus, jqXHR) {
+        $rows.each(function () {
+          var $row = $(this),
+              id = $row.attr('data-object-id');
+          if (data.rows.hasOwnProperty(id)) {
+            horizon.datatables.replace_row($table, $row, data.rows[id],
+                                           data.etags[id]);
+          } else if ($.inArray(id, data.unchanged) > -1) {
+            return;
+          } else if ($.inArray(id, data.removed) > -1) {
+            horizon.datatables.remove_row($table, $row);
+          } else {
+            horizon.datatables.row_update_failed($row);
           }
         });
-      });
+      },
+      complete: function (jqXHR, textStatus) {
+        horizon.datatables.schedule_update($table, interval, decay_constant);
+      }
+    });
+  },
+
+  replace_row: function ($table, $row, html, etag) {
+    var $new_row = $(html);
+
+    if (etag) {
+      $row.attr('data-etag', etag);
+      $new_row.attr('data-etag', etag);
+    }
+
+    if ($new_row.hasClass('status_unknown')) {
+      var spinner_elm = $new_row.find("td.status_unknown:last");
+
+      if ($new_row.find('a.btn-action-required').length > 0) {
+        spinner_elm.prepend(
+             $("<div />")
+             .addClass("action_required_img")
+             .append(
+                 $("<img />")
+                 .attr("src", "/static/dashboard/img/action_required.png")));
+      } else {
+        // Replacing spin.js here with an animated gif to reduce CPU
+        spinner_elm.prepend(
+             $("<div />")
+             .addClass("loading_gif")
+             .append(
+                 $("<img />")
+                 .attr("src", "/static/dashboard/img/loading.gif")));
+      }
+    }
+
+    // Only replace row if the html content has changed
+    if($new_row.html() != $row.html()) {
+      if($row.find('.table-row-multi-select:checkbox').is(':checked')) {
+        // Preserve the checkbox if it's already clicked
+        $new_row.find('.table-row-multi-select:checkbox').prop('checked', true);
+      }
+      $row.replaceWith($new_row);
+      // Reset tablesorter's data cache.
+      $table.trigger("update");
+      // Reset decay constant.
+      $table.removeAttr('decay_constant');
+    }
+  },
+
+  remove_row: function ($table, $row) {
+    // Update the footer count and reset to default empty row if needed
+    var row_count, colspan, template, params, empty_row;
+
+    // existing count minus one for the row we're removing
+    row_count = horizon.datatables.update_footer_count($table, -1);
+
+    if(row_count === 0) {
+      colspan = $table.find('th[colspan]').attr('colspan');
+      template = horizon.templates.compiled_templates["#empty_row_template"];
+      params = {"colspan": colspan};
+      empty_row = template.render(params);
+      $row.replaceWith(empty_row);
+    } else {
+      $row.remove();
+    }
+    // Reset tablesorter's data cache.
+    $table.trigger("update");
+  },
+
+  row_update_failed: function ($row) {
+    horizon.utils.log(gettext("An error occurred while updating."));
+    $row.removeClass("ajax-update");
+    $row.find("i.ajax-updating").remove();
+  },
+
+  schedule_update: function ($table, interval, decay_constant) {
+    // Revalidate the button check for the updated table
+    horizon.datatables.validate_button();
+
+    // Set interval decay to this table, and increase if it already exist
+    if(decay_constant === undefined) {
+      decay_constant = 1;
+    } else {
+      decay_constant++;
     }
+    $table.attr('decay_constant', decay_constant);
+    // Poll until there are no rows in an "unknown" state on the page.
+    next_poll = interval * decay_constant;
+    // Limit the interval to 30 secs
+    if(next_poll > 30 * 1000) next_poll = 30 * 1000;
+    setTimeout(horizon.datatables.update, next_poll);
   },
 
   validate_button: function () {
@@ -123,13 +123,37 @@ class BaseAction(html.HTMLElement):
         """
         return True
 
+    def allowed_many(self, request, data):
+        """Determine whether this row action is allowed for each of the
+        items in ``data`` at once.
+
+        This method may be overridden to return a list of booleans, one for
+        each item in ``data``, when checking all of the table's rows together
+        is cheaper than calling :meth:`allowed` for each of them. The
+        results are used instead of calling :meth:`allowed` for those rows,
+        so any state :meth:`allowed` would set on the action must not be
+        needed. Returns ``None`` by default, meaning :meth:`allowed` is
+        called for every row.
+        """
+        return None
+
     def _allowed(self, request, datum):
         policy_check = getattr(settings, "POLICY_CHECK_FUNCTION", None)
 
         if policy_check and self.policy_rules:
             target = self.get_policy_target(request, datum)
             return (policy_check(self.policy_rules, request, target) and
-                    self.allowed(request, datum))
+                    self._check_allowed(request, datum))
+        return self._check_allowed(request, datum)
+
+    def _check_allowed(self, request, datum):
+        # Results of allowed_many() are only available while the table's
+        # rows are being rendered.
+        bulk_allowed = getattr(self.table, '_bulk_allowed', {})
+        if datum is not None and self.name in bulk_allowed:
+            results = bulk_allowed[self.name]
+            if id(datum) in results:
+                return results[id(datum)]
         return self.allowed(request, datum)
 
     def update(self, request, datum):
@@ -143,6 +167,17 @@ class BaseAction(html.HTMLElement):
         """
         pass
 
+    def update_many(self, request, data):
+        """Prepares per-row customization for all items in ``data`` at once.
+
+        Called a single time, before :meth:`update` is called for each row,
+        with every item displayed in the table. Override it to fetch
+        whatever :meth:`update` needs in bulk rather than row by row.
+
+        By default this method is a no-op.
+        """
+        pass
+
     def get_default_classes(self):
         """Returns a list of the default classes for the action. Defaults to
         ``["btn", "btn-small"]``.
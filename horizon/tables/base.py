@@ -16,6 +16,7 @@
 
 import collections
 import copy
+import hashlib
 import json
 import logging
 from operator import attrgetter  # noqa
@@ -25,16 +26,24 @@ from django.conf import settings  # noqa
 from django.core import exceptions as core_exceptions
 from django.core import urlresolvers
 from django import forms
+from django.forms.util import flatatt  # noqa
 from django.http import HttpResponse  # noqa
+from django.http import HttpResponseNotModified  # noqa
 from django import template
 from django.template.defaultfilters import truncatechars  # noqa
 from django.template.loader import render_to_string  # noqa
 from django.utils.datastructures import SortedDict  # noqa
+from django.utils.encoding import force_unicode  # noqa
+from django.utils.formats import localize  # noqa
+from django.utils.html import conditional_escape  # noqa
 from django.utils.html import escape  # noqa
+from django.utils.html import strip_spaces_between_tags  # noqa
 from django.utils import http
 from django.utils.http import urlencode  # noqa
 from django.utils.safestring import mark_safe  # noqa
 from django.utils import termcolors
+from django.utils.timezone import template_localtime  # noqa
+from django.utils import translation
 from django.utils.translation import ugettext_lazy as _  # noqa
 
 from horizon import conf
@@ -463,10 +472,17 @@ class Row(html.HTMLElement):
         updates of cell. Generally you won't need to change this value.
         It is also used for inline edit of the cell.
         Default: ``"cell_update"``.
+
+    .. attribute:: ajax_batch_action_name
+
+        String that is used for the query parameter key to request AJAX
+        updates of several rows at once. Generally you won't need to change
+        this value. Default: ``"rows_update"``.
     """
     ajax = False
     ajax_action_name = "row_update"
     ajax_cell_action_name = "cell_update"
+    ajax_batch_action_name = "rows_update"
 
     def __init__(self, table, datum=None):
         super(Row, self).__init__()
@@ -569,6 +585,29 @@ class Row(html.HTMLElement):
         raise NotImplementedError("You must define a get_data method on %s"
                                   % self.__class__.__name__)
 
+    def get_data_many(self, request, obj_ids):
+        """Fetches the updated data for several rows at once, based on the
+        object ids passed in.
+
+        Returns a dictionary mapping object ids to their data. The rows
+        whose id is missing from it are fetched one by one with
+        :meth:`~horizon.tables.Row.get_data`, so this only needs to return
+        the objects it can retrieve cheaply, typically with a single list
+        call. By default it returns an empty dictionary.
+        """
+        return {}
+
+    def get_fingerprint(self, datum):
+        """Returns a value which changes whenever the row rendered for
+        ``datum`` would, such as the object's status and last update time.
+
+        When defined, AJAX updates of rows whose fingerprint hasn't changed
+        since they were last sent to the browser answer "not modified"
+        without rendering them. By default it returns ``None``, so rows are
+        always rendered.
+        """
+        return None
+
 
 class Cell(html.HTMLElement):
     """Represents a single cell in the table."""
@@ -740,6 +779,233 @@ class Cell(html.HTMLElement):
                                 {"cell": self})
 
 
+def _status_class(status):
+    if status is True:
+        return "status_up"
+    elif status is False:
+        return "status_down"
+    else:
+        return "status_unknown"
+
+
+def _overrides(cls, base, names):
+    """Returns ``True`` if ``cls`` overrides any of ``names`` from ``base``."""
+    for klass in cls.__mro__:
+        if klass is base:
+            return False
+        if any(name in klass.__dict__ for name in names):
+            return True
+    return False
+
+
+class CompiledRow(object):
+    """A row which has already been rendered to HTML by a
+    :class:`RowRenderer`. It stands in for :class:`Row` in the table
+    template.
+    """
+    def __init__(self, id, datum, html):
+        self.id = id
+        self.datum = datum
+        self.html = html
+
+    def __repr__(self):
+        return '<%s: %s>' % (self.__class__.__name__, self.id)
+
+    def render(self):
+        return self.html
+
+
+class RowRenderer(object):
+    """Renders the rows of a :class:`DataTable` straight to HTML.
+
+    The work that doesn't depend on the row (column lookups, status and
+    display choices, CSS classes) is done once per column when the renderer
+    is created, and each row is then written out without creating any
+    :class:`Row` or :class:`Cell` objects or rendering any templates. The
+    output is the same as that of the row and cell templates.
+
+    Used when the table's ``compiled_rows`` option is set. Tables which
+    customize rendering in ways the renderer can't reproduce (see
+    :meth:`supports`) use the template based rows instead.
+    """
+    row_overrides = ("__init__", "load_cells", "render", "status",
+                     "status_class", "get_ajax_update_url")
+
+    def __init__(self, table):
+        self.table = table
+        self.row_class = table._meta.row_class
+        self.status_columns = table._meta.status_columns
+        if self.row_class.ajax:
+            self.table_url = table.get_absolute_url()
+            self.poll_interval = conf.HORIZON_CONFIG['ajax_poll_interval']
+        self.cells = [(column.name or column.auto, self.compile(column))
+                      for column in table.columns.values()]
+
+    @classmethod
+    def supports(cls, table):
+        """Returns whether rows of ``table`` can be rendered this way."""
+        meta = table._meta
+        if meta.cell_class is not Cell:
+            return False
+        if _overrides(meta.row_class, Row, cls.row_overrides):
+            return False
+        for column in table.columns.values():
+            if column.update_action or column.auto == "form_field":
+                return False
+        return True
+
+    def compile(self, column):
+        """Returns a function which takes a datum and its id and returns the
+        HTML for its cell in ``column`` along with the cell's status.
+        """
+        table = self.table
+        cache = table._data_cache[column]
+        get_data = self.compile_data(column)
+        has_status = (column.status or
+                      column.name in self.status_columns)
+        status_choices = {}
+        # The first matching choice wins, as in Cell.status.
+        for name, value in reversed(column.status_choices):
+            status_choices[unicode(name).lower()] = value
+        link_classes = ' '.join(column.link_classes)
+        empty_value = column.empty_value
+        # The CSS classes only depend on the status and on whether the cell
+        # is a link; Cell.get_default_classes drops "anchor" from the column
+        # once it has a cell which isn't.
+        class_strings = {}
+
+        def get_classes(url, status):
+            if not url and "anchor" in column.classes:
+                column.classes = [cls for cls in column.classes
+                                  if cls != "anchor"]
+                class_strings.clear()
+            key = (bool(url), status)
+            if key not in class_strings:
+                column_classes = column.get_final_attrs().get('class', "")
+                classes = set(column_classes.split(" "))
+                if column.status:
+                    classes.add(_status_class(status))
+                attrs = {'class': " ".join(list(classes)).strip()}
+                class_strings[key] = flatatt(attrs)
+            return class_strings[key]
+
+        if column.auto == "multi_select":
+            widget = forms.CheckboxInput(check_test=lambda value: False)
+
+            def get_data(datum, datum_id):
+                data = widget.render('object_ids', unicode(datum_id),
+                                     {'class': 'table-row-multi-select'})
+                cache[datum_id] = data
+                return data
+        elif column.auto == "actions":
+            def get_data(datum, datum_id):
+                data = table.render_row_actions(datum)
+                cache[datum_id] = data
+                return data
+
+        def render_cell(datum, datum_id):
+            data = get_data(datum, datum_id)
+            status = None
+            if has_status:
+                status = status_choices.get(unicode(data).lower())
+            value = data
+            if value is None:
+                if callable(empty_value):
+                    value = empty_value(datum)
+                else:
+                    value = empty_value
+            url = None
+            if column.link:
+                url = column.get_link_url(datum) or None
+            if url:
+                value = mark_safe('<a href="%s" class="%s">%s</a>' %
+                                  (url, link_classes, escape(unicode(value))))
+            value = template_localtime(value)
+            value = conditional_escape(force_unicode(localize(value)))
+            html = u'<td%s>%s</td>' % (get_classes(url, status), value)
+            return html, status
+        return render_cell
+
+    def compile_data(self, column):
+        """Returns a function equivalent to
+        :meth:`~horizon.tables.Column.get_data` for ``column``.
+        """
+        if _overrides(type(column), Column, ("get_data",)):
+            return lambda datum, datum_id: column.get_data(datum)
+        cache = self.table._data_cache[column]
+        get_raw_data = column.get_raw_data
+        filters = tuple(column.filters)
+        truncate = column.truncate
+        display_choices = None
+        if column.display_choices:
+            display_choices = {}
+            for value, display in reversed(column.display_choices):
+                display_choices[value.lower()] = display
+
+        def get_data(datum, datum_id):
+            if datum_id in cache:
+                return cache[datum_id]
+            data = get_raw_data(datum)
+            if display_choices and (data or '').lower() in display_choices:
+                data = display_choices[(data or '').lower()]
+            else:
+                for filter_func in filters:
+                    data = filter_func(data)
+            if data and truncate:
+                data = truncatechars(data, truncate)
+            cache[datum_id] = data
+            return data
+        return get_data
+
+    def render(self, datum, selected=False):
+        """Returns a :class:`CompiledRow` for ``datum``."""
+        table = self.table
+        datum_id = table.get_object_id(datum)
+        cells = []
+        statuses = {}
+        for name, render_cell in self.cells:
+            html, status = render_cell(datum, datum_id)
+            cells.append(html)
+            statuses[name] = status
+
+        attrs = dict(getattr(self.row_class, 'attrs', {}))
+        classes = list(getattr(self.row_class, 'classes', []))
+        if self.row_class.ajax:
+            params = urlencode({"table": table.name,
+                                "action": self.row_class.ajax_action_name,
+                                "obj_id": datum_id})
+            attrs['data-update-interval'] = self.poll_interval
+            attrs['data-update-url'] = "%s?%s" % (self.table_url, params)
+            classes.append("ajax-update")
+        attrs['data-object-id'] = datum_id
+        if self.status_columns:
+            status = table.calculate_row_status(
+                dict([(name, statuses[name])
+                      for name in self.status_columns]))
+            classes.append(table.get_row_status_class(status))
+        else:
+            classes.append('')
+        id_vals = {"table": table.name,
+                   "sep": STRING_SEPARATOR,
+                   "id": datum_id}
+        row_id = "%(table)s%(sep)srow%(sep)s%(id)s" % id_vals
+        attrs['id'] = row_id
+        display_name = table.get_object_display(datum)
+        if display_name:
+            attrs['data-display'] = escape(display_name)
+        if selected:
+            classes.append('current_selected')
+        defined = attrs.get('class', '')
+        additional = " ".join(classes)
+        attrs['class'] = " ".join([test for test in (defined, additional)
+                                   if test]).strip()
+
+        html = u'<tr%s>\n    %s\n</tr>\n' % (
+            flatatt(attrs),
+            strip_spaces_between_tags(u''.join(cells).strip()))
+        return CompiledRow(row_id, datum, mark_safe(html))
+
+
 class DataTableOptions(object):
     """Contains options for :class:`.DataTable` objects.
 
@@ -855,6 +1121,16 @@ class DataTableOptions(object):
 
         A list of permission names which this table requires in order to be
         displayed. Defaults to an empty list (``[]``).
+
+    .. attribute:: compiled_rows
+
+        Boolean to control whether the rows of the table are written out
+        directly by a :class:`~horizon.tables.base.RowRenderer` instead of
+        being rendered through the row and cell templates. This is much
+        faster for large tables. Tables with a custom ``cell_class``,
+        inline editing or a ``row_class`` which changes how rows are built
+        are always rendered through the templates.
+        Default: ``False``.
     """
     def __init__(self, options):
         self.name = getattr(options, 'name', self.__class__.__name__)
@@ -875,6 +1151,7 @@ class DataTableOptions(object):
                                        "no_data_message",
                                        _("No items to display."))
         self.permissions = getattr(options, 'permissions', [])
+        self.compiled_rows = getattr(options, 'compiled_rows', False)
 
         # Set self.filter if we have any FilterActions
         filter_actions = [action for action in self.table_actions if
@@ -1130,6 +1407,17 @@ class DataTable(object):
         context = template.RequestContext(self.request, extra_context)
         return table_template.render(context)
 
+    def get_batch_update_url(self):
+        """Returns the URL used to update several of the table's rows at
+        once by AJAX, or ``None`` if its rows aren't updated by AJAX.
+        """
+        row_class = self._meta.row_class
+        if not row_class.ajax:
+            return None
+        params = urlencode({"table": self.name,
+                            "action": row_class.ajax_batch_action_name})
+        return "%s?%s" % (self.get_absolute_url(), params)
+
     def get_absolute_url(self):
         """Returns the canonical URL for this table.
 
@@ -1202,8 +1490,36 @@ class DataTable(object):
         return [action for action in bound_actions if
                 self._filter_action(action, self.request)]
 
+    def _populate_bulk_allowed(self):
+        """Calls the :meth:`~horizon.tables.Action.allowed_many` method of
+        each row action once with every item in the table, and stores the
+        results by ``id(datum)`` for use while rendering the rows.
+        """
+        if hasattr(self, '_bulk_allowed'):
+            return
+        # Set first, so that the calls below fall back to allowed().
+        self._bulk_allowed = {}
+        bulk_allowed = {}
+        data = list(self.filtered_data or [])
+        for action in self._meta.row_actions:
+            base_action = self.base_actions[action.name]
+            try:
+                base_action.update_many(self.request, data)
+                results = base_action.allowed_many(self.request, data)
+            except Exception:
+                LOG.exception("Error while checking action permissions.")
+                results = None
+            if results is not None:
+                bulk_allowed[action.name] = dict(
+                    (id(datum), result)
+                    for datum, result in zip(data, results))
+        self._bulk_allowed = bulk_allowed
+        # Keep the items alive so that their ids remain unique.
+        self._bulk_allowed_data = data
+
     def get_row_actions(self, datum):
         """Returns a list of the action instances for a specific row."""
+        self._populate_bulk_allowed()
         bound_actions = []
         for action in self._meta.row_actions:
             # Copy to allow modifying properties per row
@@ -1239,13 +1555,22 @@ class DataTable(object):
         """Renders the actions specified in ``Meta.row_actions`` using the
         current row data.
         """
-        template_path = self._meta.row_actions_template
-        row_actions_template = template.loader.get_template(template_path)
+        # The template and the context are the same for every row, so they
+        # are only loaded once per table.
+        if not hasattr(self, '_row_actions_template'):
+            template_path = self._meta.row_actions_template
+            self._row_actions_template = \
+                template.loader.get_template(template_path)
+            self._row_actions_context = template.RequestContext(self.request)
         bound_actions = self.get_row_actions(datum)
         extra_context = {"row_actions": bound_actions,
                          "row_id": self.get_object_id(datum)}
-        context = template.RequestContext(self.request, extra_context)
-        return row_actions_template.render(context)
+        context = self._row_actions_context
+        context.update(extra_context)
+        try:
+            return self._row_actions_template.render(context)
+        finally:
+            context.pop()
 
     @staticmethod
     def parse_action(action_string):
@@ -1324,18 +1649,35 @@ class DataTable(object):
             # Handle AJAX row updating.
             new_row = self._meta.row_class(self)
             if new_row.ajax and new_row.ajax_action_name == action_name:
+                if_none_match = request.META.get('HTTP_IF_NONE_MATCH', '')
+                not_modified = False
                 try:
                     datum = new_row.get_data(request, obj_id)
-                    new_row.load_cells(datum)
+                    etag = self.get_row_etag(new_row, datum)
+                    if etag and etag in http.parse_etags(if_none_match):
+                        not_modified = True
+                    else:
+                        new_row.load_cells(datum)
                     error = False
                 except Exception:
                     datum = None
                     error = exceptions.handle(request, ignore=True)
                 if request.is_ajax():
-                    if not error:
-                        return HttpResponse(new_row.render())
-                    else:
+                    if error:
                         return HttpResponse(status=error.status_code)
+                    if not_modified:
+                        response = HttpResponseNotModified()
+                    else:
+                        response = HttpResponse(new_row.render())
+                    if etag:
+                        response['ETag'] = http.quote_etag(etag)
+                    return response
+            elif new_row.ajax and \
+                    new_row.ajax_batch_action_name == action_name:
+                if request.is_ajax():
+                    obj_ids = request.GET.getlist('obj_ids')
+                    etags = request.GET.getlist('etags')
+                    return self.batch_update_handle(request, obj_ids, etags)
             elif new_row.ajax_cell_action_name == action_name:
                 # inline edit of the cell actions
                 return self.inline_edit_handle(request, table_name,
@@ -1352,6 +1694,63 @@ class DataTable(object):
                             return handled
         return None
 
+    def get_row_etag(self, row, datum):
+        """Returns the entity tag of the row rendered for ``datum``, based
+        on the row's :meth:`~horizon.tables.Row.get_fingerprint`, or
+        ``None`` if it has no fingerprint.
+        """
+        fingerprint = row.get_fingerprint(datum)
+        if fingerprint is None:
+            return None
+        key = (self.name, self.get_object_id(datum),
+               translation.get_language(), fingerprint)
+        return hashlib.md5(repr(key)).hexdigest()
+
+    def batch_update_handle(self, request, obj_ids, etags=None):
+        """AJAX handler updating several rows in a single request.
+
+        ``etags`` optionally holds the entity tags of the rows last sent to
+        the browser, in the same order as ``obj_ids``. Responds with a JSON
+        object holding the rendered ``rows`` and their ``etags`` keyed by
+        object id, the ids of the ``unchanged`` rows whose entity tag still
+        matches, and the ids of the ``removed`` objects which no longer
+        exist. Rows which couldn't be updated are in none of them.
+        """
+        row_class = self._meta.row_class
+        known_etags = dict(zip(obj_ids, etags or []))
+        try:
+            data = row_class(self).get_data_many(request, obj_ids)
+        except Exception:
+            error = exceptions.handle(request, ignore=True)
+            return HttpResponse(status=error.status_code)
+        rows = {}
+        row_etags = {}
+        unchanged = []
+        removed = []
+        for obj_id in obj_ids:
+            new_row = row_class(self)
+            try:
+                if obj_id in data:
+                    datum = data[obj_id]
+                else:
+                    datum = new_row.get_data(request, obj_id)
+                etag = self.get_row_etag(new_row, datum)
+                if etag and etag == known_etags.get(obj_id):
+                    unchanged.append(obj_id)
+                    continue
+                new_row.load_cells(datum)
+                rows[obj_id] = new_row.render()
+                if etag:
+                    row_etags[obj_id] = etag
+            except Exception:
+                error = exceptions.handle(request, ignore=True)
+                if error.status_code == 404:
+                    removed.append(obj_id)
+        content = {'rows': rows, 'etags': row_etags, 'unchanged': unchanged,
+                   'removed': removed}
+        return HttpResponse(json.dumps(content),
+                            content_type="application/json")
+
     def inline_edit_handle(self, request, table_name, action_name, obj_id,
                            new_row):
         """Inline edit handler.
@@ -1542,6 +1941,8 @@ class DataTable(object):
 
     def get_rows(self):
         """Return the row data for this table broken out by columns."""
+        if self._meta.compiled_rows and RowRenderer.supports(self):
+            return self.get_compiled_rows()
         rows = []
         try:
             for datum in self.filtered_data:
@@ -1557,3 +1958,21 @@ class DataTable(object):
             exc_info = sys.exc_info()
             raise template.TemplateSyntaxError, exc_info[1], exc_info[2]
         return rows
+
+    def get_compiled_rows(self):
+        """Returns the rows of this table rendered by a
+        :class:`~horizon.tables.base.RowRenderer`.
+        """
+        rows = []
+        try:
+            renderer = RowRenderer(self)
+            for datum in self.filtered_data:
+                selected = self.get_object_id(datum) == self.current_item_id
+                if selected:
+                    self.selected = True
+                rows.append(renderer.render(datum, selected=selected))
+        except Exception:
+            LOG.exception("Error while rendering table rows.")
+            exc_info = sys.exc_info()
+            raise template.TemplateSyntaxError, exc_info[1], exc_info[2]
+        return rows
@@ -15,36 +15,83 @@
 #    under the License.
 
 from collections import defaultdict  # noqa
+import functools
+import time
 
+from django.conf import settings  # noqa
+from django.utils.datastructures import SortedDict  # noqa
 from django.views import generic
 
+from horizon.tables.base import DataTable  # noqa
 from horizon.templatetags.horizon import has_permissions  # noqa
+from horizon.utils import concurrency
+from horizon.utils import progressive
 
 
 class MultiTableMixin(object):
-    """A generic mixin which provides methods for handling DataTables."""
+    """A generic mixin which provides methods for handling DataTables.
+
+    .. attribute:: concurrent_data_loading
+
+        When ``True``, the ``get_{{ table_name }}_data`` methods are called
+        at the same time, in at most ``API_CONCURRENCY`` threads, so the
+        page costs the slowest of them rather than their sum. They must not
+        depend on each other. Default: ``False``.
+
+    .. attribute:: data_timings
+
+        Once the data is loaded, a dictionary mapping the name of each table
+        to the time, in seconds, spent in its data methods.
+    """
     data_method_pattern = "get_%s_data"
+    concurrent_data_loading = False
 
     def __init__(self, *args, **kwargs):
         super(MultiTableMixin, self).__init__(*args, **kwargs)
         self.table_classes = getattr(self, "table_classes", [])
         self._data = {}
         self._tables = {}
+        self.data_timings = SortedDict()
 
         self._data_methods = defaultdict(list)
         self.get_data_methods(self.table_classes, self._data_methods)
 
     def _get_data_dict(self):
         if not self._data:
+            if self.concurrent_data_loading:
+                self._data = self._load_data_concurrently()
+                return self._data
             for table in self.table_classes:
-                data = []
                 name = table._meta.name
-                func_list = self._data_methods.get(name, [])
-                for func in func_list:
-                    data.extend(func())
-                self._data[name] = data
+                start = time.time()
+                self._data[name] = self._load_table_data(name)
+                self.data_timings[name] = time.time() - start
         return self._data
 
+    def _load_table_data(self, name):
+        data = []
+        for func in self._data_methods.get(name, []):
+            data.extend(func())
+        return data
+
+    def _load_data_concurrently(self):
+        calls = []
+        for table in self.table_classes:
+            name = table._meta.name
+            self.data_timings[name] = 0
+            for func in self._data_methods.get(name, []):
+                calls.append((name, func))
+        results = concurrency.run_concurrently(
+            [func for name, func in calls],
+            max_workers=getattr(settings, 'API_CONCURRENCY',
+                                concurrency.DEFAULT_MAX_WORKERS))
+        data = dict((table._meta.name, []) for table in self.table_classes)
+        # Errors are raised in the order the tables were declared.
+        for (name, func), result in zip(calls, results):
+            data[name].extend(result.get())
+            self.data_timings[name] += result.duration
+        return data
+
     def get_data_methods(self, table_classes, methods):
         for table in table_classes:
             name = table._meta.name
@@ -132,7 +179,16 @@ class MultiTableView(MultiTableMixin, generic.TemplateView):
     define a ``get_{{ table_name }}_data`` method for each table class
     which returns a set of data for that table; and specify a template for
     the ``template_name`` attribute.
+
+    .. attribute:: progressive_rendering
+
+        When ``True``, full page loads send the page straight away with a
+        placeholder for each table, then stream each table in as soon as its
+        data is loaded, so that the page no longer waits for the slowest
+        of them (see :mod:`horizon.utils.progressive`). Default: ``False``.
     """
+    progressive_rendering = False
+
     def construct_tables(self):
         tables = self.get_tables().values()
         # Early out before data is loaded
@@ -151,12 +207,44 @@ class MultiTableView(MultiTableMixin, generic.TemplateView):
         return None
 
     def get(self, request, *args, **kwargs):
+        if self.progressive_rendering and progressive.is_enabled(request):
+            table_name, action, obj_id = DataTable.check_handler(request)
+            if table_name is None:
+                return self.render_progressively(**kwargs)
         handled = self.construct_tables()
         if handled:
             return handled
         context = self.get_context_data(**kwargs)
         return self.render_to_response(context)
 
+    def render_progressively(self, **kwargs):
+        """Renders the page with a placeholder for each table, and returns
+        a response streaming the tables in as their data is loaded.
+        """
+        context = self.get_context_data(**kwargs)
+        fragments = []
+        for table_class in self.table_classes:
+            table = self.get_tables().get(table_class._meta.name)
+            if table is None:
+                continue
+            placeholder = progressive.Placeholder(
+                "%s__placeholder" % table.name)
+            for key, value in context.items():
+                if value is table:
+                    context[key] = placeholder
+            fragments.append(progressive.Fragment(
+                placeholder,
+                functools.partial(self._load_table_data, table.name),
+                functools.partial(self._render_table, table)))
+        content = self.render_to_response(context).render().content
+        return progressive.stream_response(self.request, content, fragments)
+
+    def _render_table(self, table, result):
+        table.data = result.get()
+        table._meta.has_more_data = self.has_more_data(table)
+        self.data_timings[table.name] = result.duration
+        return table.render()
+
     def post(self, request, *args, **kwargs):
         # GET and POST handling are the same
         return self.get(request, *args, **kwargs)
@@ -181,6 +269,9 @@ class DataTableView(MultiTableView):
             self._data = {self.table_class._meta.name: self.get_data()}
         return self._data
 
+    def _load_table_data(self, name):
+        return self._get_data_dict()[name]
+
     def get_data(self):
         raise NotImplementedError('You must define a "get_data" method on %s.'
                                   % self.__class__.__name__)
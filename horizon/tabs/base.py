@@ -14,13 +14,17 @@
 #    License for the specific language governing permissions and limitations
 #    under the License.
 
+import functools
 import sys
+import time
 
+from django.conf import settings  # noqa
 from django.template.loader import render_to_string  # noqa
 from django.template import TemplateSyntaxError  # noqa
 from django.utils.datastructures import SortedDict  # noqa
 
 from horizon import exceptions
+from horizon.utils import concurrency
 from horizon.utils import html
 
 SEPARATOR = "__"
@@ -72,11 +76,23 @@ class TabGroup(html.HTMLElement):
         Read-only property which is set to the value of the current active tab.
         This may not be the same as the value of ``selected`` if no
         specific tab was requested via the ``GET`` parameter.
+
+    .. attribute:: concurrent_data_loading
+
+        When ``True``, :meth:`load_tab_data` loads the data of the tabs at the
+        same time, in at most ``API_CONCURRENCY`` threads. The tabs must not
+        depend on each other. Default: ``False``.
+
+    .. attribute:: data_timings
+
+        A dictionary mapping the slug of each tab loaded by
+        :meth:`load_tab_data` to the time, in seconds, spent loading it.
     """
     slug = None
     template_name = "horizon/common/_tab_group.html"
     param_name = 'tab'
     sticky = False
+    concurrent_data_loading = False
     _selected = None
     _active = None
 
@@ -96,6 +112,7 @@ class TabGroup(html.HTMLElement):
         self.request = request
         self.kwargs = kwargs
         self._data = None
+        self.data_timings = SortedDict()
         tab_instances = []
         for tab in self.tabs:
             tab_instances.append((tab.slug, tab(self, request)))
@@ -110,13 +127,30 @@ class TabGroup(html.HTMLElement):
 
     def load_tab_data(self):
         """Preload all data that for the tabs that will be displayed."""
-        for tab in self._tabs.values():
-            if tab.load and not tab.data_loaded:
-                try:
+        tabs = [tab for tab in self._tabs.values()
+                if tab.load and not tab.data_loaded]
+        if self.concurrent_data_loading:
+            results = concurrency.run_concurrently(
+                [functools.partial(tab.get_context_data, self.request)
+                 for tab in tabs],
+                max_workers=getattr(settings, 'API_CONCURRENCY',
+                                    concurrency.DEFAULT_MAX_WORKERS))
+        else:
+            results = [None] * len(tabs)
+        for tab, result in zip(tabs, results):
+            start = time.time()
+            try:
+                if result is None:
                     tab._data = tab.get_context_data(self.request)
-                except Exception:
-                    tab._data = False
-                    exceptions.handle(self.request)
+                else:
+                    tab._data = result.get()
+            except Exception:
+                tab._data = False
+                exceptions.handle(self.request)
+            if result is None:
+                self.data_timings[tab.slug] = time.time() - start
+            else:
+                self.data_timings[tab.slug] = result.duration
 
     def get_id(self):
         """Returns the id for this tab group. Defaults to the value of the tab
@@ -239,6 +273,7 @@ class Tab(html.HTMLElement):
     slug = None
     preload = True
     _active = None
+    _placeholder = None
 
     def __init__(self, tab_group, request=None):
         super(Tab, self).__init__()
@@ -291,6 +326,8 @@ class Tab(html.HTMLElement):
         """
         if not self.load:
             return ''
+        if self._placeholder is not None:
+            return self._placeholder.render()
         try:
             context = self.data
         except exceptions.Http302:
@@ -394,8 +431,20 @@ class TableTab(Tab):
         :class:`~horizon.tables.MultiTableView`. For each table class you
         need to define a corresponding ``get_{{ table_name }}_data`` method
         as with :class:`~horizon.tables.MultiTableView`.
+
+    .. attribute:: concurrent_data_loading
+
+        When ``True``, the ``get_{{ table_name }}_data`` methods are called
+        at the same time, as with :class:`~horizon.tables.MultiTableView`.
+        Default: ``False``.
+
+    .. attribute:: data_timings
+
+        Once the data is loaded, a dictionary mapping the name of each table
+        to the time, in seconds, spent in its data method.
     """
     table_classes = None
+    concurrent_data_loading = False
 
     def __init__(self, tab_group, request):
         super(TableTab, self).__init__(tab_group, request)
@@ -409,6 +458,7 @@ class TableTab(Tab):
                            for table in self.table_classes]
         self._tables = SortedDict(table_instances)
         self._table_data_loaded = False
+        self.data_timings = SortedDict()
 
     def load_table_data(self):
         """Calls the ``get_{{ table_name }}_data`` methods for each table class
@@ -416,6 +466,7 @@ class TableTab(Tab):
         """
         # We only want the data to be loaded once, so we track if we have...
         if not self._table_data_loaded:
+            data_funcs = []
             for table_name, table in self._tables.items():
                 # Fetch the data function.
                 func_name = "get_%s_data" % table_name
@@ -424,8 +475,24 @@ class TableTab(Tab):
                     cls_name = self.__class__.__name__
                     raise NotImplementedError("You must define a %s method "
                                               "on %s." % (func_name, cls_name))
+                data_funcs.append(data_func)
+            if self.concurrent_data_loading:
+                results = concurrency.run_concurrently(
+                    data_funcs,
+                    max_workers=getattr(settings, 'API_CONCURRENCY',
+                                        concurrency.DEFAULT_MAX_WORKERS))
+            else:
+                results = [None] * len(data_funcs)
+            for (table_name, table), data_func, result in zip(
+                    self._tables.items(), data_funcs, results):
                 # Load the data.
-                table.data = data_func()
+                if result is None:
+                    start = time.time()
+                    table.data = data_func()
+                    self.data_timings[table_name] = time.time() - start
+                else:
+                    table.data = result.get()
+                    self.data_timings[table_name] = result.duration
                 table._meta.has_more_data = self.has_more_data(table)
             # Mark our data as loaded so we don't run the loaders again.
             self._table_data_loaded = True
@@ -10,12 +10,15 @@
 # License for the specific language governing permissions and limitations
 # under the License.
 
+import functools
+
 from django import http
 from django.views import generic
 
 from horizon import exceptions
 from horizon import tables
 from horizon.tabs.base import TableTab  # noqa
+from horizon.utils import progressive
 
 
 class TabView(generic.TemplateView):
@@ -29,8 +32,16 @@ class TabView(generic.TemplateView):
 
         The only required attribute for ``TabView``. It should be a class which
         inherits from :class:`horizon.tabs.TabGroup`.
+
+    .. attribute:: progressive_rendering
+
+        When ``True``, full page loads send the page straight away with a
+        placeholder for each tab to load, then stream each tab in as soon as
+        its data is loaded (see :mod:`horizon.utils.progressive`).
+        Default: ``False``.
     """
     tab_group_class = None
+    progressive_rendering = False
     _tab_group = None
 
     def __init__(self):
@@ -50,8 +61,10 @@ class TabView(generic.TemplateView):
         try:
             tab_group = self.get_tabs(self.request, **kwargs)
             context["tab_group"] = tab_group
-            # Make sure our data is pre-loaded to capture errors.
-            context["tab_group"].load_tab_data()
+            # Make sure our data is pre-loaded to capture errors, unless it
+            # is streamed in after the page.
+            if not self._renders_progressively():
+                context["tab_group"].load_tab_data()
         except Exception:
             exceptions.handle(self.request)
         return context
@@ -65,8 +78,40 @@ class TabView(generic.TemplateView):
                 return http.HttpResponse(tab_group.selected.render())
             else:
                 return http.HttpResponse(tab_group.render())
+        if self._renders_progressively():
+            return self.render_progressively(tab_group, context)
         return self.render_to_response(context)
 
+    def _renders_progressively(self):
+        return (self.progressive_rendering and
+                progressive.is_enabled(self.request))
+
+    def render_progressively(self, tab_group, context):
+        """Renders the page with a placeholder for each tab to load, and
+        returns a response streaming the tabs in as their data is loaded.
+        """
+        fragments = []
+        for tab in tab_group.get_tabs():
+            if tab.load and not tab.data_loaded:
+                tab._placeholder = progressive.Placeholder(
+                    "%s__placeholder" % tab.get_id())
+                fragments.append(progressive.Fragment(
+                    tab._placeholder,
+                    functools.partial(tab.get_context_data, self.request),
+                    functools.partial(self._render_tab, tab)))
+        content = self.render_to_response(context).content
+        return progressive.stream_response(self.request, content, fragments)
+
+    def _render_tab(self, tab, result):
+        tab._placeholder = None
+        try:
+            tab._data = result.get()
+        except Exception:
+            tab._data = False
+            exceptions.handle(self.request)
+        tab.tab_group.data_timings[tab.slug] = result.duration
+        return tab.render()
+
     def get(self, request, *args, **kwargs):
         context = self.get_context_data(**kwargs)
         return self.handle_tabbed_response(context["tab_group"], context)
@@ -16,6 +16,9 @@
 
 from __future__ import absolute_import
 
+import hashlib
+
+from django.conf import settings  # noqa
 from django import template
 from django.utils.datastructures import SortedDict  # noqa
 from django.utils.encoding import force_unicode  # noqa
@@ -23,10 +26,17 @@ from django.utils.translation import ugettext_lazy as _  # noqa
 
 from horizon.base import Horizon  # noqa
 from horizon import conf
+from horizon.utils import memoized
 
 
 register = template.Library()
 
+# The navigation only depends on the user's token (its roles and service
+# catalog) and region, so the entries are worked out once per token.
+_nav_cache = memoized.create_shared_cache(
+    ttl=getattr(settings, 'HORIZON_NAV_CACHE_TTL', 300),
+    maxsize=getattr(settings, 'HORIZON_NAV_CACHE_SIZE', 1000))
+
 
 @register.filter
 def has_permissions(user, component):
@@ -42,22 +52,60 @@ def has_permissions_on_list(components, user):
                 in components if has_permissions(user, component)]
 
 
+def _nav_cache_key(request, *names):
+    """Returns the key of the navigation entries cached for the user of
+    ``request``, or ``None`` if the user has no token to key them on.
+    """
+    token = getattr(getattr(request.user, 'token', None), 'id', None)
+    if token is None:
+        return None
+    return (memoized.shared_scope_key(request, 'user') +
+            (hashlib.sha1(token).hexdigest(),) + names)
+
+
+def _cached_nav(key, build):
+    if key is None or not _nav_cache.maxsize:
+        return build()
+    try:
+        return _nav_cache.get(key)
+    except KeyError:
+        entries = build()
+        _nav_cache.set(key, entries)
+        return entries
+
+
+def _nav_entries(context, components):
+    """Returns a ``(component, url)`` pair for each of ``components`` shown
+    in the navigation, i.e. whose ``nav`` attribute (or the result of
+    calling it with ``context``) is true, and which the user has the
+    permissions for.
+    """
+    user = context['request'].user
+    entries = []
+    for component in components:
+        if callable(component.nav):
+            shown = component.nav(context)
+        else:
+            shown = component.nav
+        if shown and has_permissions(user, component):
+            entries.append((component, component.get_absolute_url()))
+    return entries
+
+
 @register.inclusion_tag('horizon/_nav_list.html', takes_context=True)
 def horizon_main_nav(context):
     """Generates top-level dashboard navigation entries."""
     if 'request' not in context:
         return {}
-    current_dashboard = context['request'].horizon.get('dashboard', None)
-    dashboards = []
-    for dash in Horizon.get_dashboards():
-        if callable(dash.nav) and dash.nav(context):
-            dashboards.append(dash)
-        elif dash.nav:
-            dashboards.append(dash)
+    request = context['request']
+    current_dashboard = request.horizon.get('dashboard', None)
+    dashboards = _cached_nav(
+        _nav_cache_key(request, 'main'),
+        lambda: _nav_entries(context, Horizon.get_dashboards()))
     return {'components': dashboards,
-            'user': context['request'].user,
+            'user': request.user,
             'current': current_dashboard,
-            'request': context['request']}
+            'request': request}
 
 
 @register.inclusion_tag('horizon/_subnav_list.html', takes_context=True)
@@ -65,24 +113,23 @@ def horizon_dashboard_nav(context):
     """Generates sub-navigation entries for the current dashboard."""
     if 'request' not in context:
         return {}
-    dashboard = context['request'].horizon['dashboard']
-    panel_groups = dashboard.get_panel_groups()
-    non_empty_groups = []
-
-    for group in panel_groups.values():
-        allowed_panels = []
-        for panel in group:
-            if callable(panel.nav) and panel.nav(context):
-                allowed_panels.append(panel)
-            elif not callable(panel.nav) and panel.nav:
-                allowed_panels.append(panel)
-        if allowed_panels:
-            non_empty_groups.append((group.name, allowed_panels))
-
-    return {'components': SortedDict(non_empty_groups),
-            'user': context['request'].user,
-            'current': context['request'].horizon['panel'].slug,
-            'request': context['request']}
+    request = context['request']
+    dashboard = request.horizon['dashboard']
+
+    def build():
+        non_empty_groups = []
+        for group in dashboard.get_panel_groups().values():
+            allowed_panels = _nav_entries(context, group)
+            if allowed_panels:
+                non_empty_groups.append((group.name, allowed_panels))
+        return SortedDict(non_empty_groups)
+
+    panel_groups = _cached_nav(
+        _nav_cache_key(request, 'dashboard', dashboard.slug), build)
+    return {'components': panel_groups,
+            'user': request.user,
+            'current': request.horizon['panel'].slug,
+            'request': request}
 
 
 @register.filter
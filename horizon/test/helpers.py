@@ -50,6 +50,7 @@ except ImportError as e:
 import mox
 
 from horizon import middleware
+from horizon.utils import memoized
 
 
 # Makes output of failing mox tests much easier to read.
@@ -84,6 +85,7 @@ class TestCase(django_test.TestCase):
       * A ready-to-go request object via ``self.request``.
     """
     def setUp(self):
+        memoized.clear_shared_caches()
         self.mox = mox.Mox()
         self.factory = RequestFactoryWithMessages()
         self.user = User.objects.create_user(username='test', password='test')
@@ -113,6 +115,14 @@ class TestCase(django_test.TestCase):
         if hasattr(self.user, "_perm_cache"):
             del self.user._perm_cache
 
+    def get_response_content(self, response):
+        """Returns the full content of ``response``, consuming it if it is a
+        streaming response.
+        """
+        if getattr(response, 'streaming', False):
+            return ''.join(response.streaming_content)
+        return response.content
+
     def assertNoMessages(self, response=None):
         """Asserts that no messages have been attached by the
         ``contrib.messages`` framework.
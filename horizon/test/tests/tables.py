@@ -14,6 +14,8 @@
 #    License for the specific language governing permissions and limitations
 #    under the License.
 
+import json
+
 from django.core.urlresolvers import reverse  # noqa
 from django import forms
 from django import http
@@ -102,6 +104,9 @@ class MyRow(tables.Row):
     def get_data(cls, request, obj_id):
         return TEST_DATA_2[0]
 
+    def get_fingerprint(self, datum):
+        return datum.status
+
 
 class MyBatchAction(tables.BatchAction):
     name = "batch"
@@ -212,6 +217,47 @@ class MyTableNotAllowedInlineEdit(MyTable):
         row_class = MyRow
 
 
+class MyBulkAction(tables.Action):
+    name = "bulk"
+    verbose_name = "Bulk"
+
+    def allowed(self, request, obj=None):
+        raise AssertionError("allowed() should not be called per row.")
+
+    def allowed_many(self, request, objs):
+        self.calls = getattr(self, 'calls', 0) + 1
+        return [obj.status == 'up' for obj in objs]
+
+    def single(self, table, request, obj_id):
+        pass
+
+
+class BulkActionsTable(tables.DataTable):
+    id = tables.Column('id')
+    status = tables.Column('status')
+
+    class Meta:
+        name = "bulk_actions_table"
+        row_actions = (MyBulkAction, MyAction)
+
+
+class MyCompiledTable(MyTable):
+    name = tables.Column(get_name,
+                         verbose_name="Verbose Name",
+                         sortable=True)
+
+    class Meta:
+        name = "my_table"
+        verbose_name = "My Table"
+        status_columns = ["status"]
+        columns = ('id', 'name', 'value', 'optional', 'status')
+        row_class = MyRow
+        column_class = MyColumn
+        table_actions = (MyFilterAction, MyAction, MyBatchAction)
+        row_actions = (MyAction, MyLinkAction, MyBatchAction, MyToggleAction)
+        compiled_rows = True
+
+
 class NoActionsTable(tables.DataTable):
     id = tables.Column('id')
 
@@ -500,6 +546,41 @@ class DataTableTests(test.TestCase):
         resp = http.HttpResponse(table_actions)
         self.assertContains(resp, "table_search", 0)
 
+    def test_compiled_rows_rendering(self):
+        data = TEST_DATA
+        table = MyCompiledTable(self.request, data)
+        rows = table.get_rows()
+        self.assertEqual([row.id for row in rows],
+                         ['my_table__row__1', 'my_table__row__2',
+                          'my_table__row__3'])
+        self.assertEqual(rows[0].datum, TEST_DATA[0])
+        self.assertFalse(isinstance(rows[0], tables.Row))
+
+        # The output matches that of the row and cell templates.
+        MyCompiledTable._meta.compiled_rows = False
+        try:
+            expected = [row.render()
+                        for row in MyCompiledTable(self.request,
+                                                   data).get_rows()]
+        finally:
+            MyCompiledTable._meta.compiled_rows = True
+        self.assertEqual([row.render() for row in rows], expected)
+
+        resp = http.HttpResponse(table.render())
+        self.assertContains(resp, 'id="my_table__row__2"', 1)
+        self.assertContains(resp, "data-update-interval", 3)
+        self.assertContains(resp, '<a href="http://example.com/" '
+                                  'class="link-modal">'
+                                  '&lt;strong&gt;evil&lt;/strong&gt;</a>', 1)
+
+        # Tables with inline editing are rendered through the templates.
+        MyTable._meta.compiled_rows = True
+        try:
+            rows = MyTable(self.request, TEST_DATA).get_rows()
+        finally:
+            MyTable._meta.compiled_rows = False
+        self.assertTrue(isinstance(rows[0], tables.Row))
+
     def test_inline_edit_available_cell_rendering(self):
         self.table = MyTable(self.request, TEST_DATA_2)
         row = self.table.get_rows()[0]
@@ -804,6 +885,43 @@ class DataTableTests(test.TestCase):
         # Make sure the data returned differs from the original
         self.assertContains(resp, "my_table__row__1")
         self.assertContains(resp, "status_down")
+        etag = resp['ETag']
+
+        # Unchanged rows aren't rendered again
+        req = self.factory.get('/my_url/',
+                               params,
+                               HTTP_X_REQUESTED_WITH='XMLHttpRequest',
+                               HTTP_IF_NONE_MATCH=etag)
+        self.table = MyTable(req)
+        resp = self.table.maybe_preempt()
+        self.assertEqual(resp.status_code, 304)
+        self.assertEqual(resp['ETag'], etag)
+
+        # Batched row updating
+        params = {"table": "my_table", "action": "rows_update",
+                  "obj_ids": ["1", "2"]}
+        req = self.factory.get('/my_url/',
+                               params,
+                               HTTP_X_REQUESTED_WITH='XMLHttpRequest')
+        self.table = MyTable(req)
+        resp = self.table.maybe_preempt()
+        self.assertEqual(resp.status_code, 200)
+        content = json.loads(resp.content)
+        self.assertEqual(sorted(content['rows'].keys()), ["1", "2"])
+        self.assertIn("status_down", content['rows']["1"])
+        self.assertEqual(content['unchanged'], [])
+        self.assertEqual(content['removed'], [])
+
+        params["etags"] = [content['etags']["1"], "stale"]
+        req = self.factory.get('/my_url/',
+                               params,
+                               HTTP_X_REQUESTED_WITH='XMLHttpRequest')
+        self.table = MyTable(req)
+        content = json.loads(self.table.maybe_preempt().content)
+        self.assertEqual(content['rows'].keys(), ["2"])
+        self.assertEqual(content['unchanged'], ["1"])
+        self.assertEqual(self.table.get_batch_update_url(),
+                         "/my_url/?action=rows_update&table=my_table")
 
         # Verify that we don't get a response for a valid action with the
         # wrong method.
@@ -1013,6 +1131,22 @@ class DataTableTests(test.TestCase):
         self.assertEqual(list(req._messages)[0].message,
                         u"Downed Item: N/A")
 
+    def test_row_actions_allowed_many(self):
+        table = BulkActionsTable(self.request, TEST_DATA)
+        table.base_actions['bulk'].calls = 0
+        row_actions = [[action.name for action in
+                        table.get_row_actions(datum)]
+                       for datum in TEST_DATA]
+        self.assertEqual(row_actions,
+                         [['bulk', 'delete'], [], ['bulk', 'delete']])
+        self.assertEqual(table.base_actions['bulk'].calls, 1)
+
+        # Each table instance evaluates its own rows.
+        table = BulkActionsTable(self.request, TEST_DATA_2)
+        res = http.HttpResponse(table.render())
+        self.assertNotContains(res, "bulk_actions_table__bulk__1")
+        self.assertEqual(table.base_actions['bulk'].calls, 2)
+
 
 class SingleTableView(table_views.DataTableView):
     table_class = MyTable
@@ -1046,6 +1180,15 @@ class MultiTableView(tables.MultiTableView):
         return TEST_DATA
 
 
+class ConcurrentMultiTableView(MultiTableView):
+    concurrent_data_loading = True
+
+
+class ProgressiveMultiTableView(MultiTableView):
+    template_name = "multi_table.html"
+    progressive_rendering = True
+
+
 class DataTableViewTests(test.TestCase):
     def _prepare_view(self, cls, *args, **kwargs):
         req = self.factory.get('/my_url/')
@@ -1089,6 +1232,43 @@ class DataTableViewTests(test.TestCase):
         self.assertEqual(context['table_with_permissions_table'].__class__,
                          TableWithPermissions)
 
+    def test_multi_table_view_concurrent_data_loading(self):
+        view = self._prepare_view(ConcurrentMultiTableView)
+        data = view._get_data_dict()
+        self.assertEqual(data, {'my_table': list(TEST_DATA),
+                                'table_with_permissions': list(TEST_DATA)})
+        self.assertEqual(view.data_timings.keys(),
+                         ['table_with_permissions', 'my_table'])
+
+    def test_multi_table_view_progressive_rendering(self):
+        view = ProgressiveMultiTableView.as_view()
+        req = self.factory.get('/my_url/')
+        req.user = self.user
+        res = view(req)
+        self.assertTrue(res.streaming)
+        chunks = list(res.streaming_content)
+        # The page is sent first, with a placeholder for the table.
+        self.assertIn('id="my_table__placeholder"', chunks[0])
+        self.assertNotIn('<table', chunks[0])
+        self.assertNotIn('</body>', chunks[0])
+        content = ''.join(chunks)
+        self.assertIn('<div id="my_table__placeholder__fragment" ', content)
+        self.assertIn('horizon.progressive.fill("my_table__placeholder");',
+                      content)
+        self.assertEqual(content.count('<table'), 1)
+        self.assertTrue(content.rstrip().endswith('</body>\n</html>'))
+        # Tables the user isn't allowed to see aren't streamed either.
+        self.assertNotIn('table_with_permissions', content)
+
+    def test_multi_table_view_progressive_rendering_ajax(self):
+        view = ProgressiveMultiTableView.as_view()
+        req = self.factory.get('/my_url/',
+                               HTTP_X_REQUESTED_WITH='XMLHttpRequest')
+        req.user = self.user
+        res = view(req)
+        self.assertFalse(res.streaming)
+        self.assertContains(res, '<table', 1)
+
 
 class FormsetTableTests(test.TestCase):
 
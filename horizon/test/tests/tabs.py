@@ -98,11 +98,21 @@ class TableTabGroup(horizon_tabs.TabGroup):
     tabs = [TabWithTable]
 
 
+class ConcurrentGroup(horizon_tabs.TabGroup):
+    slug = "tab_group"
+    tabs = (TabOne, TabWithTable, RecoverableErrorTab)
+    concurrent_data_loading = True
+
+
 class TabWithTableView(horizon_tabs.TabbedTableView):
     tab_group_class = TableTabGroup
     template_name = "tab_group.html"
 
 
+class ProgressiveTabWithTableView(TabWithTableView):
+    progressive_rendering = True
+
+
 class TabTests(test.TestCase):
     def test_tab_group_basics(self):
         tg = Group(self.request)
@@ -288,6 +298,34 @@ class TabTests(test.TestCase):
         req = self.factory.post('/', {'action': action_string})
         self.assertRaises(exceptions.Http302, view, req)
 
+    def test_progressive_tabbed_table_view(self):
+        view = ProgressiveTabWithTableView.as_view()
+        req = self.factory.get("/")
+        res = view(req)
+        self.assertTrue(res.streaming)
+        chunks = list(res.streaming_content)
+        placeholder_id = "tab_group__tab_with_table__placeholder"
+        self.assertIn('id="%s"' % placeholder_id, chunks[0])
+        self.assertNotIn("<table", chunks[0])
+        content = "".join(chunks)
+        self.assertIn('horizon.progressive.fill("%s");' % placeholder_id,
+                      content)
+        self.assertEqual(content.count("<table"), 1)
+        self.assertIn("Displaying 3 items", content)
+
+    def test_concurrent_tab_data_loading(self):
+        req = self.factory.get("/")
+        tg = ConcurrentGroup(req)
+        tg.load_tab_data()
+        self.assertEqual(tg.data_timings.keys(),
+                         ["tab_one", "tab_with_table",
+                          "recoverable_error_tab"])
+        tab_one = tg.get_tab("tab_one")
+        self.assertEqual(tab_one._data, {"tab": tab_one})
+        # The failing tab is handled like when loading sequentially.
+        self.assertEqual(tg.get_tab("recoverable_error_tab")._data, False)
+        self.assertEqual(len(req._messages._queued_messages), 1)
+
 
 class TabExceptionTests(test.TestCase):
     def setUp(self):
@@ -304,3 +342,13 @@ class TabExceptionTests(test.TestCase):
         req = self.factory.get("/")
         res = view(req)
         self.assertMessageCount(res, error=1)
+
+    def test_progressive_tab_view_exception(self):
+        view = ProgressiveTabWithTableView.as_view()
+        req = self.factory.get("/")
+        res = view(req)
+        content = "".join(res.streaming_content)
+        # The message is shown by the page, the response having been sent.
+        self.assertMessageCount(res, error=0)
+        self.assertIn('horizon.progressive.alert([["error", ', content)
+        self.assertIn('Recoverable!', content.rsplit("<script", 1)[1])
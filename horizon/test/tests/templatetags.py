@@ -25,9 +25,28 @@ from django.template import Context  # noqa
 from django.template import Template  # noqa
 from django.utils.text import normalize_newlines  # noqa
 
+from horizon.templatetags import horizon as horizon_tags
 from horizon.test import helpers as test
 
 
+class FakeToken(object):
+    def __init__(self, id):
+        self.id = id
+
+
+class FakeDashboard(object):
+    name = "Fake"
+    slug = "fake"
+    nav_calls = 0
+
+    def nav(self, context):
+        self.nav_calls += 1
+        return True
+
+    def get_absolute_url(self):
+        return "/fake/"
+
+
 def single_line(text):
     """Quick utility to make comparing template output easier."""
     return re.sub(' +',
@@ -95,3 +114,24 @@ class TemplateTagTests(test.TestCase):
                                             template_text=text,
                                             context={'test': ctx_string})
         self.assertEqual(rendered_str, expected)
+
+    def test_horizon_main_nav_cached_per_token(self):
+        dashboard = FakeDashboard()
+        self.mox.stubs.Set(horizon_tags.Horizon, 'get_dashboards',
+                           lambda: [dashboard])
+        self.request.horizon['dashboard'] = dashboard
+        self.request.user.token = FakeToken("token")
+        context = {'request': self.request}
+        rendered = self.render_template("{% horizon_main_nav %}",
+                                        'horizon', context)
+        self.assertIn('<li class="active"> <a href="/fake/"',
+                      single_line(rendered))
+        self.assertEqual(self.render_template("{% horizon_main_nav %}",
+                                              'horizon', context),
+                         rendered)
+        self.assertEqual(dashboard.nav_calls, 1)
+
+        # A new token (e.g. for another project) has its own navigation.
+        self.request.user.token = FakeToken("other_token")
+        self.render_template("{% horizon_main_nav %}", 'horizon', context)
+        self.assertEqual(dashboard.nav_calls, 2)
@@ -17,17 +17,21 @@
 import datetime
 
 import os
+import threading
 
 from django.core.exceptions import ValidationError  # noqa
+from django import http
 import django.template
 
 from horizon.test import helpers as test
+from horizon.utils import concurrency
 from horizon.utils import fields
 from horizon.utils import filters
 # we have to import the filter in order to register it
 from horizon.utils.filters import parse_isotime  # noqa
 from horizon.utils import memoized
 from horizon.utils import secret_key
+from horizon.utils import timeseries
 from horizon.utils import validators
 
 
@@ -309,3 +313,119 @@ class MemoizedTests(test.TestCase):
         for x in range(0, 5):
             cache_calls(1)
         self.assertEqual(len(values_list), 1)
+
+    def test_memoized_shared_decorator_cache_across_requests(self):
+        values_list = []
+
+        @memoized.memoized_shared(ttl=60)
+        def cache_calls(request, value):
+            values_list.append(value)
+            return value
+
+        def new_request():
+            request = http.HttpRequest()
+            request.user = self.user
+            return request
+
+        for x in range(0, 5):
+            cache_calls(new_request(), 1)
+        self.assertEqual(len(values_list), 1)
+
+        cache_calls(new_request(), 2)
+        self.assertEqual(len(values_list), 2)
+
+        cache_calls.clear_cache()
+        cache_calls(new_request(), 1)
+        self.assertEqual(len(values_list), 3)
+
+    def test_memoized_shared_decorator_expiry_and_size(self):
+        values_list = []
+
+        @memoized.memoized_shared(ttl=0, scope='global')
+        def expired_calls(value):
+            values_list.append(value)
+            return value
+
+        expired_calls(1)
+        expired_calls(1)
+        self.assertEqual(len(values_list), 2)
+
+        values_list = []
+
+        @memoized.memoized_shared(ttl=60, scope='global', maxsize=2)
+        def bounded_calls(value):
+            values_list.append(value)
+            return value
+
+        for x in (1, 2, 3, 1):
+            bounded_calls(x)
+        self.assertEqual(values_list, [1, 2, 3, 1])
+
+
+class ConcurrencyTests(test.TestCase):
+    def test_run_concurrently_results_in_order(self):
+        calls = [lambda x=x: x * 2 for x in range(10)]
+        results = concurrency.run_concurrently(calls, max_workers=4)
+        self.assertEqual([result.get() for result in results],
+                         [x * 2 for x in range(10)])
+
+    def test_run_concurrently_isolates_errors(self):
+        def fail():
+            raise ValueError("boom")
+
+        results = concurrency.run_concurrently([fail, lambda: 1])
+        self.assertTrue(results[0].failed)
+        self.assertRaises(ValueError, results[0].get)
+        self.assertFalse(results[1].failed)
+        self.assertEqual(results[1].get(), 1)
+
+    def test_iter_concurrently_yields_as_completed(self):
+        slow_started = threading.Event()
+        fast_done = threading.Event()
+
+        def slow():
+            slow_started.set()
+            fast_done.wait(5)
+            return "slow"
+
+        def fast():
+            slow_started.wait(5)
+            return "fast"
+
+        iterator = concurrency.iter_concurrently([slow, fast], max_workers=2)
+        index, result = next(iterator)
+        self.assertEqual((index, result.get()), (1, "fast"))
+        fast_done.set()
+        index, result = next(iterator)
+        self.assertEqual((index, result.get()), (0, "slow"))
+        self.assertRaises(StopIteration, next, iterator)
+
+    def test_iter_concurrently_single_worker(self):
+        def fail():
+            raise ValueError("boom")
+
+        pairs = list(concurrency.iter_concurrently([lambda: 1, fail],
+                                                   max_workers=1))
+        self.assertEqual([index for index, result in pairs], [0, 1])
+        self.assertEqual(pairs[0][1].get(), 1)
+        self.assertRaises(ValueError, pairs[1][1].get)
+
+
+class TimeseriesTests(test.TestCase):
+    def test_downsample_keeps_short_series(self):
+        points = [(0, 1), (1, 2), (2, 3)]
+        self.assertEqual(timeseries.downsample(points, 3), points)
+        self.assertEqual(timeseries.downsample(points, 10), points)
+        self.assertEqual(timeseries.downsample(points, 2), [(0, 1), (2, 3)])
+
+    def test_downsample_keeps_peaks(self):
+        points = [(x, 0) for x in range(100)]
+        points[37] = (37, 50)
+        points[71] = (71, -20)
+        sampled = timeseries.downsample(points, 10)
+        self.assertEqual(len(sampled), 10)
+        self.assertEqual(sampled[0], points[0])
+        self.assertEqual(sampled[-1], points[-1])
+        self.assertIn((37, 50), sampled)
+        self.assertIn((71, -20), sampled)
+        self.assertEqual(sampled, sorted(sampled))
@@ -0,0 +1,159 @@
+# vim: tabstop=4 shiftwidth=4 softtabstop=4
+
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+"""
+Helpers for running independent, I/O bound calls (typically calls to remote
+APIs) at the same time, so that a page costs the slowest of them rather than
+their sum.
+"""
+
+import Queue
+import sys
+import threading
+import time
+
+from django.utils import translation
+
+
+DEFAULT_MAX_WORKERS = 8
+
+
+class Result(object):
+    """The outcome of a single call made by :func:`run_concurrently`.
+
+    Exceptions raised by the call are captured rather than propagated, so
+    that one failing call doesn't prevent the others from completing. Use
+    :meth:`get` inside a ``try``/``except`` block to re-raise them in the
+    calling thread, where they can be passed to
+    :func:`horizon.exceptions.handle` as usual.
+    """
+    def __init__(self, value=None):
+        self.value = value
+        self.exc_info = None
+        self.duration = None
+
+    @property
+    def failed(self):
+        return self.exc_info is not None
+
+    def get(self):
+        """Returns the value of the call, or re-raises its exception."""
+        if self.exc_info is not None:
+            exc_type, exc_value, exc_traceback = self.exc_info
+            raise exc_type, exc_value, exc_traceback
+        return self.value
+
+
+def _call(func, result):
+    start = time.time()
+    try:
+        result.value = func()
+    except Exception:
+        result.exc_info = sys.exc_info()
+    result.duration = time.time() - start
+
+
+def _start_threads(worker, count):
+    """Starts ``count`` daemon threads running ``worker`` with the active
+    translation, so lazily translated messages come out in the right
+    language, and returns them.
+    """
+    language = translation.get_language()
+
+    def thread_worker():
+        if language:
+            translation.activate(language)
+        try:
+            worker()
+        finally:
+            translation.deactivate()
+
+    threads = []
+    for i in range(count):
+        thread = threading.Thread(target=thread_worker)
+        thread.daemon = True
+        thread.start()
+        threads.append(thread)
+    return threads
+
+
+def run_concurrently(calls, max_workers=DEFAULT_MAX_WORKERS):
+    """Calls each of the callables in ``calls`` (without arguments) using at
+    most ``max_workers`` threads, and returns a list of :class:`Result`
+    objects in the same order.
+
+    The calling thread takes part in the work, so at most
+    ``max_workers - 1`` additional threads are started, and none at all if
+    there is only a single call. The active translation is propagated to the
+    worker threads so lazily translated messages come out in the right
+    language.
+    """
+    calls = list(calls)
+    results = [Result() for call in calls]
+    jobs = iter(zip(calls, results))
+    lock = threading.Lock()
+
+    def worker():
+        while True:
+            with lock:
+                try:
+                    func, result = next(jobs)
+                except StopIteration:
+                    return
+            _call(func, result)
+
+    threads = _start_threads(worker, min(max_workers, len(calls)) - 1)
+    worker()
+    for thread in threads:
+        thread.join()
+    return results
+
+
+def iter_concurrently(calls, max_workers=DEFAULT_MAX_WORKERS):
+    """Like :func:`run_concurrently`, but yields an ``(index, result)`` pair
+    as soon as each call completes, ``index`` being the position of the call
+    in ``calls``, so that the caller can use the results of the fastest calls
+    while the others are still running.
+
+    The calls are made in worker threads, the calling thread only consuming
+    the results. With a single worker, the calls are made one after the
+    other, in order, by the calling thread.
+    """
+    calls = list(calls)
+    max_workers = min(max_workers, len(calls))
+    if max_workers <= 1:
+        for index, func in enumerate(calls):
+            result = Result()
+            _call(func, result)
+            yield index, result
+        return
+
+    jobs = iter(enumerate(calls))
+    lock = threading.Lock()
+    done = Queue.Queue()
+
+    def worker():
+        while True:
+            with lock:
+                try:
+                    index, func = next(jobs)
+                except StopIteration:
+                    return
+            result = Result()
+            _call(func, result)
+            done.put((index, result))
+
+    _start_threads(worker, max_workers)
+    for i in range(len(calls)):
+        yield done.get()
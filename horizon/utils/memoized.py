@@ -15,6 +15,8 @@
 #    under the License.
 
 import functools
+import threading
+import time
 import warnings
 import weakref
 
@@ -100,3 +102,159 @@ def memoized(func):
         return value
 
     return wrapped
+
+
+# Registry of every cache created by ``memoized_shared``, so that all of them
+# can be flushed at once (e.g. between tests, or after a known change).
+_shared_caches = []
+
+
+def shared_scope_key(request, scope):
+    """Calculate the part of the cache key that isolates tenants and users.
+
+    The key is built from the keystone endpoint and region the user is
+    working against, so that separate clouds and regions never share data.
+    See :func:`memoized_shared` for the meaning of ``scope``.
+    """
+    if request is None:
+        return (scope,)
+    user = getattr(request, 'user', None)
+    key = (scope,
+           getattr(user, 'endpoint', None),
+           getattr(user, 'services_region', None))
+    if scope in ('project', 'user'):
+        key += (getattr(user, 'tenant_id', None),)
+    if scope == 'user':
+        key += (getattr(user, 'id', None),)
+    return key
+
+
+class SharedCache(object):
+    """A thread-safe, size-bounded LRU cache whose entries expire after
+    ``ttl`` seconds.
+    """
+    def __init__(self, ttl, maxsize):
+        self.ttl = ttl
+        self.maxsize = maxsize
+        self._data = {}
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return len(self._data)
+
+    def get(self, key):
+        """Return the cached value for ``key``, raising ``KeyError`` on a
+        miss or when the entry has expired.
+        """
+        now = time.time()
+        with self._lock:
+            entry = self._data[key]
+            if entry[1] <= now:
+                del self._data[key]
+                raise KeyError(key)
+            entry[2] = now
+            return entry[0]
+
+    def set(self, key, value):
+        now = time.time()
+        with self._lock:
+            if key not in self._data and len(self._data) >= self.maxsize:
+                self._evict(now)
+            self._data[key] = [value, now + self.ttl, now]
+
+    def clear(self):
+        with self._lock:
+            self._data.clear()
+
+    def _evict(self, now):
+        # Drop anything that has already expired first; only if that doesn't
+        # free a slot do we throw away the least recently used entry.
+        for key, entry in self._data.items():
+            if entry[1] <= now:
+                del self._data[key]
+        if len(self._data) >= self.maxsize:
+            lru = min(self._data, key=lambda k: self._data[k][2])
+            del self._data[lru]
+
+
+def create_shared_cache(ttl=300, maxsize=256):
+    """Returns a new :class:`SharedCache`, for values which don't fit the
+    :func:`memoized_shared` decorator. It is flushed along with the others
+    by :func:`clear_shared_caches`.
+    """
+    cache = SharedCache(ttl, maxsize)
+    _shared_caches.append(cache)
+    return cache
+
+
+def memoized_shared(ttl=300, scope='project', maxsize=256):
+    """Decorator that caches function calls across requests.
+
+    Unlike :func:`memoized`, which only lives as long as the arguments it
+    was called with (usually the request), the values cached by this
+    decorator are shared by every request handled by the same process for
+    ``ttl`` seconds. It is meant for API calls whose results very rarely
+    change, such as extension or flavor lists.
+
+    The request argument (the first argument with a ``user`` attribute) is
+    not used as part of the key. It is replaced by a key derived from
+    ``scope``, which is one of:
+
+    ``"global"``
+        One value per keystone endpoint and region, shared by all users.
+    ``"project"``
+        One value per keystone endpoint, region and project.
+    ``"user"``
+        One value per keystone endpoint, region, project and user.
+
+    At most ``maxsize`` values are kept; when the cache is full the least
+    recently used one is discarded. The decorated function gets a
+    ``clear_cache()`` method to drop everything it has cached.
+    """
+    if scope not in ('global', 'project', 'user'):
+        raise ValueError('Invalid memoized_shared scope: %r' % scope)
+
+    def decorator(func):
+        cache = create_shared_cache(ttl, maxsize)
+
+        @functools.wraps(func)
+        def wrapped(*args, **kwargs):
+            request = None
+            key_args = []
+            for arg in args:
+                if request is None and hasattr(arg, 'user'):
+                    request = arg
+                else:
+                    key_args.append(arg)
+            key_kwargs = []
+            for name, value in sorted(kwargs.iteritems()):
+                if request is None and hasattr(value, 'user'):
+                    request = value
+                else:
+                    key_kwargs.append((name, value))
+            key = (shared_scope_key(request, scope),
+                   tuple(key_args), tuple(key_kwargs))
+            try:
+                value = cache.get(key)
+            except KeyError:
+                value = func(*args, **kwargs)
+                cache.set(key, value)
+            except TypeError:
+                warnings.warn(
+                    "The key %r is not hashable and cannot be memoized." % key,
+                    UnhashableKeyWarning, 2)
+                value = func(*args, **kwargs)
+            return value
+
+        wrapped.clear_cache = cache.clear
+        return wrapped
+
+    return decorator
+
+
+def clear_shared_caches():
+    """Drop every value cached by functions decorated with
+    :func:`memoized_shared`.
+    """
+    for cache in _shared_caches:
+        cache.clear()
@@ -0,0 +1,165 @@
+# vim: tabstop=4 shiftwidth=4 softtabstop=4
+
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+"""
+Helpers for progressive rendering: the page is sent straight away with a
+placeholder for each of its slow parts (tables, tabs), and each part is
+streamed in, with a script putting it in place, as soon as its data is
+loaded. The time to the first byte and the time until the page is usable no
+longer depend on the slowest service behind the page.
+"""
+
+import json
+import logging
+
+from django.conf import settings  # noqa
+from django.contrib.auth import REDIRECT_FIELD_NAME  # noqa
+from django import http
+from django.middleware import csrf
+from django.template.loader import render_to_string  # noqa
+from django.utils.encoding import force_unicode  # noqa
+from django.utils.http import urlencode  # noqa
+from django.utils import translation
+from django.utils.translation import ugettext_lazy as _  # noqa
+
+from horizon import exceptions
+from horizon.utils import concurrency
+
+
+LOG = logging.getLogger(__name__)
+
+PLACEHOLDER_TEMPLATE = "horizon/common/_progressive_placeholder.html"
+
+
+class Placeholder(object):
+    """Stands in for a table or tab in the context of a page rendered
+    progressively, rendering as an empty box with a loading indicator.
+    """
+    def __init__(self, placeholder_id):
+        self.placeholder_id = placeholder_id
+
+    def render(self):
+        return render_to_string(PLACEHOLDER_TEMPLATE,
+                                {"placeholder_id": self.placeholder_id})
+
+
+class Fragment(object):
+    """A part of a page rendered progressively.
+
+    ``load`` is called without arguments, in a worker thread, to load the
+    data of the part, and ``render`` is called in the thread serving the
+    request with the :class:`~horizon.utils.concurrency.Result` of ``load``,
+    to return its HTML.
+    """
+    def __init__(self, placeholder, load, render):
+        self.placeholder = placeholder
+        self.load = load
+        self.render = render
+
+
+def is_enabled(request):
+    """Returns whether the response to ``request`` may be rendered
+    progressively: only full page loads are, and only if the
+    ``PROGRESSIVE_RENDERING`` setting is ``True`` (the default).
+    """
+    return (getattr(settings, 'PROGRESSIVE_RENDERING', True) and
+            request.method == "GET" and not request.is_ajax())
+
+
+def _script(code):
+    return '<script type="text/javascript">%s</script>' % code
+
+
+def _js_args(*args):
+    # Escape "</" so that no argument can close the script element.
+    return json.dumps(args)[1:-1].replace("</", "<\\/")
+
+
+def _messages_script(request):
+    queued = request.horizon['async_messages']
+    if not queued:
+        return ''
+    messages = list(queued)
+    del queued[:len(messages)]
+    return _script("horizon.progressive.alert(%s);" % _js_args(messages))
+
+
+def _redirect_script(url):
+    return _script("horizon.progressive.redirect(%s);" % _js_args(url))
+
+
+def _login_url(request):
+    query = urlencode({REDIRECT_FIELD_NAME: request.get_full_path()})
+    return "%s?%s" % (settings.LOGIN_URL, query)
+
+
+def _stream(request, content, fragments, language):
+    if language:
+        translation.activate(language)
+    # Tables and tabs are rendered by the browser as the fragments arrive,
+    # before the end of the body.
+    head, sep, tail = content.rpartition("</body>")
+    if not sep:
+        head, tail = content, ''
+    yield head
+    loads = [fragment.load for fragment in fragments]
+    max_workers = getattr(settings, 'API_CONCURRENCY',
+                          concurrency.DEFAULT_MAX_WORKERS)
+    for index, result in concurrency.iter_concurrently(loads, max_workers):
+        fragment = fragments[index]
+        placeholder_id = fragment.placeholder.placeholder_id
+        try:
+            html = fragment.render(result)
+        except exceptions.Http302 as exc:
+            # The headers are long gone, the browser has to redirect itself.
+            yield _redirect_script(exc.location)
+            return
+        except (exceptions.NotAuthorized, exceptions.NotAuthenticated):
+            yield _redirect_script(_login_url(request))
+            return
+        except Exception:
+            # Unexpected errors can't turn the page into an error page any
+            # more, the section is left empty instead.
+            LOG.exception("Error rendering %s.", placeholder_id)
+            html = ''
+            request.horizon['async_messages'].append(
+                ['error', force_unicode(_("Unable to display this section.")),
+                 ''])
+        yield ('<div id="%s__fragment" class="hide">%s</div>%s'
+               % (placeholder_id, html,
+                  _script('horizon.progressive.fill(%s);'
+                          % _js_args(placeholder_id))))
+        yield _messages_script(request)
+    yield sep + tail
+
+
+def stream_response(request, content, fragments):
+    """Returns a streaming response sending ``content``, a page rendered
+    with the :class:`Placeholder` of each of the :class:`Fragment` objects
+    in ``fragments``, then each fragment as soon as its data is loaded.
+
+    The fragments are loaded concurrently, in at most ``API_CONCURRENCY``
+    threads. Messages added while loading or rendering them are shown with
+    JavaScript, as for AJAX requests, and redirections are done with
+    JavaScript as well.
+    """
+    if not hasattr(request, 'horizon'):
+        request.horizon = {}
+    request.horizon.setdefault('async_messages', [])
+    request.horizon['streaming'] = True
+    # The fragments may contain forms, and the CSRF cookie must be set
+    # before the headers are sent.
+    csrf.get_token(request)
+    return http.StreamingHttpResponse(
+        _stream(request, content, fragments, translation.get_language()))
@@ -0,0 +1,60 @@
+# vim: tabstop=4 shiftwidth=4 softtabstop=4
+
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+"""
+Helpers for time series sent to the charts.
+"""
+
+
+def downsample(points, threshold):
+    """Reduces ``points``, a list of ``(x, y)`` pairs of numbers sorted by
+    ``x``, to at most ``threshold`` of them while keeping the shape of the
+    line they draw, using the Largest-Triangle-Three-Buckets algorithm.
+
+    The first and last points are always kept. In between, the points are
+    split in ``threshold - 2`` buckets, and the point of each bucket kept is
+    the one forming the largest triangle with the point kept for the
+    previous bucket and the average of the next bucket. The points returned
+    are items of ``points``, in the same order.
+    """
+    points = list(points)
+    if threshold >= len(points):
+        return points
+    if threshold <= 2:
+        return [points[0], points[-1]][:max(threshold, 0)]
+
+    every = float(len(points) - 2) / (threshold - 2)
+    sampled = [points[0]]
+    previous = 0
+    for i in range(threshold - 2):
+        # The average point of the next bucket.
+        next_start = int((i + 1) * every) + 1
+        next_end = min(int((i + 2) * every) + 1, len(points))
+        next_points = points[next_start:next_end]
+        avg_x = sum(x for x, y in next_points) / float(len(next_points))
+        avg_y = sum(y for x, y in next_points) / float(len(next_points))
+
+        prev_x, prev_y = points[previous]
+        max_area = -1
+        for j in range(int(i * every) + 1, next_start):
+            x, y = points[j]
+            area = abs((prev_x - avg_x) * (y - prev_y) -
+                       (prev_x - x) * (avg_y - prev_y))
+            if area > max_area:
+                max_area = area
+                selected = j
+        sampled.append(points[selected])
+        previous = selected
+    sampled.append(points[-1])
+    return sampled
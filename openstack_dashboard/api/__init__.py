@@ -45,6 +45,7 @@ from openstack_dashboard.api import network
 from openstack_dashboard.api import neutron
 from openstack_dashboard.api import nova
 from openstack_dashboard.api import swift
+from openstack_dashboard.api import tracing
 from openstack_dashboard.api import trove
 from openstack_dashboard.api import vpn
 
@@ -62,3 +63,8 @@ assert swift
 assert ceilometer
 assert trove
 assert vpn
+
+# Record the calls made to the API wrappers, when tracing is enabled.
+for _module in (ceilometer, cinder, fwaas, glance, heat, keystone, lbaas,
+                network, neutron, nova, swift, trove, vpn):
+    tracing.trace_module(_module)
@@ -20,18 +20,28 @@
 
 from collections import Sequence  # noqa
 import logging
+import threading
 
 from django.conf import settings  # noqa
+from django.utils.datastructures import SortedDict  # noqa
+
+from openstack_auth import utils as auth_utils
 
 from horizon import exceptions
+from horizon.utils import concurrency
 
 
 __all__ = ('APIResourceWrapper', 'APIDictWrapper',
-           'get_service_from_catalog', 'url_for',)
+           'get_service_from_catalog', 'url_for', 'call_concurrently',
+           'pooled_client',)
 
 
 LOG = logging.getLogger(__name__)
 
+# Service clients are pooled per thread, since most of them keep a single
+# HTTP connection which can't be shared between threads.
+_client_pool = threading.local()
+
 
 class APIVersionManager(object):
     """Object to store and manage API versioning data and utility methods."""
@@ -247,40 +257,189 @@ def get_url_for_service(service, region, endpoint_type):
     return None
 
 
+class ServiceCatalogIndex(object):
+    """An index of the endpoints in a service catalog.
+
+    Looking up an endpoint in the catalog means scanning every service and
+    each of their endpoints, and is done for nearly every API call. The
+    index maps ``(service_type, region, endpoint_type)`` to the endpoint's
+    URL instead, giving the same results as :func:`get_url_for_service`.
+    The region is ``None`` for the identity service, whose endpoints are
+    used whatever the region.
+    """
+    def __init__(self, catalog):
+        self.services = {}
+        self.regions = set()
+        self.urls = {}
+        interface_types = dict((interface, endpoint_type) for
+                               endpoint_type, interface in
+                               ENDPOINT_TYPE_TO_INTERFACE.items())
+        for service in catalog or []:
+            service_type = service['type']
+            if service_type in self.services:
+                continue
+            self.services[service_type] = service
+            identity_version = get_version_from_service(service)
+            regions = set()
+            for endpoint in service['endpoints']:
+                region = endpoint.get('region')
+                if service_type == 'identity':
+                    region = None
+                self.regions.add((service_type, region))
+                if identity_version < 3:
+                    # Only the first endpoint of a region is ever used.
+                    if region in regions:
+                        continue
+                    regions.add(region)
+                    for endpoint_type, url in endpoint.items():
+                        self.urls[(service_type, region, endpoint_type)] = url
+                else:
+                    endpoint_type = interface_types.get(
+                        endpoint.get('interface'))
+                    key = (service_type, region, endpoint_type)
+                    if endpoint_type and key not in self.urls:
+                        self.urls[key] = endpoint.get('url')
+
+    def _region(self, service_type, region):
+        return None if service_type == 'identity' else region
+
+    def get_service(self, service_type):
+        return self.services.get(service_type)
+
+    def get_url(self, service_type, region, endpoint_type):
+        region = self._region(service_type, region)
+        return self.urls.get((service_type, region, endpoint_type))
+
+    def has_endpoints(self, service_type, region):
+        region = self._region(service_type, region)
+        return (service_type, region) in self.regions
+
+
+def get_catalog_index(user):
+    """Returns the :class:`ServiceCatalogIndex` for the user's service
+    catalog, building it only once for each catalog.
+    """
+    catalog = getattr(user, 'service_catalog', None)
+    cached = getattr(user, '_catalog_index', None)
+    if cached is None or cached[0] is not catalog:
+        cached = (catalog, ServiceCatalogIndex(catalog))
+        user._catalog_index = cached
+    return cached[1]
+
+
 def url_for(request, service_type, endpoint_type=None, region=None):
     endpoint_type = endpoint_type or getattr(settings,
                                              'OPENSTACK_ENDPOINT_TYPE',
                                              'publicURL')
     fallback_endpoint_type = getattr(settings, 'SECONDARY_ENDPOINT_TYPE', None)
 
-    catalog = request.user.service_catalog
-    service = get_service_from_catalog(catalog, service_type)
-    if service:
-        if not region:
-            region = request.user.services_region
-        url = get_url_for_service(service,
-                                  region,
-                                  endpoint_type)
-        if not url and fallback_endpoint_type:
-            url = get_url_for_service(service,
-                                      region,
-                                      fallback_endpoint_type)
-        if url:
-            return url
+    catalog = get_catalog_index(request.user)
+    if not region:
+        region = request.user.services_region
+    url = catalog.get_url(service_type, region, endpoint_type)
+    if not url and fallback_endpoint_type:
+        url = catalog.get_url(service_type, region, fallback_endpoint_type)
+    if url:
+        return url
     raise exceptions.ServiceCatalogException(service_type)
 
 
 def is_service_enabled(request, service_type, service_name=None):
-    service = get_service_from_catalog(request.user.service_catalog,
-                                       service_type)
-    if service:
-        region = request.user.services_region
-        for endpoint in service['endpoints']:
-            # ignore region for identity
-            if service['type'] == 'identity' or \
-               endpoint['region'] == region:
-                if service_name:
-                    return service['name'] == service_name
-                else:
-                    return True
+    catalog = get_catalog_index(request.user)
+    if catalog.has_endpoints(service_type, request.user.services_region):
+        if service_name:
+            return catalog.get_service(service_type)['name'] == service_name
+        return True
     return False
+
+
+def call_concurrently(calls, max_workers=None):
+    """Makes several independent API calls at the same time.
+
+    ``calls`` is a dictionary mapping names to callables taking no arguments
+    (usually ``functools.partial`` objects wrapping an API function and the
+    request). A dictionary mapping the same names to
+    :class:`horizon.utils.concurrency.Result` objects is returned once every
+    call has finished. Failures are isolated: call ``result.get()`` inside a
+    ``try``/``except`` block and pass the error on to
+    :func:`horizon.exceptions.handle` as usual.
+
+    The number of threads is limited by ``max_workers`` or, by default, the
+    ``API_CONCURRENCY`` setting.
+    """
+    if max_workers is None:
+        max_workers = getattr(settings, 'API_CONCURRENCY',
+                              concurrency.DEFAULT_MAX_WORKERS)
+    names = list(calls)
+    results = concurrency.run_concurrently([calls[name] for name in names],
+                                           max_workers=max_workers)
+    return dict(zip(names, results))
+
+
+def _token_expired(token):
+    if getattr(token, 'expires', None) is None:
+        return False
+    try:
+        return not auth_utils.check_token_expiration(token)
+    except Exception:
+        return True
+
+
+def pooled_client(request, service, key, create):
+    """Returns a client for ``service``, reusing a previously created one.
+
+    Clients are kept in a per-thread pool keyed on the service, the
+    user's token and ``key`` (a tuple of whatever else the client depends
+    on, such as the endpoint and SSL options), so they and their keep-alive
+    HTTP connections are reused by every call made with the same token,
+    whether during the same request or later ones handled by the same
+    worker. ``create`` is called without arguments to build a client when
+    none is available.
+
+    The pool holds at most ``API_CLIENT_POOL_SIZE`` clients, dropping the
+    least recently used ones first; clients whose token has expired are
+    dropped as soon as a new one is added. Setting it to ``0`` disables
+    pooling.
+    """
+    max_size = getattr(settings, 'API_CLIENT_POOL_SIZE', 32)
+    if not max_size:
+        return create()
+    token = request.user.token
+    pool = getattr(_client_pool, 'clients', None)
+    if pool is None:
+        pool = _client_pool.clients = SortedDict()
+    pool_key = (service, token.id) + tuple(key)
+    if pool_key in pool:
+        # Move the client to the end of the pool, most recently used last.
+        client, token = pool.pop(pool_key)
+        pool[pool_key] = (client, token)
+        return client
+
+    client = create()
+    for old_key, (old_client, old_token) in pool.items():
+        if _token_expired(old_token):
+            del pool[old_key]
+    while len(pool) >= max_size:
+        del pool[pool.keys()[0]]
+    pool[pool_key] = (client, token)
+    return client
+
+
+def detach_resource(resource):
+    """Drops the manager of ``resource``, an object returned by a client
+    library, and returns it.
+
+    The manager holds the client, and thus the token, of the user who
+    fetched the resource: resources cached across requests, and shared
+    between users, must not keep it. Detached resources can't be used to
+    make further API calls.
+    """
+    resource.manager = None
+    return resource
+
+
+def clear_client_pool():
+    """Drops all the clients pooled by :func:`pooled_client` in the current
+    thread.
+    """
+    _client_pool.clients = SortedDict()
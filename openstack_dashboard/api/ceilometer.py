@@ -12,8 +12,10 @@
 # License for the specific language governing permissions and limitations
 # under the License.
 
+import calendar
+import datetime
+import functools
 import logging
-import threading
 
 from ceilometerclient import client as ceilometer_client
 from django.conf import settings  # noqa
@@ -21,6 +23,8 @@ from django.utils import datastructures
 from django.utils.translation import ugettext_lazy as _  # noqa
 
 from horizon import exceptions
+from horizon.utils import concurrency
+from horizon.utils import memoized
 
 from openstack_dashboard.api import base
 from openstack_dashboard.api import keystone
@@ -28,6 +32,18 @@ from openstack_dashboard.api import nova
 
 LOG = logging.getLogger(__name__)
 
+# Statistics of the periods which are over never change, so they are cached
+# for the periodic statistics queries which start on a multiple of their
+# period (see align_to_period), keyed on the meter, the rest of the query
+# and the period. Each entry holds the covered time range and its statistics.
+_statistics_cache = memoized.create_shared_cache(
+    ttl=24 * 3600,
+    maxsize=getattr(settings, 'CEILOMETER_STATISTICS_CACHE_SIZE', 100))
+
+# Samples may reach Ceilometer some time after their timestamp, so periods are
+# only considered over this many seconds after their end.
+STATISTICS_CLOSE_DELAY = 600
+
 
 def get_flavor_names(request):
     # TODO(lsmola) The flavors can be set per project,
@@ -129,8 +145,8 @@ class Resource(base.APIResourceWrapper):
                                    self.user_id,
                                    self.resource_id)
 
-        # TODO(lsmola) make parallel obtaining of tenant and user
-        # make the threading here, thread join into resource_list
+        # The tenants and users are usually preloaded in bulk, see
+        # resource_list.
         if ceilometer_usage and self.project_id:
             self._tenant = ceilometer_usage.get_tenant(self.project_id)
         else:
@@ -200,8 +216,6 @@ class ResourceAggregate(Resource):
         if query:
             self._query = query
         else:
-            # TODO(lsmola) make parallel obtaining of tenant and user
-            # make the threading here, thread join into resource_list
             if (ceilometer_usage and tenant_id):
                 self.tenant_id = tenant_id
                 self._tenant = ceilometer_usage.get_tenant(tenant_id)
@@ -260,18 +274,33 @@ def ceilometerclient(request):
     endpoint = base.url_for(request, 'metering')
     insecure = getattr(settings, 'OPENSTACK_SSL_NO_VERIFY', False)
     cacert = getattr(settings, 'OPENSTACK_SSL_CACERT', None)
-    LOG.debug('ceilometerclient connection created using token "%s" '
-              'and endpoint "%s"' % (request.user.token.id, endpoint))
-    return ceilometer_client.Client('2', endpoint,
-                                    token=(lambda: request.user.token.id),
-                                    insecure=insecure,
-                                    ca_file=cacert)
+    token_id = request.user.token.id
+
+    def create():
+        LOG.debug('ceilometerclient connection created using token "%s" '
+                  'and endpoint "%s"', token_id, endpoint)
+        return ceilometer_client.Client('2', endpoint,
+                                        token=(lambda: token_id),
+                                        insecure=insecure,
+                                        ca_file=cacert,
+                                        timeout=timeout)
+    timeout = getattr(settings, 'CEILOMETER_TIMEOUT', None)
+    return base.pooled_client(request, 'metering',
+                              (endpoint, insecure, cacert, timeout), create)
 
 
 def resource_list(request, query=None, ceilometer_usage_object=None):
-    """List the resources."""
+    """List the resources.
+
+    If a ``ceilometer_usage_object`` is given, the tenants and users owning
+    the resources are resolved with it, all at once.
+    """
     resources = ceilometerclient(request).\
         resources.list(q=query)
+    if ceilometer_usage_object:
+        ceilometer_usage_object.preload_tenants_and_users(
+            [r.project_id for r in resources if r.project_id],
+            [r.user_id for r in resources if r.user_id])
     return [Resource(r, ceilometer_usage_object) for r in resources]
 
 
@@ -295,71 +324,40 @@ def statistic_list(request, meter_name, query=None, period=None):
     return [Statistic(s) for s in statistics]
 
 
-class ThreadedUpdateResourceWithStatistics(threading.Thread):
-    """Multithread wrapper for update_with_statistics method of
-    resource_usage.
-
-    A join logic is placed in process_list class method. All resources
-    will have its statistics attribute filled in separate threads.
+def align_to_period(timestamp, period):
+    """Returns the start of the period of ``period`` seconds ``timestamp``
+    (a naive datetime, in UTC) falls in, periods being counted from the
+    epoch.
 
-    The resource_usage object is shared between threads. Each thread is
-    updating one Resource.
-
-    :Parameters:
-      - `resource`: Resource or ResourceAggregate object, that will
-                    be filled by statistic data.
-      - `resources`: List of Resource or ResourceAggregate object,
-                     that will be filled by statistic data.
-      - `resource_usage`: Wrapping resource usage object, that holds
-                          all statistics data.
-      - `meter_names`: List of meter names of the statistics we want.
-      - `period`: In seconds. If no period is given, only one aggregate
-                  statistic is returned. If given, a faceted result will be
-                  returned, divided into given periods. Periods with no
-                  data are ignored.
-      - `stats_attr`: String representing the attribute name of the stats.
-                      E.g. (avg, max, min...) If None is given, whole
-                      statistic object is returned,
-      - `additional_query`: Additional query for the statistics.
-                            E.g. timespan, etc.
+    Starting the statistics queries on such a boundary makes their results
+    cacheable, since the same periods are then returned by every query.
     """
-    # TODO(lsmola) Can be removed once Ceilometer supports sample-api
-    # and group-by, so all of this optimization will not be necessary.
-    # It is planned somewhere to I.
-
-    def __init__(self, resource_usage, resource, meter_names=None,
-                 period=None, filter_func=None, stats_attr=None,
-                 additional_query=None):
-        super(ThreadedUpdateResourceWithStatistics, self).__init__()
-        self.resource_usage = resource_usage
-        self.resource = resource
-        self.meter_names = meter_names
-        self.period = period
-        self.stats_attr = stats_attr
-        self.additional_query = additional_query
-
-    def run(self):
-        # Run the job
-        self.resource_usage.update_with_statistics(self.resource,
-            meter_names=self.meter_names, period=self.period,
-            stats_attr=self.stats_attr, additional_query=self.additional_query)
-
-    @classmethod
-    def process_list(cls, resource_usage, resources, meter_names=None,
-                 period=None, filter_func=None, stats_attr=None,
-                 additional_query=None):
-        threads = []
+    seconds = calendar.timegm(timestamp.timetuple())
+    return datetime.datetime.utcfromtimestamp(seconds - seconds % period)
 
-        for resource in resources:
-            # add statistics data into resource
-            thread = cls(resource_usage, resource, meter_names=meter_names,
-                period=period, stats_attr=stats_attr,
-                additional_query=additional_query)
-            thread.start()
-            threads.append(thread)
 
-        for thread in threads:
-            thread.join()
+def _split_time_query(query):
+    """Splits the timestamp bounds off a query, returning the start and end
+    timestamps (or ``None``) and the remaining conditions.
+    """
+    start = end = None
+    rest = []
+    for condition in query or []:
+        if condition.get('field') == 'timestamp' and \
+                isinstance(condition.get('value'), datetime.datetime):
+            if condition.get('op') == 'ge' and start is None:
+                start = condition['value']
+                continue
+            elif condition.get('op') == 'le' and end is None:
+                end = condition['value']
+                continue
+        rest.append(condition)
+    return start, end, rest
+
+
+def _period_start(statistic):
+    return datetime.datetime.strptime(statistic.period_start[:19],
+                                      "%Y-%m-%dT%H:%M:%S")
 
 
 class CeilometerUsage(object):
@@ -388,15 +386,28 @@ class CeilometerUsage(object):
         """Returns user fetched form API
 
         Caching the result, so it doesn't contact API twice with the
-        same query
+        same query. Returns None if there is no such user.
         """
 
-        user = self._users.get(user_id, None)
-        if not user:
-            user = keystone.user_get(self._request, user_id)
-            # caching the user, for later use
-            self._users[user_id] = user
-        return user
+        if user_id not in self._users:
+            self.preload_users([user_id])
+        return self._users[user_id]
+
+    def preload_users(self, user_ids):
+        """Preloads the users with the given ids into dictionary.
+
+        The users which aren't cached yet are resolved in bulk, see
+        :func:`openstack_dashboard.api.keystone.user_get_many`.
+        """
+
+        missing = []
+        for user_id in user_ids:
+            if user_id not in self._users and user_id not in missing:
+                missing.append(user_id)
+        if missing:
+            users = keystone.user_get_many(self._request, missing)
+            for user_id in missing:
+                self._users[user_id] = users.get(user_id, None)
 
     def preload_all_users(self):
         """Preloads all users into dictionary.
@@ -415,15 +426,39 @@ class CeilometerUsage(object):
         """Returns tenant fetched form API.
 
         Caching the result, so it doesn't contact API twice with the
-        same query
+        same query. Returns None if there is no such tenant.
+        """
+
+        if tenant_id not in self._tenants:
+            self.preload_tenants([tenant_id])
+        return self._tenants[tenant_id]
+
+    def preload_tenants(self, tenant_ids):
+        """Preloads the tenants with the given ids into dictionary.
+
+        The tenants which aren't cached yet are resolved in bulk, see
+        :func:`openstack_dashboard.api.keystone.tenant_get_many`.
         """
 
-        tenant = self._tenants.get(tenant_id, None)
-        if not tenant:
-            tenant = keystone.tenant_get(self._request, tenant_id)
-            # caching the tenant for later use
-            self._tenants[tenant_id] = tenant
-        return tenant
+        missing = []
+        for tenant_id in tenant_ids:
+            if tenant_id not in self._tenants and tenant_id not in missing:
+                missing.append(tenant_id)
+        if missing:
+            tenants = keystone.tenant_get_many(self._request, missing)
+            for tenant_id in missing:
+                self._tenants[tenant_id] = tenants.get(tenant_id, None)
+
+    def preload_tenants_and_users(self, tenant_ids, user_ids):
+        """Preloads the tenants and users with the given ids at the same
+        time, see :meth:`preload_tenants` and :meth:`preload_users`.
+        """
+
+        results = base.call_concurrently({
+            'tenants': functools.partial(self.preload_tenants, tenant_ids),
+            'users': functools.partial(self.preload_users, user_ids)})
+        results['tenants'].get()
+        results['users'].get()
 
     def preload_all_tenants(self):
         """Preloads all teannts into dictionary.
@@ -541,26 +576,67 @@ class CeilometerUsage(object):
                                 E.g. timespan, etc.
         """
 
+        self.update_many_with_statistics([resource], meter_names=meter_names,
+                                         period=period, stats_attr=stats_attr,
+                                         additional_query=additional_query)
+        return resource
+
+    def update_many_with_statistics(self, resources, meter_names=None,
+                                    period=None, stats_attr=None,
+                                    additional_query=None):
+        """Adding statistical data into several Resources or
+        ResourceAggregates, as :meth:`update_with_statistics` does.
+
+        The statistics of each meter of each resource are fetched at the same
+        time, using at most ``CEILOMETER_STATISTICS_CONCURRENCY`` threads.
+        The meters whose statistics couldn't be fetched are set to ``None``,
+        like the ones without data; the error is only raised if none of the
+        statistics could be fetched.
+
+        :Parameters:
+          - `resources`: List of Resource or ResourceAggregate objects, that
+                         will be filled by statistic data.
+          - `meter_names`: List of meter names of which we want the
+                           statistics.
+          - `period`: See :meth:`update_with_statistics`.
+          - `stats_attr`: See :meth:`update_with_statistics`.
+          - `additional_query`: Additional query for the statistics.
+                                E.g. timespan, etc.
+        """
+
         if not meter_names:
             raise ValueError("meter_names and resource must be defined to be"
                              "able to obtain the statistics.")
+        if additional_query and not is_iterable(additional_query):
+            raise ValueError("Additional query must be list of"
+                             " conditions. See the docs for format.")
 
-        # query for identifying one resource in meters
-        query = resource.query
-        if additional_query:
-            if not is_iterable(additional_query):
-                raise ValueError("Additional query must be list of"
-                                 " conditions. See the docs for format.")
-            query = query + additional_query
-
-        # TODO(lsmola) thread for each meter will be probably overkill
-        # but I should test lets say thread pool with 100 of threads
-        # and apply it only to this code.
-        # Though I do expect Ceilometer will support bulk requests,
-        # so all of this optimization will not be necessary.
-        for meter in meter_names:
-            statistics = statistic_list(self._request, meter,
-                                        query=query, period=period)
+        jobs = []
+        for resource in resources:
+            # query for identifying one resource in meters
+            query = resource.query
+            if additional_query:
+                query = query + additional_query
+            for meter in meter_names:
+                call = functools.partial(self.statistic_list, meter,
+                                         query=query, period=period)
+                jobs.append((resource, meter, call))
+
+        max_workers = getattr(settings, 'CEILOMETER_STATISTICS_CONCURRENCY',
+                              getattr(settings, 'API_CONCURRENCY',
+                                      concurrency.DEFAULT_MAX_WORKERS))
+        results = concurrency.run_concurrently(
+            [call for resource, meter, call in jobs], max_workers=max_workers)
+
+        failed = [result for result in results if result.failed]
+        if failed and len(failed) == len(results):
+            failed[0].get()
+        elif failed:
+            LOG.warning("Unable to retrieve %d of %d Ceilometer statistics.",
+                        len(failed), len(results))
+
+        for (resource, meter, call), result in zip(jobs, results):
+            statistics = None if result.failed else result.value
             meter = meter.replace(".", "_")
             if statistics:
                 if stats_attr:
@@ -573,7 +649,63 @@ class CeilometerUsage(object):
             else:
                 setattr(resource, meter, None)
 
-        return resource
+        return resources
+
+    def statistic_list(self, meter_name, query=None, period=None):
+        """List of statistics, like :func:`statistic_list`.
+
+        When the query asks for the statistics of each ``period`` starting
+        from a timestamp aligned on that period, the statistics of the
+        periods which are over are cached, and only those of the following
+        ones are fetched on the next calls.
+        """
+        start, end, rest = _split_time_query(query)
+        if (not period or start is None or
+                not getattr(settings, 'CEILOMETER_STATISTICS_CACHE_SIZE', 100)
+                or start != align_to_period(start, period)):
+            return statistic_list(self._request, meter_name, query=query,
+                                  period=period)
+
+        user = self._request.user
+        key = (getattr(user, 'endpoint', None),
+               getattr(user, 'services_region', None),
+               user.tenant_id, user.id, meter_name, repr(rest), period)
+        try:
+            covered_from, covered_until, cached = _statistics_cache.get(key)
+        except KeyError:
+            covered_from = covered_until = None
+            cached = []
+        if covered_from is not None and end is not None and \
+                end < covered_until:
+            return statistic_list(self._request, meter_name, query=query,
+                                  period=period)
+        if covered_from is None or not covered_from <= start <= covered_until:
+            covered_from = covered_until = start
+            cached = []
+
+        fetch_query = rest + [{'field': 'timestamp',
+                               'op': 'ge',
+                               'value': covered_until}]
+        if end is not None:
+            fetch_query.append({'field': 'timestamp',
+                                'op': 'le',
+                                'value': end})
+        fetched = statistic_list(self._request, meter_name,
+                                 query=fetch_query, period=period)
+
+        now = datetime.datetime.utcnow()
+        closed_until = now - datetime.timedelta(seconds=STATISTICS_CLOSE_DELAY)
+        if end is not None:
+            closed_until = min(closed_until, end)
+        closed_until = align_to_period(closed_until, period)
+        if closed_until > covered_until:
+            closed = [statistic for statistic in fetched
+                      if _period_start(statistic) < closed_until]
+            _statistics_cache.set(key, (covered_from, closed_until,
+                                        cached + closed))
+
+        return [statistic for statistic in cached
+                if _period_start(statistic) >= start] + fetched
 
     def resources(self, query=None, filter_func=None,
                   with_users_and_tenants=False):
@@ -631,8 +763,8 @@ class CeilometerUsage(object):
         resources = self.resources(query, filter_func=filter_func,
             with_users_and_tenants=with_users_and_tenants)
 
-        ThreadedUpdateResourceWithStatistics.process_list(self, resources,
-            meter_names=meter_names, period=period, stats_attr=stats_attr,
+        self.update_many_with_statistics(resources, meter_names=meter_names,
+            period=period, stats_attr=stats_attr,
             additional_query=additional_query)
 
         return resources
@@ -678,9 +810,9 @@ class CeilometerUsage(object):
         """
         resource_aggregates = self.resource_aggregates(queries)
 
-        ThreadedUpdateResourceWithStatistics.process_list(self,
-            resource_aggregates, meter_names=meter_names, period=period,
-            stats_attr=stats_attr, additional_query=additional_query)
+        self.update_many_with_statistics(resource_aggregates,
+            meter_names=meter_names, period=period, stats_attr=stats_attr,
+            additional_query=additional_query)
 
         return resource_aggregates
 
@@ -31,7 +31,7 @@ from cinderclient.v1 import client as cinder_client
 from cinderclient.v1.contrib import list_extensions as cinder_list_extensions
 
 from horizon import exceptions
-from horizon.utils.memoized import memoized  # noqa
+from horizon.utils.memoized import memoized_shared  # noqa
 
 from openstack_dashboard.api import base
 from openstack_dashboard.api import nova
@@ -53,18 +53,22 @@ def cinderclient(request):
     except exceptions.ServiceCatalogException:
         LOG.debug('no volume service configured.')
         return None
-    LOG.debug('cinderclient connection created using token "%s" and url "%s"' %
-              (request.user.token.id, cinder_url))
-    c = cinder_client.Client(request.user.username,
-                             request.user.token.id,
-                             project_id=request.user.tenant_id,
-                             auth_url=cinder_url,
-                             insecure=insecure,
-                             cacert=cacert,
-                             http_log_debug=settings.DEBUG)
-    c.client.auth_token = request.user.token.id
-    c.client.management_url = cinder_url
-    return c
+
+    def create():
+        LOG.debug('cinderclient connection created using token "%s" and url '
+                  '"%s"', request.user.token.id, cinder_url)
+        c = cinder_client.Client(request.user.username,
+                                 request.user.token.id,
+                                 project_id=request.user.tenant_id,
+                                 auth_url=cinder_url,
+                                 insecure=insecure,
+                                 cacert=cacert,
+                                 http_log_debug=settings.DEBUG)
+        c.client.auth_token = request.user.token.id
+        c.client.management_url = cinder_url
+        return c
+    return base.pooled_client(request, 'volume',
+                              (cinder_url, insecure, cacert), create)
 
 
 def volume_list(request, search_opts=None):
@@ -172,13 +176,14 @@ def availability_zone_list(request, detailed=False):
     return cinderclient(request).availability_zones.list(detailed=detailed)
 
 
-@memoized
+@memoized_shared(ttl=3600, scope='global')
 def list_extensions(request):
-    return cinder_list_extensions.ListExtManager(cinderclient(request))\
+    extensions = cinder_list_extensions.ListExtManager(cinderclient(request))\
         .show_all()
+    return [base.detach_resource(extension) for extension in extensions]
 
 
-@memoized
+@memoized_shared(ttl=3600, scope='global')
 def extension_supported(request, extension_name):
     """This method will determine if Cinder supports a given extension name.
     """
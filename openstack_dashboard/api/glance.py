@@ -42,10 +42,14 @@ def glanceclient(request):
     url = "://".join((o.scheme, o.netloc))
     insecure = getattr(settings, 'OPENSTACK_SSL_NO_VERIFY', False)
     cacert = getattr(settings, 'OPENSTACK_SSL_CACERT', None)
-    LOG.debug('glanceclient connection created using token "%s" and url "%s"'
-              % (request.user.token.id, url))
-    return glance_client.Client('1', url, token=request.user.token.id,
-                                insecure=insecure, cacert=cacert)
+
+    def create():
+        LOG.debug('glanceclient connection created using token "%s" and url '
+                  '"%s"', request.user.token.id, url)
+        return glance_client.Client('1', url, token=request.user.token.id,
+                                    insecure=insecure, cacert=cacert)
+    return base.pooled_client(request, 'image', (url, insecure, cacert),
+                              create)
 
 
 def image_delete(request, image_id):
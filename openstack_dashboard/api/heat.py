@@ -34,8 +34,8 @@ def heatclient(request, password=None):
     insecure = getattr(settings, 'OPENSTACK_SSL_NO_VERIFY', False)
     cacert = getattr(settings, 'OPENSTACK_SSL_CACERT', None)
     endpoint = base.url_for(request, 'orchestration')
-    LOG.debug('heatclient connection created using token "%s" and url "%s"' %
-              (request.user.token.id, endpoint))
+    LOG.debug('heatclient connection created using token "%s" and url "%s"',
+              request.user.token.id, endpoint)
     kwargs = {
         'token': request.user.token.id,
         'insecure': insecure,
@@ -47,9 +47,16 @@ def heatclient(request, password=None):
         #'cert_file': args.cert_file,
         #'key_file': args.key_file,
     }
-    client = heat_client.Client(api_version, endpoint, **kwargs)
-    client.format_parameters = format_parameters
-    return client
+
+    def create():
+        client = heat_client.Client(api_version, endpoint, **kwargs)
+        client.format_parameters = format_parameters
+        return client
+    if password:
+        # Clients authenticating with a password are never shared.
+        return create()
+    return base.pooled_client(request, 'orchestration',
+                              (endpoint, insecure, cacert), create)
 
 
 def stacks_list(request):
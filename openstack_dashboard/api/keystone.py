@@ -19,6 +19,7 @@
 #    License for the specific language governing permissions and limitations
 #    under the License.
 
+import functools
 import logging
 import urlparse
 
@@ -32,7 +33,9 @@ from openstack_auth import utils as auth_utils
 
 from horizon import exceptions
 from horizon import messages
+from horizon.utils import concurrency
 from horizon.utils import functions as utils
+from horizon.utils import memoized
 
 from openstack_dashboard.api import base
 
@@ -40,6 +43,13 @@ from openstack_dashboard.api import base
 LOG = logging.getLogger(__name__)
 DEFAULT_ROLE = None
 
+# Projects and users resolved by tenant_get_many and user_get_many are shared
+# between requests for a while, so that pages showing the owners of other
+# projects' resources don't fetch the same ones over and over.
+_lookup_cache = memoized.create_shared_cache(
+    ttl=getattr(settings, 'KEYSTONE_LOOKUP_CACHE_TTL', 300),
+    maxsize=getattr(settings, 'KEYSTONE_LOOKUP_CACHE_SIZE', 1000))
+
 
 # Set up our data structure for managing Identity API versions, and
 # add a couple utility methods to it.
@@ -160,13 +170,13 @@ def keystoneclient(request, admin=False):
         else backend.KEYSTONE_CLIENT_ATTR
     if hasattr(request, cache_attr) and (not user.token.id
             or getattr(request, cache_attr).auth_token == user.token.id):
-        LOG.debug("Using cached client for token: %s" % user.token.id)
+        LOG.debug("Using cached client for token: %s", user.token.id)
         conn = getattr(request, cache_attr)
     else:
         endpoint = _get_endpoint_url(request, endpoint_type)
         insecure = getattr(settings, 'OPENSTACK_SSL_NO_VERIFY', False)
         cacert = getattr(settings, 'OPENSTACK_SSL_CACERT', None)
-        LOG.debug("Creating a new keystoneclient connection to %s." % endpoint)
+        LOG.debug("Creating a new keystoneclient connection to %s.", endpoint)
         remote_addr = request.environ.get('REMOTE_ADDR', '')
         conn = api_version['client'].Client(token=user.token.id,
                                             endpoint=endpoint,
@@ -233,7 +243,7 @@ def get_default_domain(request):
             domain = domain_get(request, domain_id)
             domain_name = domain.name
         except Exception:
-            LOG.warning("Unable to retrieve Domain: %s" % domain_id)
+            LOG.warning("Unable to retrieve Domain: %s", domain_id)
     domain = base.APIDictWrapper({"id": domain_id,
                                   "name": domain_name})
     return domain
@@ -315,6 +325,79 @@ def user_get(request, user_id, admin=True):
     return VERSIONS.upgrade_v2_user(user)
 
 
+def _get_many(request, kind, ids, admin, get, list_all):
+    """Resolves ``ids`` with the shared cache, and then either ``list_all``
+    (if there are many left) or ``get`` (called for each of them at the same
+    time). Returns a dictionary of the objects found.
+    """
+    scope = memoized.shared_scope_key(request, 'global' if admin else 'user')
+    found = {}
+    missing = []
+    for obj_id in ids:
+        if obj_id in found or obj_id in missing:
+            continue
+        try:
+            found[obj_id] = _lookup_cache.get((scope, kind, obj_id))
+        except KeyError:
+            missing.append(obj_id)
+    if not missing:
+        return found
+
+    threshold = getattr(settings, 'KEYSTONE_BULK_LOOKUP_THRESHOLD', 10)
+    if admin and len(missing) > threshold:
+        # Listing all of them is cheaper than that many separate requests.
+        listed = dict((obj.id, obj) for obj in list_all())
+        fetched = [listed.get(obj_id, None) for obj_id in missing]
+    else:
+        max_workers = getattr(settings, 'API_CONCURRENCY',
+                              concurrency.DEFAULT_MAX_WORKERS)
+        results = concurrency.run_concurrently(
+            [functools.partial(get, request, obj_id, admin=admin)
+             for obj_id in missing],
+            max_workers=max_workers)
+        fetched = []
+        for obj_id, result in zip(missing, results):
+            try:
+                fetched.append(result.get())
+            except Exception:
+                LOG.debug("Unable to retrieve %s %s.", kind, obj_id,
+                          exc_info=True)
+                fetched.append(None)
+
+    for obj_id, obj in zip(missing, fetched):
+        if obj is not None:
+            found[obj_id] = obj
+            if _lookup_cache.maxsize:
+                _lookup_cache.set((scope, kind, obj_id),
+                                  base.detach_resource(obj))
+    return found
+
+
+def tenant_get_many(request, project_ids, admin=True):
+    """Resolves a number of project IDs to projects in bulk.
+
+    Each unique ID is only resolved once, and projects resolved recently
+    (by any request against the same keystone endpoint) are reused. When
+    more than ``KEYSTONE_BULK_LOOKUP_THRESHOLD`` projects are left, all the
+    projects are listed at once; otherwise they are fetched at the same
+    time.
+
+    Returns a dictionary mapping the IDs to their projects. IDs which can't
+    be resolved (e.g. those of deleted projects) are left out of it.
+    """
+    return _get_many(request, 'project', project_ids, admin, tenant_get,
+                     lambda: tenant_list(request)[0])
+
+
+def user_get_many(request, user_ids, admin=True):
+    """Resolves a number of user IDs to users in bulk.
+
+    Works like :func:`tenant_get_many`.
+    """
+    return _get_many(request, 'user', user_ids, admin, user_get,
+                     lambda: user_list(request))
+
+
 def user_update(request, user, **data):
     manager = keystoneclient(request, admin=True).users
     error = None
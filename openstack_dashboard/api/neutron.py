@@ -21,13 +21,17 @@
 
 from __future__ import absolute_import
 
+import functools
 import logging
+import threading
 
 from django.conf import settings  # noqa
-from django.utils.datastructures import SortedDict  # noqa
 from django.utils.translation import ugettext_lazy as _  # noqa
 
+from horizon import exceptions
+from horizon.utils import concurrency
 from horizon.utils.memoized import memoized  # noqa
+from horizon.utils.memoized import memoized_shared  # noqa
 
 from openstack_dashboard.api import base
 from openstack_dashboard.api import network_base
@@ -39,6 +43,14 @@ LOG = logging.getLogger(__name__)
 
 IP_VERSION_DICT = {4: 'IPv4', 6: 'IPv6'}
 
+# The maximum number of IDs given to a single list call (e.g. subnet_list),
+# so that its URL stays reasonably short.
+ID_BATCH_SIZE = 100
+
+# Up to this number of servers are fetched one by one (at the same time)
+# to get their names, rather than listing all the servers of the tenant.
+SERVER_GET_THRESHOLD = 10
+
 
 class NeutronAPIDictWrapper(base.APIDictWrapper):
 
@@ -71,9 +83,14 @@ class Agent(NeutronAPIDictWrapper):
 
 
 class Network(NeutronAPIDictWrapper):
-    """Wrapper for neutron Networks."""
+    """Wrapper for neutron Networks.
 
-    def __init__(self, apiresource):
+    When a ``subnet_expander`` is given, the subnet IDs of the network are
+    only expanded to subnets once its ``subnets`` are accessed.
+    """
+
+    def __init__(self, apiresource, subnet_expander=None):
+        self._subnet_expander = subnet_expander
         apiresource['admin_state'] = \
             'UP' if apiresource['admin_state_up'] else 'DOWN'
         # Django cannot handle a key name with a colon, so remap another key
@@ -82,6 +99,72 @@ class Network(NeutronAPIDictWrapper):
                 apiresource['__'.join(key.split(':'))] = apiresource[key]
         super(Network, self).__init__(apiresource)
 
+    def __getattr__(self, attr):
+        subnet_expander = self.__dict__.get('_subnet_expander')
+        if attr == 'subnets' and subnet_expander:
+            subnet_expander.expand()
+        return super(Network, self).__getattr__(attr)
+
+    def items(self):
+        if self._subnet_expander:
+            self._subnet_expander.expand()
+        return super(Network, self).items()
+
+    def set_subnet_expander(self, subnet_expander):
+        """Hands the expansion of the subnets over to ``subnet_expander``,
+        unless they have been expanded already.
+        """
+        if self._subnet_expander and not self._subnet_expander.expanded:
+            subnet_expander.add(self._apidict)
+            self._subnet_expander = subnet_expander
+
+
+class SubnetExpander(object):
+    """Expands the subnet IDs of a number of networks to subnets.
+
+    The subnets of all the networks added to the expander are fetched
+    together, by their IDs, the first time the subnets of any of them are
+    needed. Subnets which can't be retrieved are left out, and the error
+    is reported with :func:`horizon.exceptions.handle`.
+    """
+
+    def __init__(self, request):
+        self._request = request
+        self._networks = []
+        self.expanded = False
+        self._lock = threading.Lock()
+
+    def add(self, network):
+        """Adds a network (a dictionary returned by the Neutron API)."""
+        self._networks.append(network)
+
+    def expand(self):
+        with self._lock:
+            if self.expanded:
+                return
+            self.expanded = True
+            subnet_ids = []
+            seen = set()
+            for network in self._networks:
+                for subnet_id in network.get('subnets', []):
+                    if subnet_id not in seen:
+                        seen.add(subnet_id)
+                        subnet_ids.append(subnet_id)
+
+            subnet_dict = {}
+            try:
+                for subnet in _list_by_ids(subnet_list, self._request,
+                                           subnet_ids):
+                    subnet_dict[subnet['id']] = subnet
+            except Exception:
+                exceptions.handle(self._request,
+                                  _('Unable to retrieve subnets.'))
+
+            for network in self._networks:
+                network['subnets'] = [subnet_dict[s]
+                                      for s in network.get('subnets', [])
+                                      if s in subnet_dict]
+
 
 class Subnet(NeutronAPIDictWrapper):
     """Wrapper for neutron subnets."""
@@ -311,6 +394,54 @@ class FloatingIpTarget(base.APIDictWrapper):
     pass
 
 
+def _list_by_ids(list_func, request, ids, **params):
+    """Calls ``list_func`` to list the objects with the given ``ids``, in
+    batches of at most ``ID_BATCH_SIZE`` of them.
+    """
+    ids = list(ids)
+    objects = []
+    for i in range(0, len(ids), ID_BATCH_SIZE):
+        objects += list_func(request, id=ids[i:i + ID_BATCH_SIZE], **params)
+    return objects
+
+
+@memoized
+def _port_device_ids(request, port_ids):
+    """Returns a dictionary mapping the ports with the given IDs (a tuple)
+    to their device IDs.
+    """
+    ports = _list_by_ids(port_list, request, port_ids)
+    return dict((p['id'], p['device_id']) for p in ports)
+
+
+@memoized
+def _tenant_ports(request, tenant_id):
+    return port_list(request, tenant_id=tenant_id)
+
+
+@memoized
+def _server_names(request, server_ids):
+    """Returns a dictionary mapping the servers with the given IDs (a tuple)
+    to their names.
+    """
+    if len(server_ids) > SERVER_GET_THRESHOLD:
+        servers, has_more = nova.server_list(request)
+        return dict((s.id, s.name) for s in servers if s.id in server_ids)
+    max_workers = getattr(settings, 'API_CONCURRENCY',
+                          concurrency.DEFAULT_MAX_WORKERS)
+    results = concurrency.run_concurrently(
+        [functools.partial(nova.server_get, request, server_id)
+         for server_id in server_ids],
+        max_workers=max_workers)
+    names = {}
+    for server_id, result in zip(server_ids, results):
+        try:
+            names[server_id] = result.get().name
+        except Exception:
+            LOG.debug("Unable to retrieve server %s.", server_id)
+    return names
+
+
 class FloatingIpManager(network_base.FloatingIpManager):
     def __init__(self, request):
         self.request = request
@@ -328,13 +459,17 @@ class FloatingIpManager(network_base.FloatingIpManager):
         # with tenant_id.
         fips = self.client.list_floatingips(tenant_id=tenant_id)
         fips = fips.get('floatingips')
-        # Get port list to add instance_id to floating IP list
+        # Get the associated ports to add instance_id to floating IP list
         # instance_id is stored in device_id attribute
-        ports = port_list(self.request, tenant_id=tenant_id)
-        device_id_dict = SortedDict([(p['id'], p['device_id']) for p in ports])
+        port_ids = tuple(sorted(set(fip['port_id'] for fip in fips
+                                    if fip['port_id'])))
+        if port_ids:
+            device_id_dict = _port_device_ids(self.request, port_ids)
+        else:
+            device_id_dict = {}
         for fip in fips:
             if fip['port_id']:
-                fip['instance_id'] = device_id_dict[fip['port_id']]
+                fip['instance_id'] = device_id_dict.get(fip['port_id'])
             else:
                 fip['instance_id'] = None
         return [FloatingIp(fip) for fip in fips]
@@ -373,14 +508,17 @@ class FloatingIpManager(network_base.FloatingIpManager):
 
     def list_targets(self):
         tenant_id = self.request.user.tenant_id
-        ports = port_list(self.request, tenant_id=tenant_id)
-        servers, has_more = nova.server_list(self.request)
-        server_dict = SortedDict([(s.id, s.name) for s in servers])
+        # Remove network ports from Floating IP targets
+        ports = [p for p in _tenant_ports(self.request, tenant_id)
+                 if not p.device_owner.startswith('network:')]
+        server_ids = tuple(sorted(set(p.device_id for p in ports
+                                      if p.device_id)))
+        if server_ids:
+            server_dict = _server_names(self.request, server_ids)
+        else:
+            server_dict = {}
         targets = []
         for p in ports:
-            # Remove network ports from Floating IP targets
-            if p.device_owner.startswith('network:'):
-                continue
             port_id = p.id
             server_name = server_dict.get(p.device_id)
             for ip in p.fixed_ips:
@@ -419,26 +557,33 @@ def get_ipver_str(ip_version):
 def neutronclient(request):
     insecure = getattr(settings, 'OPENSTACK_SSL_NO_VERIFY', False)
     cacert = getattr(settings, 'OPENSTACK_SSL_CACERT', None)
-    LOG.debug('neutronclient connection created using token "%s" and url "%s"'
-              % (request.user.token.id, base.url_for(request, 'network')))
-    LOG.debug('user_id=%(user)s, tenant_id=%(tenant)s' %
-              {'user': request.user.id, 'tenant': request.user.tenant_id})
-    c = neutron_client.Client(token=request.user.token.id,
-                              endpoint_url=base.url_for(request, 'network'),
-                              insecure=insecure, ca_cert=cacert)
-    return c
+    neutron_url = base.url_for(request, 'network')
+
+    def create():
+        LOG.debug('neutronclient connection created using token "%s" and url '
+                  '"%s"', request.user.token.id, neutron_url)
+        LOG.debug('user_id=%(user)s, tenant_id=%(tenant)s',
+                  {'user': request.user.id, 'tenant': request.user.tenant_id})
+        c = neutron_client.Client(token=request.user.token.id,
+                                  endpoint_url=neutron_url,
+                                  insecure=insecure, ca_cert=cacert)
+        return c
+    return base.pooled_client(request, 'network',
+                              (neutron_url, insecure, cacert), create)
 
 
 def network_list(request, **params):
-    LOG.debug("network_list(): params=%s" % (params))
+    """Returns the networks matching ``params``.
+
+    The subnet IDs of the networks are expanded to subnets lazily, see
+    :class:`SubnetExpander`.
+    """
+    LOG.debug("network_list(): params=%s", params)
     networks = neutronclient(request).list_networks(**params).get('networks')
-    # Get subnet list to expand subnet info in network list.
-    subnets = subnet_list(request)
-    subnet_dict = SortedDict([(s['id'], s) for s in subnets])
-    # Expand subnet list from subnet_id to values.
+    subnet_expander = SubnetExpander(request)
     for n in networks:
-        n['subnets'] = [subnet_dict.get(s) for s in n.get('subnets', [])]
-    return [Network(n) for n in networks]
+        subnet_expander.add(n)
+    return [Network(n, subnet_expander) for n in networks]
 
 
 def network_list_for_tenant(request, tenant_id, **params):
@@ -446,8 +591,8 @@ def network_list_for_tenant(request, tenant_id, **params):
     The list contains networks owned by the tenant and public networks.
     If requested_networks specified, it searches requested_networks only.
     """
-    LOG.debug("network_list_for_tenant(): tenant_id=%s, params=%s"
-              % (tenant_id, params))
+    LOG.debug("network_list_for_tenant(): tenant_id=%s, params=%s",
+              tenant_id, params)
 
     # If a user has admin role, network list returned by Neutron API
     # contains networks that do not belong to that tenant.
@@ -459,11 +604,16 @@ def network_list_for_tenant(request, tenant_id, **params):
     # both owner networks and public networks in a single API call.
     networks += network_list(request, shared=True, **params)
 
+    # Expand the subnets of both lists together.
+    subnet_expander = SubnetExpander(request)
+    for network in networks:
+        network.set_subnet_expander(subnet_expander)
+
     return networks
 
 
 def network_get(request, network_id, expand_subnet=True, **params):
-    LOG.debug("network_get(): netid=%s, params=%s" % (network_id, params))
+    LOG.debug("network_get(): netid=%s, params=%s", network_id, params)
     network = neutronclient(request).show_network(network_id,
                                                   **params).get('network')
     # Since the number of subnets per network must be small,
@@ -482,7 +632,7 @@ def network_create(request, **kwargs):
     :param name: (optional) name of the network created
     :returns: Subnet object
     """
-    LOG.debug("network_create(): kwargs = %s" % kwargs)
+    LOG.debug("network_create(): kwargs = %s", kwargs)
     # In the case network profiles are being used, profile id is needed.
     if 'net_profile_id' in kwargs:
         kwargs['n1kv:profile_id'] = kwargs.pop('net_profile_id')
@@ -492,7 +642,7 @@ def network_create(request, **kwargs):
 
 
 def network_update(request, network_id, **kwargs):
-    LOG.debug("network_update(): netid=%s, params=%s" % (network_id, kwargs))
+    LOG.debug("network_update(): netid=%s, params=%s", network_id, kwargs)
     body = {'network': kwargs}
     network = neutronclient(request).update_network(network_id,
                                                     body=body).get('network')
@@ -500,18 +650,18 @@ def network_update(request, network_id, **kwargs):
 
 
 def network_delete(request, network_id):
-    LOG.debug("network_delete(): netid=%s" % network_id)
+    LOG.debug("network_delete(): netid=%s", network_id)
     neutronclient(request).delete_network(network_id)
 
 
 def subnet_list(request, **params):
-    LOG.debug("subnet_list(): params=%s" % (params))
+    LOG.debug("subnet_list(): params=%s", params)
     subnets = neutronclient(request).list_subnets(**params).get('subnets')
     return [Subnet(s) for s in subnets]
 
 
 def subnet_get(request, subnet_id, **params):
-    LOG.debug("subnet_get(): subnetid=%s, params=%s" % (subnet_id, params))
+    LOG.debug("subnet_get(): subnetid=%s, params=%s", subnet_id, params)
     subnet = neutronclient(request).show_subnet(subnet_id,
                                                 **params).get('subnet')
     return Subnet(subnet)
@@ -528,8 +678,8 @@ def subnet_create(request, network_id, cidr, ip_version, **kwargs):
     :param name: (optional) name of the subnet created
     :returns: Subnet object
     """
-    LOG.debug("subnet_create(): netid=%s, cidr=%s, ipver=%d, kwargs=%s"
-              % (network_id, cidr, ip_version, kwargs))
+    LOG.debug("subnet_create(): netid=%s, cidr=%s, ipver=%d, kwargs=%s",
+              network_id, cidr, ip_version, kwargs)
     body = {'subnet':
                 {'network_id': network_id,
                  'ip_version': ip_version,
@@ -540,7 +690,7 @@ def subnet_create(request, network_id, cidr, ip_version, **kwargs):
 
 
 def subnet_update(request, subnet_id, **kwargs):
-    LOG.debug("subnet_update(): subnetid=%s, kwargs=%s" % (subnet_id, kwargs))
+    LOG.debug("subnet_update(): subnetid=%s, kwargs=%s", subnet_id, kwargs)
     body = {'subnet': kwargs}
     subnet = neutronclient(request).update_subnet(subnet_id,
                                                   body=body).get('subnet')
@@ -548,18 +698,18 @@ def subnet_update(request, subnet_id, **kwargs):
 
 
 def subnet_delete(request, subnet_id):
-    LOG.debug("subnet_delete(): subnetid=%s" % subnet_id)
+    LOG.debug("subnet_delete(): subnetid=%s", subnet_id)
     neutronclient(request).delete_subnet(subnet_id)
 
 
 def port_list(request, **params):
-    LOG.debug("port_list(): params=%s" % (params))
+    LOG.debug("port_list(): params=%s", params)
     ports = neutronclient(request).list_ports(**params).get('ports')
     return [Port(p) for p in ports]
 
 
 def port_get(request, port_id, **params):
-    LOG.debug("port_get(): portid=%s, params=%s" % (port_id, params))
+    LOG.debug("port_get(): portid=%s, params=%s", port_id, params)
     port = neutronclient(request).show_port(port_id, **params).get('port')
     return Port(port)
 
@@ -573,7 +723,7 @@ def port_create(request, network_id, **kwargs):
     :param name: (optional) name of the port created
     :returns: Port object
     """
-    LOG.debug("port_create(): netid=%s, kwargs=%s" % (network_id, kwargs))
+    LOG.debug("port_create(): netid=%s, kwargs=%s", network_id, kwargs)
     # In the case policy profiles are being used, profile id is needed.
     if 'policy_profile_id' in kwargs:
         kwargs['n1kv:profile_id'] = kwargs.pop('policy_profile_id')
@@ -584,12 +734,12 @@ def port_create(request, network_id, **kwargs):
 
 
 def port_delete(request, port_id):
-    LOG.debug("port_delete(): portid=%s" % port_id)
+    LOG.debug("port_delete(): portid=%s", port_id)
     neutronclient(request).delete_port(port_id)
 
 
 def port_update(request, port_id, **kwargs):
-    LOG.debug("port_update(): portid=%s, kwargs=%s" % (port_id, kwargs))
+    LOG.debug("port_update(): portid=%s, kwargs=%s", port_id, kwargs)
     body = {'port': kwargs}
     port = neutronclient(request).update_port(port_id, body=body).get('port')
     return Port(port)
@@ -655,7 +805,7 @@ def profile_bindings_list(request, type_p, **params):
 
 
 def router_create(request, **kwargs):
-    LOG.debug("router_create():, kwargs=%s" % kwargs)
+    LOG.debug("router_create():, kwargs=%s", kwargs)
     body = {'router': {}}
     body['router'].update(kwargs)
     router = neutronclient(request).create_router(body=body).get('router')
@@ -663,7 +813,7 @@ def router_create(request, **kwargs):
 
 
 def router_update(request, r_id, **kwargs):
-    LOG.debug("router_update(): router_id=%s, kwargs=%s" % (r_id, kwargs))
+    LOG.debug("router_update(): router_id=%s, kwargs=%s", r_id, kwargs)
     body = {'router': {}}
     body['router'].update(kwargs)
     router = neutronclient(request).update_router(r_id, body=body)
@@ -732,7 +882,7 @@ def provider_list(request):
     return providers['service_providers']
 
 
-@memoized
+@memoized_shared(ttl=3600, scope='global')
 def list_extensions(request):
     extensions_list = neutronclient(request).list_extensions()
     if 'extensions' in extensions_list:
@@ -741,7 +891,7 @@ def list_extensions(request):
         return {}
 
 
-@memoized
+@memoized_shared(ttl=3600, scope='global')
 def is_extension_supported(request, extension_alias):
     extensions = list_extensions(request)
 
@@ -22,6 +22,7 @@
 
 from __future__ import absolute_import
 
+import functools
 import logging
 
 from django.conf import settings  # noqa
@@ -35,8 +36,10 @@ from novaclient.v1_1 import security_groups as nova_security_groups
 from novaclient.v1_1 import servers as nova_servers
 
 from horizon import conf
+from horizon.utils import concurrency
 from horizon.utils import functions as utils
 from horizon.utils.memoized import memoized  # noqa
+from horizon.utils.memoized import memoized_shared  # noqa
 
 from openstack_dashboard.api import base
 from openstack_dashboard.api import network_base
@@ -361,18 +364,23 @@ class FloatingIpManager(network_base.FloatingIpManager):
 def novaclient(request):
     insecure = getattr(settings, 'OPENSTACK_SSL_NO_VERIFY', False)
     cacert = getattr(settings, 'OPENSTACK_SSL_CACERT', None)
-    LOG.debug('novaclient connection created using token "%s" and url "%s"' %
-              (request.user.token.id, base.url_for(request, 'compute')))
-    c = nova_client.Client(request.user.username,
-                           request.user.token.id,
-                           project_id=request.user.tenant_id,
-                           auth_url=base.url_for(request, 'compute'),
-                           insecure=insecure,
-                           cacert=cacert,
-                           http_log_debug=settings.DEBUG)
-    c.client.auth_token = request.user.token.id
-    c.client.management_url = base.url_for(request, 'compute')
-    return c
+    nova_url = base.url_for(request, 'compute')
+
+    def create():
+        LOG.debug('novaclient connection created using token "%s" and url '
+                  '"%s"', request.user.token.id, nova_url)
+        c = nova_client.Client(request.user.username,
+                               request.user.token.id,
+                               project_id=request.user.tenant_id,
+                               auth_url=nova_url,
+                               insecure=insecure,
+                               cacert=cacert,
+                               http_log_debug=settings.DEBUG)
+        c.client.auth_token = request.user.token.id
+        c.client.management_url = nova_url
+        return c
+    return base.pooled_client(request, 'compute',
+                              (nova_url, insecure, cacert), create)
 
 
 def server_vnc_console(request, instance_id, console_type='novnc'):
@@ -391,6 +399,7 @@ def flavor_create(request, name, memory, vcpu, disk, flavorid='auto',
                                                 flavorid=flavorid,
                                                 ephemeral=ephemeral,
                                                 swap=swap, is_public=is_public)
+    _flavor_list_shared.clear_cache()
     if (metadata):
         flavor_extra_set(request, flavor.id, metadata)
     return flavor
@@ -398,6 +407,7 @@ def flavor_create(request, name, memory, vcpu, disk, flavorid='auto',
 
 def flavor_delete(request, flavor_id):
     novaclient(request).flavors.delete(flavor_id)
+    _flavor_list_shared.clear_cache()
 
 
 def flavor_get(request, flavor_id):
@@ -405,8 +415,64 @@ def flavor_get(request, flavor_id):
 
 
 @memoized
-def flavor_list(request, is_public=True):
-    """Get the list of available instance sizes (flavors)."""
+def _flavor_get_memoized(request, flavor_id):
+    return flavor_get(request, flavor_id)
+
+
+# Flavors can't be modified in Nova, only deleted and recreated with a new
+# ID, so it is safe to keep them around for a long time.
+@memoized_shared(ttl=3600, scope='project')
+def _flavor_get_shared(request, flavor_id):
+    return base.detach_resource(flavor_get(request, flavor_id))
+
+
+def flavor_get_many(request, flavor_ids, flavors=None, shared=True):
+    """Resolves a number of flavor IDs to flavors in bulk.
+
+    ``flavors`` may hold already known flavors (typically the result of
+    :func:`flavor_list`); only the remaining IDs are fetched, each unique ID
+    once and at the same time. Fetched flavors are cached for the request
+    and, unless ``shared`` is ``False``, across requests.
+
+    Returns a dictionary mapping each flavor ID to a
+    :class:`horizon.utils.concurrency.Result`; call its ``get()`` method to
+    retrieve the flavor or re-raise the error that prevented it.
+    """
+    results = dict((flavor.id, concurrency.Result(flavor))
+                   for flavor in flavors or [])
+    missing = []
+    for flavor_id in flavor_ids:
+        if flavor_id not in results and flavor_id not in missing:
+            missing.append(flavor_id)
+    getter = _flavor_get_shared if shared else _flavor_get_memoized
+    max_workers = getattr(settings, 'API_CONCURRENCY',
+                          concurrency.DEFAULT_MAX_WORKERS)
+    fetched = concurrency.run_concurrently(
+        [functools.partial(getter, request, flavor_id)
+         for flavor_id in missing],
+        max_workers=max_workers)
+    results.update(zip(missing, fetched))
+    return results
+
+
+# Creating or deleting flavors only clears the cache of the current process,
+# other ones keep the list for up to a minute.
+@memoized_shared(ttl=60, scope='project')
+def _flavor_list_shared(request, is_public):
+    return [base.detach_resource(flavor)
+            for flavor in novaclient(request).flavors.list(
+                is_public=is_public)]
+
+
+def flavor_list(request, is_public=True, shared=True):
+    """Get the list of available instance sizes (flavors).
+
+    Unless ``shared`` is ``False``, the list is shared across requests for a
+    minute, so views managing flavors should pass ``shared=False`` to see
+    the changes made by other processes straight away.
+    """
+    if shared:
+        return _flavor_list_shared(request, is_public)
     return novaclient(request).flavors.list(is_public=is_public)
 
 
@@ -418,14 +484,18 @@ def flavor_access_list(request, flavor=None):
 
 def add_tenant_to_flavor(request, flavor, tenant):
     """Add a tenant to the given flavor access list."""
-    return novaclient(request).flavor_access.add_tenant_access(
+    result = novaclient(request).flavor_access.add_tenant_access(
         flavor=flavor, tenant=tenant)
+    _flavor_list_shared.clear_cache()
+    return result
 
 
 def remove_tenant_from_flavor(request, flavor, tenant):
     """Remove a tenant from the given flavor access list."""
-    return novaclient(request).flavor_access.remove_tenant_access(
+    result = novaclient(request).flavor_access.remove_tenant_access(
         flavor=flavor, tenant=tenant)
+    _flavor_list_shared.clear_cache()
+    return result
 
 
 def flavor_get_extras(request, flavor_id, raw=False):
@@ -690,12 +760,14 @@ def aggregate_list(request):
     return result
 
 
-@memoized
+@memoized_shared(ttl=3600, scope='global')
 def list_extensions(request):
-    return nova_list_extensions.ListExtManager(novaclient(request)).show_all()
+    extensions = nova_list_extensions.ListExtManager(novaclient(request))\
+        .show_all()
+    return [base.detach_resource(extension) for extension in extensions]
 
 
-@memoized
+@memoized_shared(ttl=3600, scope='global')
 def extension_supported(extension_name, request):
     """this method will determine if nova supports a given extension name.
     example values for the extension_name include AdminActions, ConsoleOutput,
@@ -18,7 +18,10 @@
 #    License for the specific language governing permissions and limitations
 #    under the License.
 
+import functools
 import logging
+import re
+import time
 import urllib
 
 import swiftclient
@@ -27,6 +30,7 @@ from django.conf import settings  # noqa
 from django.utils.translation import ugettext_lazy as _  # noqa
 
 from horizon import exceptions
+from horizon.utils import concurrency
 
 from openstack_dashboard.api import base
 from openstack_dashboard.openstack.common import timeutils
@@ -34,6 +38,9 @@ from openstack_dashboard.openstack.common import timeutils
 
 LOG = logging.getLogger(__name__)
 FOLDER_DELIMITER = "/"
+CHUNK_SIZE = getattr(settings, 'SWIFT_FILE_TRANSFER_CHUNK_SIZE', 512 * 1024)
+# Objects bigger than this are uploaded in segments of this size.
+SEGMENT_SIZE = getattr(settings, 'SWIFT_SEGMENT_SIZE', 1024 ** 3)
 # Swift ACL
 GLOBAL_READ_ACL = ".r:*"
 LIST_CONTENTS_ACL = ".rlistings"
@@ -106,18 +113,28 @@ def _metadata_to_header(metadata):
     return headers
 
 
-def swift_api(request):
+def swift_api(request, pooled=True):
+    """Returns a Swift connection for the user of ``request``, taken from
+    the per-thread client pool unless ``pooled`` is ``False``.
+    """
     endpoint = base.url_for(request, 'object-store')
     cacert = getattr(settings, 'OPENSTACK_SSL_CACERT', None)
-    LOG.debug('Swift connection created using token "%s" and url "%s"'
-              % (request.user.token.id, endpoint))
-    return swiftclient.client.Connection(None,
-                                         request.user.username,
-                                         None,
-                                         preauthtoken=request.user.token.id,
-                                         preauthurl=endpoint,
-                                         cacert=cacert,
-                                         auth_version="2.0")
+
+    def create():
+        LOG.debug('Swift connection created using token "%s" and url "%s"',
+                  request.user.token.id, endpoint)
+        return swiftclient.client.Connection(
+            None,
+            request.user.username,
+            None,
+            preauthtoken=request.user.token.id,
+            preauthurl=endpoint,
+            cacert=cacert,
+            auth_version="2.0")
+    if not pooled:
+        return create()
+    return base.pooled_client(request, 'object-store', (endpoint, cacert),
+                              create)
 
 
 def swift_container_exists(request, container_name):
@@ -226,39 +243,73 @@ def swift_get_objects(request, container_name, prefix=None, marker=None,
         return (object_objs, False)
 
 
-def swift_filter_objects(request, filter_string, container_name, prefix=None,
-                         marker=None):
-    # FIXME(kewu): Swift currently has no real filtering API, thus the marker
-    # parameter here won't actually help the pagination. For now I am just
-    # getting the largest number of objects from a container and filtering
-    # based on those objects.
-    limit = 9999
-    objects = swift_get_objects(request,
-                                container_name,
-                                prefix=prefix,
-                                marker=marker,
-                                limit=limit)
-    filter_string_list = filter_string.lower().strip().split(' ')
+def _iter_container(request, container_name, prefix=None, marker=None,
+                    page_size=None):
+    """Lazily yields the listing of a container one page at a time."""
+    page_size = page_size or getattr(settings, 'API_RESULT_LIMIT', 1000)
+    connection = swift_api(request)
+    while True:
+        headers, items = connection.get_container(container_name,
+                                                  prefix=prefix,
+                                                  marker=marker,
+                                                  limit=page_size,
+                                                  delimiter=FOLDER_DELIMITER)
+        for item in items:
+            yield item
+        if len(items) < page_size:
+            return
+        marker = items[-1].get('name') or items[-1].get('subdir')
+
+
+def _compile_wildcard(pattern):
+    """Compiles a pattern where ``*`` stands for any string into a regular
+    expression matching names which start with the pattern.
+    """
+    return re.compile('.*'.join(re.escape(part)
+                                for part in pattern.split('*')),
+                      re.DOTALL)
 
-    def matches_filter(obj):
-        for q in filter_string_list:
-            return wildcard_search(obj.name.lower(), q)
 
-    return filter(matches_filter, objects[0])
+def swift_filter_objects(request, filter_string, container_name, prefix=None,
+                         marker=None):
+    """Returns the objects and pseudo-folders directly under ``prefix``
+    whose name (relative to ``prefix``) starts with any of the
+    space-separated terms in ``filter_string``.
+
+    A ``*`` in a term matches any string, so ``*.txt`` finds names
+    containing ``.txt`` anywhere. The literal part of each term before the
+    first ``*`` is passed to Swift as a prefix, so only matching parts of the
+    container are listed. Listing stops once ``API_RESULT_LIMIT`` matches
+    are found or ``SWIFT_FILTER_SCAN_LIMIT`` names have been examined for a
+    term.
+    """
+    prefix = prefix or ''
+    limit = getattr(settings, 'API_RESULT_LIMIT', 1000)
+    scan_limit = getattr(settings, 'SWIFT_FILTER_SCAN_LIMIT', 10000)
+    terms = filter_string.strip().split() or ['']
+    matches = {}
+    for term in terms:
+        literal = term.split('*', 1)[0]
+        pattern = _compile_wildcard(term)
+        listing = _iter_container(request, container_name,
+                                  prefix=prefix + literal, marker=marker)
+        for scanned, item in enumerate(listing, 1):
+            name = item.get('name') or item.get('subdir')
+            if pattern.match(name[len(prefix):]):
+                matches[name] = item
+            if len(matches) >= limit or scanned >= scan_limit:
+                break
+        if len(matches) >= limit:
+            break
+    items = [matches[name] for name in sorted(matches)]
+    return _objectify(items, container_name)
 
 
 def wildcard_search(string, q):
-    q_list = q.split('*')
-    if all(map(lambda x: x == '', q_list)):
-        return True
-    elif q_list[0] not in string:
-        return False
-    else:
-        if q_list[0] == '':
-            tail = string
-        else:
-            head, delimiter, tail = string.partition(q_list[0])
-        return wildcard_search(tail, '*'.join(q_list[1:]))
+    """Checks whether ``string`` contains ``q``, where a ``*`` in ``q``
+    matches any string.
+    """
+    return _compile_wildcard(q).search(string) is not None
 
 
 def swift_copy_object(request, orig_container_name, orig_object_name,
@@ -274,13 +325,120 @@ def swift_copy_object(request, orig_container_name, orig_object_name,
                                          headers=headers)
 
 
+class _FileSegment(object):
+    """A read-only, file-like view of ``length`` bytes of a file, starting
+    at ``offset``.
+    """
+    def __init__(self, path, offset, length):
+        self.path = path
+        self.offset = offset
+        self.length = length
+        self._file = None
+        self._remaining = length
+
+    def read(self, size=-1):
+        if self._file is None:
+            self._file = open(self.path, 'rb')
+            self._file.seek(self.offset)
+        if size < 0 or size > self._remaining:
+            size = self._remaining
+        data = self._file.read(size)
+        self._remaining -= len(data)
+        if not self._remaining:
+            self.close()
+        return data
+
+    def close(self):
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+
+
+def _upload_segment(request, container_name, segment_name, segment):
+    try:
+        return swift_api(request).put_object(container_name,
+                                             segment_name,
+                                             segment,
+                                             content_length=segment.length,
+                                             chunk_size=CHUNK_SIZE)
+    finally:
+        segment.close()
+
+
+def _upload_segmented_object(request, container_name, object_name,
+                             object_file, headers):
+    """Uploads ``object_file`` as a Dynamic Large Object.
+
+    The file is split into ``SEGMENT_SIZE`` segments stored in the
+    ``<container>_segments`` container, which are uploaded in parallel, and
+    a manifest object pointing at them is then created under
+    ``object_name``.
+    """
+    segment_container = '%s_segments' % container_name
+    segment_prefix = '%s/%s/%s/%s/' % (object_name, time.time(),
+                                       object_file.size, SEGMENT_SIZE)
+    swift_api(request).put_container(segment_container)
+
+    # Django keeps large uploads in a temporary file; each segment reads its
+    # own part of it, so segments can be sent at the same time without
+    # holding them in memory.
+    path = object_file.temporary_file_path()
+    calls = []
+    segment_names = []
+    for index, offset in enumerate(range(0, object_file.size,
+                                         SEGMENT_SIZE)):
+        segment = _FileSegment(path, offset,
+                               min(SEGMENT_SIZE, object_file.size - offset))
+        segment_names.append('%s%08d' % (segment_prefix, index))
+        calls.append(functools.partial(_upload_segment, request,
+                                       segment_container,
+                                       segment_names[-1],
+                                       segment))
+    max_workers = getattr(settings, 'SWIFT_SEGMENT_UPLOAD_CONCURRENCY', 4)
+    results = concurrency.run_concurrently(calls, max_workers=max_workers)
+    failed = [result for result in results if result.failed]
+    if failed:
+        # Without a manifest, the segments already uploaded would be left
+        # in the segments container for good.
+        for name, result in zip(segment_names, results):
+            if not result.failed:
+                try:
+                    swift_api(request).delete_object(segment_container, name)
+                except Exception:
+                    LOG.exception("Unable to delete segment %s of %s.",
+                                  name, object_name)
+        failed[0].get()
+
+    manifest = '%s/%s' % (segment_container, segment_prefix)
+    headers['X-Object-Manifest'] = urllib.quote(manifest.encode('utf-8'))
+    return swift_api(request).put_object(container_name,
+                                         object_name,
+                                         '',
+                                         content_length=0,
+                                         headers=headers)
+
+
 def swift_upload_object(request, container_name, object_name, object_file):
+    """Uploads ``object_file`` (a Django ``UploadedFile``) to Swift.
+
+    The file is sent in ``CHUNK_SIZE`` chunks. Files bigger than
+    ``SEGMENT_SIZE`` which Django has stored on disk are uploaded as
+    segmented Dynamic Large Objects, which lets them exceed the maximum
+    size of a single Swift object.
+    """
     headers = {}
     headers['X-Object-Meta-Orig-Filename'] = object_file.name
-    etag = swift_api(request).put_object(container_name,
-                                         object_name,
-                                         object_file,
-                                         headers=headers)
+    if (object_file.size > SEGMENT_SIZE and
+            hasattr(object_file, 'temporary_file_path')):
+        etag = _upload_segmented_object(request, container_name, object_name,
+                                        object_file, headers)
+    else:
+        etag = swift_api(request).put_object(container_name,
+                                             object_name,
+                                             object_file,
+                                             content_length=object_file.size,
+                                             chunk_size=CHUNK_SIZE,
+                                             headers=headers)
     obj_info = {'name': object_name, 'bytes': object_file.size, 'etag': etag}
     return StorageObject(obj_info, container_name)
 
@@ -304,10 +462,27 @@ def swift_delete_object(request, container_name, object_name):
     return True
 
 
-def swift_get_object(request, container_name, object_name, with_data=True):
+def swift_get_object(request, container_name, object_name, with_data=True,
+                     resp_chunk_size=None, byte_range=None):
+    """Returns a :class:`StorageObject` for the given object.
+
+    If ``resp_chunk_size`` is given, the object's ``data`` is an iterator
+    yielding the content in chunks of that size rather than a string, so that
+    large objects never have to be held in memory. ``byte_range`` may be the
+    value of an HTTP ``Range`` header to fetch only part of the object.
+    """
     if with_data:
-        headers, data = swift_api(request).get_object(container_name,
-                                                      object_name)
+        kwargs = {}
+        if resp_chunk_size:
+            kwargs['resp_chunk_size'] = resp_chunk_size
+        if byte_range:
+            kwargs['headers'] = {'Range': byte_range}
+        # A body read in chunks may be left unread if the client goes away
+        # mid-download, which would break the next call made with the same
+        # connection: streamed reads get a connection of their own.
+        connection = swift_api(request, pooled=not resp_chunk_size)
+        headers, data = connection.get_object(container_name, object_name,
+                                              **kwargs)
     else:
         data = None
         headers = swift_api(request).head_object(container_name,
@@ -325,6 +500,7 @@ def swift_get_object(request, container_name, object_name, with_data=True):
         'content_type': headers.get('content-type'),
         'etag': headers.get('etag'),
         'timestamp': timestamp,
+        'content_range': headers.get('content-range'),
     }
     return StorageObject(obj_info,
                          container_name,
@@ -0,0 +1,108 @@
+# vim: tabstop=4 shiftwidth=4 softtabstop=4
+
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+"""
+Tracing of the calls made to the API wrappers while serving a request.
+
+The public functions of the API modules are wrapped when
+``openstack_dashboard.api`` is imported. The calls made with a request on
+which tracing was started (see
+:class:`openstack_dashboard.middleware.APITracingMiddleware`) are recorded on
+it as :class:`APICall` tuples; for other calls, the cost of the wrapper is an
+attribute lookup.
+"""
+
+from __future__ import absolute_import
+
+import collections
+import functools
+import threading
+import time
+import types
+
+
+APICall = collections.namedtuple('APICall', ['service', 'function',
+                                             'duration', 'status', 'size'])
+
+_local = threading.local()
+
+
+def start(request):
+    """Starts recording the API calls made with ``request``."""
+    request.api_calls = []
+
+
+def get_calls(request):
+    """Returns the :class:`APICall` tuples recorded for ``request``."""
+    return getattr(request, 'api_calls', None) or []
+
+
+def _size(result):
+    # The number of items returned. Paginated lists come with a flag telling
+    # whether there are more items.
+    if (isinstance(result, tuple) and len(result) == 2 and
+            isinstance(result[1], bool)):
+        result = result[0]
+    if isinstance(result, (list, tuple, dict, set)):
+        return len(result)
+    return None
+
+
+def trace(func, service):
+    """Wraps ``func``, an API function taking the request as its first
+    argument, so that its calls are recorded on the request.
+
+    Only the outermost API calls are recorded, not the calls they make to
+    other API functions (in the same thread), so that the durations of the
+    calls recorded don't include one another.
+    """
+    @functools.wraps(func)
+    def traced(*args, **kwargs):
+        request = args[0] if args else kwargs.get('request')
+        # Looked up in the instance dictionary rather than with getattr(),
+        # for objects answering any attribute (e.g. mocks).
+        calls = getattr(request, '__dict__', {}).get('api_calls')
+        if calls is None or getattr(_local, 'tracing', False):
+            return func(*args, **kwargs)
+        _local.tracing = True
+        status = 'error'
+        size = None
+        started = time.time()
+        try:
+            result = func(*args, **kwargs)
+            status = 'ok'
+            size = _size(result)
+            return result
+        except Exception as exc:
+            status = exc.__class__.__name__
+            raise
+        finally:
+            _local.tracing = False
+            calls.append(APICall(service, func.__name__,
+                                 time.time() - started, status, size))
+    traced.traced = True
+    return traced
+
+
+def trace_module(module):
+    """Wraps the public functions defined by ``module`` with :func:`trace`,
+    the last part of the module name being used as the name of the service.
+    """
+    service = module.__name__.rsplit('.', 1)[-1]
+    for name, value in vars(module).items():
+        if (isinstance(value, types.FunctionType) and
+                not name.startswith('_') and
+                value.__module__ == module.__name__ and
+                not getattr(value, 'traced', False)):
+            setattr(module, name, trace(value, service))
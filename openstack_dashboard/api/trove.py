@@ -30,18 +30,22 @@ def troveclient(request):
     insecure = getattr(settings, 'OPENSTACK_SSL_NO_VERIFY', False)
     cacert = getattr(settings, 'OPENSTACK_SSL_CACERT', None)
     trove_url = base.url_for(request, 'database')
-    LOG.debug('troveclient connection created using token "%s" and url "%s"' %
-              (request.user.token.id, trove_url))
-    c = client.Client(request.user.username,
-                      request.user.token.id,
-                      project_id=request.user.project_id,
-                      auth_url=trove_url,
-                      insecure=insecure,
-                      cacert=cacert,
-                      http_log_debug=settings.DEBUG)
-    c.client.auth_token = request.user.token.id
-    c.client.management_url = trove_url
-    return c
+
+    def create():
+        LOG.debug('troveclient connection created using token "%s" and url '
+                  '"%s"', request.user.token.id, trove_url)
+        c = client.Client(request.user.username,
+                          request.user.token.id,
+                          project_id=request.user.project_id,
+                          auth_url=trove_url,
+                          insecure=insecure,
+                          cacert=cacert,
+                          http_log_debug=settings.DEBUG)
+        c.client.auth_token = request.user.token.id
+        c.client.management_url = trove_url
+        return c
+    return base.pooled_client(request, 'database',
+                              (trove_url, insecure, cacert), create)
 
 
 def instance_list(request, marker=None):
@@ -27,7 +27,7 @@ INDEX_URL = reverse('horizon:admin:flavors:index')
 class FlavorsViewTests(test.BaseAdminViewTests):
     @test.create_stubs({api.nova: ('flavor_list',), })
     def test_index(self):
-        api.nova.flavor_list(IsA(http.HttpRequest), None) \
+        api.nova.flavor_list(IsA(http.HttpRequest), None, shared=False) \
                 .AndReturn(self.flavors.list())
         self.mox.ReplayAll()
 
@@ -100,7 +100,7 @@ class CreateFlavorWorkflowTests(BaseFlavorWorkflowTests):
         # init
         api.keystone.tenant_list(IsA(http.HttpRequest)).AndReturn([projects,
                                                                    False])
-        api.nova.flavor_list(IsA(http.HttpRequest), None) \
+        api.nova.flavor_list(IsA(http.HttpRequest), None, shared=False) \
             .AndReturn([])
 
         # handle
@@ -129,7 +129,7 @@ class CreateFlavorWorkflowTests(BaseFlavorWorkflowTests):
         # init
         api.keystone.tenant_list(IsA(http.HttpRequest)).AndReturn([projects,
                                                                    False])
-        api.nova.flavor_list(IsA(http.HttpRequest), None) \
+        api.nova.flavor_list(IsA(http.HttpRequest), None, shared=False) \
             .AndReturn([])
 
         # handle
@@ -161,7 +161,7 @@ class CreateFlavorWorkflowTests(BaseFlavorWorkflowTests):
                                                                    False])
 
         # handle
-        api.nova.flavor_list(IsA(http.HttpRequest), None) \
+        api.nova.flavor_list(IsA(http.HttpRequest), None, shared=False) \
             .AndReturn(self.flavors.list())
         self.mox.ReplayAll()
 
@@ -183,7 +183,7 @@ class CreateFlavorWorkflowTests(BaseFlavorWorkflowTests):
                                                                    False])
 
         # handle
-        api.nova.flavor_list(IsA(http.HttpRequest), None) \
+        api.nova.flavor_list(IsA(http.HttpRequest), None, shared=False) \
             .AndReturn(self.flavors.list())
         self.mox.ReplayAll()
 
@@ -209,7 +209,7 @@ class CreateFlavorWorkflowTests(BaseFlavorWorkflowTests):
         # init
         api.keystone.tenant_list(IsA(http.HttpRequest)).AndReturn([projects,
                                                                    False])
-        api.nova.flavor_list(IsA(http.HttpRequest), None) \
+        api.nova.flavor_list(IsA(http.HttpRequest), None, shared=False) \
             .AndReturn([])
 
         # handle
@@ -242,7 +242,7 @@ class CreateFlavorWorkflowTests(BaseFlavorWorkflowTests):
         # init
         api.keystone.tenant_list(IsA(http.HttpRequest)).AndReturn([projects,
                                                                    False])
-        api.nova.flavor_list(IsA(http.HttpRequest), None) \
+        api.nova.flavor_list(IsA(http.HttpRequest), None, shared=False) \
             .AndReturn([])
         self.mox.ReplayAll()
 
@@ -345,7 +345,7 @@ class UpdateFlavorWorkflowTests(BaseFlavorWorkflowTests):
                 .MultipleTimes().AndReturn(flavor)
         api.keystone.tenant_list(IsA(http.HttpRequest)) \
                 .MultipleTimes().AndReturn([projects, False])
-        api.nova.flavor_list(IsA(http.HttpRequest), None) \
+        api.nova.flavor_list(IsA(http.HttpRequest), None, shared=False) \
                 .AndReturn(self.flavors.list())
 
         # POST/init
@@ -417,7 +417,7 @@ class UpdateFlavorWorkflowTests(BaseFlavorWorkflowTests):
                 .MultipleTimes().AndReturn([projects, False])
 
         # POST/init
-        api.nova.flavor_list(IsA(http.HttpRequest), None) \
+        api.nova.flavor_list(IsA(http.HttpRequest), None, shared=False) \
                 .AndReturn(self.flavors.list())
         api.nova.flavor_get_extras(IsA(http.HttpRequest),
                                    flavor.id, raw=True) \
@@ -487,7 +487,7 @@ class UpdateFlavorWorkflowTests(BaseFlavorWorkflowTests):
                 .MultipleTimes().AndReturn([projects, False])
 
         # POST
-        api.nova.flavor_list(IsA(http.HttpRequest), None) \
+        api.nova.flavor_list(IsA(http.HttpRequest), None, shared=False) \
             .AndReturn(self.flavors.list())
 
         # POST/init
@@ -564,7 +564,7 @@ class UpdateFlavorWorkflowTests(BaseFlavorWorkflowTests):
                 .MultipleTimes().AndReturn([projects, False])
 
         # POST/init
-        api.nova.flavor_list(IsA(http.HttpRequest), None) \
+        api.nova.flavor_list(IsA(http.HttpRequest), None, shared=False) \
                 .AndReturn(self.flavors.list())
         api.nova.flavor_get_extras(IsA(http.HttpRequest),
                                    flavor.id, raw=True) \
@@ -620,7 +620,7 @@ class UpdateFlavorWorkflowTests(BaseFlavorWorkflowTests):
                 .MultipleTimes().AndReturn(flavor)
         api.keystone.tenant_list(IsA(http.HttpRequest)) \
                 .MultipleTimes().AndReturn([projects, False])
-        api.nova.flavor_list(IsA(http.HttpRequest), None) \
+        api.nova.flavor_list(IsA(http.HttpRequest), None, shared=False) \
                 .AndReturn(self.flavors.list())
 
         self.mox.ReplayAll()
@@ -670,7 +670,7 @@ class UpdateFlavorWorkflowTests(BaseFlavorWorkflowTests):
                 .MultipleTimes().AndReturn([projects, False])
 
         # POST
-        api.nova.flavor_list(IsA(http.HttpRequest), None) \
+        api.nova.flavor_list(IsA(http.HttpRequest), None, shared=False) \
                 .AndReturn(self.flavors.list())
         self.mox.ReplayAll()
 
@@ -45,7 +45,7 @@ class IndexView(tables.DataTableView):
         flavors = []
         try:
             # "is_public=None" will return all flavors.
-            flavors = api.nova.flavor_list(request, None)
+            flavors = api.nova.flavor_list(request, None, shared=False)
         except Exception:
             exceptions.handle(request,
                               _('Unable to retrieve flavor list.'))
@@ -62,7 +62,7 @@ class CreateFlavorInfoAction(workflows.Action):
         flavor_id = cleaned_data.get('flavor_id')
 
         try:
-            flavors = api.nova.flavor_list(self.request, None)
+            flavors = api.nova.flavor_list(self.request, None, shared=False)
         except Exception:
             flavors = []
             msg = _('Unable to get flavor list')
@@ -227,7 +227,7 @@ class UpdateFlavorInfoAction(CreateFlavorInfoAction):
         name = self.cleaned_data.get('name')
         flavor_id = self.cleaned_data.get('flavor_id')
         try:
-            flavors = api.nova.flavor_list(self.request, None)
+            flavors = api.nova.flavor_list(self.request, None, shared=False)
         except Exception:
             flavors = []
             msg = _('Unable to get flavor list')
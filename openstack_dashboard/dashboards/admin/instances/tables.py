@@ -21,6 +21,7 @@ from django.template.defaultfilters import title  # noqa
 from django.utils.http import urlencode  # noqa
 from django.utils.translation import ugettext_lazy as _  # noqa
 
+from horizon import exceptions
 from horizon import tables
 from horizon.utils import filters
 
@@ -62,14 +63,31 @@ class LiveMigrateInstance(tables.LinkAction):
 
 
 class AdminUpdateRow(project_tables.UpdateRow):
+    all_tenants = True
+
     def get_data(self, request, instance_id):
         instance = super(AdminUpdateRow, self).get_data(request, instance_id)
-        tenant = api.keystone.tenant_get(request,
-                                         instance.tenant_id,
-                                         admin=True)
+        tenants = api.keystone.tenant_get_many(request, [instance.tenant_id])
+        tenant = tenants.get(instance.tenant_id, None)
         instance.tenant_name = getattr(tenant, "name", None)
         return instance
 
+    def get_data_many(self, request, instance_ids):
+        instances = super(AdminUpdateRow, self).get_data_many(request,
+                                                              instance_ids)
+        if instances:
+            try:
+                tenant_dict = api.keystone.tenant_get_many(
+                    request, [i.tenant_id for i in instances.values()])
+            except Exception:
+                # Let get_data resolve each instance's tenant instead.
+                exceptions.handle(request, ignore=True)
+                return {}
+            for instance in instances.values():
+                tenant = tenant_dict.get(instance.tenant_id, None)
+                instance.tenant_name = getattr(tenant, "name", None)
+        return instances
+
 
 class AdminInstanceFilterAction(tables.FilterAction):
     def filter(self, table, instances, filter_string):
@@ -141,6 +159,7 @@ class AdminInstancesTable(tables.DataTable):
         table_actions = (project_tables.TerminateInstance,
                          AdminInstanceFilterAction)
         row_class = AdminUpdateRow
+        compiled_rows = True
         row_actions = (project_tables.ConfirmResize,
                        project_tables.RevertResize,
                        AdminEditInstance,
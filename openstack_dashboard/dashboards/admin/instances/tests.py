@@ -32,15 +32,15 @@ INDEX_URL = reverse('horizon:admin:instances:index')
 class InstanceViewTest(test.BaseAdminViewTests):
     @test.create_stubs({api.nova: ('flavor_list', 'server_list',
                                    'extension_supported',),
-                        api.keystone: ('tenant_list',)})
+                        api.keystone: ('tenant_get_many',)})
     def test_index(self):
         servers = self.servers.list()
         flavors = self.flavors.list()
         tenants = self.tenants.list()
         api.nova.extension_supported('AdminActions', IsA(http.HttpRequest)) \
             .MultipleTimes().AndReturn(True)
-        api.keystone.tenant_list(IsA(http.HttpRequest)).\
-                                 AndReturn([tenants, False])
+        api.keystone.tenant_get_many(IsA(http.HttpRequest), IsA(list)) \
+            .AndReturn(dict([(t.id, t) for t in tenants]))
         search_opts = {'marker': None, 'paginate': True}
         api.nova.server_list(IsA(http.HttpRequest),
                              all_tenants=True, search_opts=search_opts) \
@@ -55,7 +55,7 @@ class InstanceViewTest(test.BaseAdminViewTests):
 
     @test.create_stubs({api.nova: ('flavor_list', 'flavor_get',
                                     'server_list', 'extension_supported',),
-                        api.keystone: ('tenant_list',)})
+                        api.keystone: ('tenant_get_many',)})
     def test_index_flavor_list_exception(self):
         servers = self.servers.list()
         tenants = self.tenants.list()
@@ -70,11 +70,12 @@ class InstanceViewTest(test.BaseAdminViewTests):
             .MultipleTimes().AndReturn(True)
         api.nova.flavor_list(IsA(http.HttpRequest)). \
                             AndRaise(self.exceptions.nova)
-        api.keystone.tenant_list(IsA(http.HttpRequest)).\
-                                 AndReturn([tenants, False])
-        for server in servers:
-            api.nova.flavor_get(IsA(http.HttpRequest), server.flavor["id"]). \
-                AndReturn(full_flavors[server.flavor["id"]])
+        api.keystone.tenant_get_many(IsA(http.HttpRequest), IsA(list)) \
+            .AndReturn(dict([(t.id, t) for t in tenants]))
+        # Each missing flavor is only fetched once.
+        for flavor_id in set(server.flavor["id"] for server in servers):
+            api.nova.flavor_get(IsA(http.HttpRequest), flavor_id). \
+                AndReturn(full_flavors[flavor_id])
 
         self.mox.ReplayAll()
 
@@ -85,7 +86,7 @@ class InstanceViewTest(test.BaseAdminViewTests):
 
     @test.create_stubs({api.nova: ('flavor_list', 'flavor_get',
                                     'server_list', 'extension_supported', ),
-                        api.keystone: ('tenant_list',)})
+                        api.keystone: ('tenant_get_many',)})
     def test_index_flavor_get_exception(self):
         servers = self.servers.list()
         flavors = self.flavors.list()
@@ -103,8 +104,8 @@ class InstanceViewTest(test.BaseAdminViewTests):
             .MultipleTimes().AndReturn(True)
         api.nova.flavor_list(IsA(http.HttpRequest)). \
                             AndReturn(flavors)
-        api.keystone.tenant_list(IsA(http.HttpRequest)).\
-                                 AndReturn([tenants, False])
+        api.keystone.tenant_get_many(IsA(http.HttpRequest), IsA(list)) \
+            .AndReturn(dict([(t.id, t) for t in tenants]))
         for server in servers:
             api.nova.flavor_get(IsA(http.HttpRequest), server.flavor["id"]). \
                 AndRaise(self.exceptions.nova)
@@ -116,12 +117,14 @@ class InstanceViewTest(test.BaseAdminViewTests):
         self.assertMessageCount(res, error=len(servers))
         self.assertItemsEqual(instances, servers)
 
-    @test.create_stubs({api.nova: ('server_list',)})
+    @test.create_stubs({api.nova: ('server_list', 'flavor_list',)})
     def test_index_server_list_exception(self):
         search_opts = {'marker': None, 'paginate': True}
         api.nova.server_list(IsA(http.HttpRequest),
                              all_tenants=True, search_opts=search_opts) \
                                 .AndRaise(self.exceptions.nova)
+        api.nova.flavor_list(IsA(http.HttpRequest)) \
+            .AndReturn(self.flavors.list())
 
         self.mox.ReplayAll()
 
@@ -165,10 +168,10 @@ class InstanceViewTest(test.BaseAdminViewTests):
 
     @test.create_stubs({api.nova: ('flavor_list', 'server_list',
                                    'extension_supported', ),
-                        api.keystone: ('tenant_list',)})
+                        api.keystone: ('tenant_get_many',)})
     def test_index_options_before_migrate(self):
-        api.keystone.tenant_list(IsA(http.HttpRequest)).\
-            AndReturn([self.tenants.list(), False])
+        api.keystone.tenant_get_many(IsA(http.HttpRequest), IsA(list)) \
+            .AndReturn(dict([(t.id, t) for t in self.tenants.list()]))
         search_opts = {'marker': None, 'paginate': True}
         api.nova.server_list(IsA(http.HttpRequest),
                              all_tenants=True, search_opts=search_opts) \
@@ -186,15 +189,15 @@ class InstanceViewTest(test.BaseAdminViewTests):
 
     @test.create_stubs({api.nova: ('flavor_list', 'server_list',
                                    'extension_supported', ),
-                        api.keystone: ('tenant_list',)})
+                        api.keystone: ('tenant_get_many',)})
     def test_index_options_after_migrate(self):
         servers = self.servers.list()
         server1 = servers[0]
         server1.status = "VERIFY_RESIZE"
         server2 = servers[2]
         server2.status = "VERIFY_RESIZE"
-        api.keystone.tenant_list(IsA(http.HttpRequest)) \
-                    .AndReturn([self.tenants.list(), False])
+        api.keystone.tenant_get_many(IsA(http.HttpRequest), IsA(list)) \
+            .AndReturn(dict([(t.id, t) for t in self.tenants.list()]))
         search_opts = {'marker': None, 'paginate': True}
         api.nova.extension_supported('AdminActions', IsA(http.HttpRequest)) \
             .MultipleTimes().AndReturn(True)
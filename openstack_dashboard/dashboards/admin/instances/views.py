@@ -19,9 +19,10 @@
 #    License for the specific language governing permissions and limitations
 #    under the License.
 
+import functools
+
 from django.core.urlresolvers import reverse  # noqa
 from django.core.urlresolvers import reverse_lazy  # noqa
-from django.utils.datastructures import SortedDict  # noqa
 from django.utils.translation import ugettext_lazy as _  # noqa
 
 from horizon import exceptions
@@ -68,45 +69,46 @@ class AdminIndexView(tables.DataTableView):
         instances = []
         marker = self.request.GET.get(
             project_tables.AdminInstancesTable._meta.pagination_param, None)
+        # Gather instances and flavors at the same time.
+        results = api.base.call_concurrently({
+            'instances': functools.partial(
+                api.nova.server_list, self.request,
+                search_opts={'marker': marker, 'paginate': True},
+                all_tenants=True),
+            'flavors': functools.partial(api.nova.flavor_list, self.request)})
         try:
-            instances, self._more = api.nova.server_list(
-                self.request,
-                search_opts={'marker': marker,
-                             'paginate': True},
-                all_tenants=True)
+            instances, self._more = results['instances'].get()
         except Exception:
             self._more = False
             exceptions.handle(self.request,
                               _('Unable to retrieve instance list.'))
         if instances:
-            # Gather our flavors to correlate against IDs
+            # Correlate flavors against IDs
             try:
-                flavors = api.nova.flavor_list(self.request)
+                flavors = results['flavors'].get()
             except Exception:
                 # If fails to retrieve flavor list, creates an empty list.
                 flavors = []
 
-            # Gather our tenants to correlate against IDs
+            # Correlate tenants against IDs
             try:
-                tenants, has_more = api.keystone.tenant_list(self.request)
+                tenant_dict = api.keystone.tenant_get_many(
+                    self.request, [inst.tenant_id for inst in instances])
             except Exception:
-                tenants = []
+                tenant_dict = {}
                 msg = _('Unable to retrieve instance project information.')
                 exceptions.handle(self.request, msg)
 
-            full_flavors = SortedDict([(f.id, f) for f in flavors])
-            tenant_dict = SortedDict([(t.id, t) for t in tenants])
+            # Flavors missing from the list (e.g. deleted ones) are fetched
+            # individually, once per flavor.
+            full_flavors = api.nova.flavor_get_many(
+                self.request, [inst.flavor["id"] for inst in instances],
+                flavors=flavors)
             # Loop through instances to get flavor and tenant info.
             for inst in instances:
                 flavor_id = inst.flavor["id"]
                 try:
-                    if flavor_id in full_flavors:
-                        inst.full_flavor = full_flavors[flavor_id]
-                    else:
-                        # If the flavor_id is not in full_flavors list,
-                        # gets it via nova api.
-                        inst.full_flavor = api.nova.flavor_get(
-                            self.request, flavor_id)
+                    inst.full_flavor = full_flavors[flavor_id].get()
                 except Exception:
                     msg = _('Unable to retrieve instance size information.')
                     exceptions.handle(self.request, msg)
@@ -148,6 +148,44 @@ class MeteringViewTests(test.APITestCase, test.BaseAdminViewTests):
         self._verify_series(res._container[0], 4.55, '2012-12-21T11:00:55',
                             expected_names)
 
+    def test_stats_for_line_chart_downsampled(self):
+        resources = self.resources.list()
+        statistic = self.statistics.first()
+        statistics = []
+        for minute in range(50):
+            statistics.append(statistic.__class__(
+                statistic.manager,
+                dict(statistic._info,
+                     avg=minute % 7,
+                     duration_end='2012-12-21T11:%02d:00' % minute)))
+
+        ceilometerclient = self.stub_ceilometerclient()
+        ceilometerclient.resources = self.mox.CreateMockAnything()
+        ceilometerclient.resources.list(q=[]).AndReturn(resources)
+
+        ceilometerclient.statistics = self.mox.CreateMockAnything()
+        ceilometerclient.statistics.list(meter_name="storage.objects",
+                                         period=IsA(int), q=IsA(list)).\
+            MultipleTimes().\
+            AndReturn(statistics)
+
+        self.mox.ReplayAll()
+
+        res = self.client.get(reverse('horizon:admin:metering:samples') +
+            "?meter=storage.objects&stats_attr=avg&date_options=7"
+            "&width=10&format=columnar")
+
+        data = json.loads(res.content)
+        self.assertEqual(len(data['series']), 2)
+        for serie in data['series']:
+            self.assertFalse('data' in serie)
+            self.assertEqual(len(serie['x']), 10)
+            self.assertEqual(len(serie['y']), 10)
+            # 2012-12-21T11:00:00 and 2012-12-21T11:49:00
+            self.assertEqual(serie['x'][0], 1356087600)
+            self.assertEqual(serie['x'][-1], 1356090540)
+            self.assertEqual(serie['x'], sorted(serie['x']))
+
 
 class MeteringStatsTabTests(test.APITestCase):
 
@@ -12,6 +12,7 @@
 # License for the specific language governing permissions and limitations
 # under the License.
 
+import calendar
 from datetime import datetime  # noqa
 from datetime import timedelta  # noqa
 
@@ -19,10 +20,11 @@ import json
 
 from django.http import HttpResponse   # noqa
 from django.utils.translation import ugettext_lazy as _  # noqa
-from django.views.generic import TemplateView  # noqa
+from django.views.generic import View  # noqa
 
 from horizon import exceptions
 from horizon import tabs
+from horizon.utils import timeseries
 
 from openstack_dashboard import api
 from openstack_dashboard.api import ceilometer
@@ -36,28 +38,62 @@ class IndexView(tabs.TabbedTableView):
     template_name = 'admin/metering/index.html'
 
 
-class SamplesView(TemplateView):
-    template_name = "admin/metering/samples.csv"
+# The number of periods for which statistics are fetched.
+NUMBER_OF_SAMPLES = 400
+# The maximum number of points sent for all the series of a chart.
+MAX_CHART_POINTS = 20000
+DATE_FORMAT = "%Y-%m-%dT%H:%M:%S"
 
+
+class SamplesView(View):
     @staticmethod
     def _series_for_meter(aggregates,
                           resource_name,
                           meter_name,
                           stats_name,
-                          unit):
-        """Construct datapoint series for a meter from resource aggregates."""
+                          unit,
+                          width=None,
+                          columnar=False):
+        """Construct datapoint series for a meter from resource aggregates.
+
+        When the ``width`` of the chart (in pixels) is given, the series are
+        downsampled to at most one point per pixel, and fewer when there are
+        so many series that they would exceed ``MAX_CHART_POINTS`` in total.
+        The points of the ``columnar`` series are two lists, ``x`` holding
+        the timestamps (in seconds since the epoch) and ``y`` the values,
+        rather than one object per point.
+        """
         series = []
         for resource in aggregates:
             if getattr(resource, meter_name):
-                point = {'unit': unit,
-                         'name': getattr(resource, resource_name),
-                         'data': []}
+                points = []
                 for statistic in getattr(resource, meter_name):
-                    date = statistic.duration_end[:19]
+                    date = datetime.strptime(statistic.duration_end[:19],
+                                             DATE_FORMAT)
                     value = float(getattr(statistic, stats_name))
-                    point['data'].append({'x': date, 'y': value})
-                series.append(point)
-        return series
+                    points.append((calendar.timegm(date.timetuple()), value))
+                series.append((getattr(resource, resource_name), points))
+
+        if width and series:
+            threshold = min(width, max(MAX_CHART_POINTS / len(series), 2))
+        else:
+            threshold = None
+
+        result = []
+        for name, points in series:
+            if threshold:
+                points = timeseries.downsample(points, threshold)
+            serie = {'unit': unit, 'name': name}
+            if columnar:
+                serie['x'] = [x for x, y in points]
+                serie['y'] = [y for x, y in points]
+            else:
+                serie['data'] = [
+                    {'x': datetime.utcfromtimestamp(x).strftime(DATE_FORMAT),
+                     'y': y}
+                    for x, y in points]
+            result.append(serie)
+        return result
 
     def get(self, request, *args, **kwargs):
         meter = request.GET.get('meter', None)
@@ -66,6 +102,11 @@ class SamplesView(TemplateView):
         date_from = request.GET.get('date_from', None)
         date_to = request.GET.get('date_to', None)
         stats_attr = request.GET.get('stats_attr', 'avg')
+        try:
+            width = int(request.GET['width'])
+        except (KeyError, ValueError):
+            width = None
+        columnar = request.GET.get('format', None) == 'columnar'
 
         # TODO(lsmola) all timestamps should probably work with
         # current timezone. And also show the current timezone in chart.
@@ -113,10 +154,12 @@ class SamplesView(TemplateView):
                 delta_in_seconds = 3600 * 24
             else:
                 delta_in_seconds = delta.days * 24 * 3600 + delta.seconds
-            # Lets always show 400 samples in the chart. Know that it is
+            # Lets always fetch 400 samples for the chart. Know that it is
             # maximum amount of samples and it can be lower.
-            number_of_samples = 400
-            period = delta_in_seconds / number_of_samples
+            period = delta_in_seconds / NUMBER_OF_SAMPLES
+            # Start on a period boundary, so the statistics of the past
+            # periods can be cached.
+            date_from = ceilometer.align_to_period(date_from, period)
         else:
             # If some date is missing, just set static window to one day.
             period = 3600 * 24
@@ -169,7 +212,9 @@ class SamplesView(TemplateView):
                                             'id',
                                             meter_name,
                                             stats_attr,
-                                            unit)
+                                            unit,
+                                            width=width,
+                                            columnar=columnar)
         else:
             query = []
 
@@ -200,7 +245,9 @@ class SamplesView(TemplateView):
                                             'resource_id',
                                             meter_name,
                                             stats_attr,
-                                            unit)
+                                            unit,
+                                            width=width,
+                                            columnar=columnar)
 
         ret = {}
         ret['series'] = series
@@ -42,7 +42,7 @@ class UsageViewTests(test.BaseAdminViewTests):
         self.mox.StubOutWithMock(api.nova, 'usage_list')
         self.mox.StubOutWithMock(api.nova, 'tenant_absolute_limits')
         self.mox.StubOutWithMock(api.nova, 'extension_supported')
-        self.mox.StubOutWithMock(api.keystone, 'tenant_list')
+        self.mox.StubOutWithMock(api.keystone, 'tenant_get_many')
         self.mox.StubOutWithMock(api.neutron, 'is_extension_supported')
         self.mox.StubOutWithMock(api.network, 'tenant_floating_ip_list')
         self.mox.StubOutWithMock(api.network, 'security_group_list')
@@ -65,8 +65,8 @@ class UsageViewTests(test.BaseAdminViewTests):
             .AndReturn(nova_stu_enabled)
         now = timezone.now()
         usage_obj = api.nova.NovaUsage(self.usages.first())
-        api.keystone.tenant_list(IsA(http.HttpRequest)) \
-                    .AndReturn([self.tenants.list(), False])
+        api.keystone.tenant_get_many(IsA(http.HttpRequest), IsA(list)) \
+            .AndReturn(dict([(t.id, t) for t in self.tenants.list()]))
 
         if nova_stu_enabled:
             api.nova.usage_list(IsA(http.HttpRequest),
@@ -126,8 +126,8 @@ class UsageViewTests(test.BaseAdminViewTests):
             .AndReturn(nova_stu_enabled)
         now = timezone.now()
         usage_obj = [api.nova.NovaUsage(u) for u in self.usages.list()]
-        api.keystone.tenant_list(IsA(http.HttpRequest)) \
-                    .AndReturn([self.tenants.list(), False])
+        api.keystone.tenant_get_many(IsA(http.HttpRequest), IsA(list)) \
+            .AndReturn(dict([(t.id, t) for t in self.tenants.list()]))
         if nova_stu_enabled:
             api.nova.usage_list(IsA(http.HttpRequest),
                                 datetime.datetime(now.year,
@@ -137,24 +137,15 @@ class UsageViewTests(test.BaseAdminViewTests):
                                                   now.month,
                                                   now.day, 23, 59, 59, 0)) \
                 .AndReturn(usage_obj)
-        api.nova.tenant_absolute_limits(IsA(http.HttpRequest))\
-            .AndReturn(self.limits['absolute'])
-        api.neutron.is_extension_supported(IsA(http.HttpRequest),
-                                           'security-group').AndReturn(True)
-        api.network.tenant_floating_ip_list(IsA(http.HttpRequest)) \
-                           .AndReturn(self.floating_ips.list())
-        api.network.security_group_list(IsA(http.HttpRequest)) \
-                           .AndReturn(self.q_secgroups.list())
-        api.cinder.tenant_absolute_limits(IsA(http.HttpRequest)) \
-                           .AndReturn(self.cinder_limits['absolute'])
         self.mox.ReplayAll()
 
         csv_url = reverse('horizon:admin:overview:index') + "?format=csv"
         res = self.client.get(csv_url)
         self.assertTemplateUsed(res, 'admin/overview/usage.csv')
         self.assertTrue(isinstance(res.context['usage'], usage.GlobalUsage))
+        content = self.get_response_content(res).decode('utf-8')
         hdr = 'Project Name,VCPUs,Ram (MB),Disk (GB),Usage (Hours)'
-        self.assertContains(res, '%s\r\n' % hdr)
+        self.assertIn('%s\r\n' % hdr, content)
 
         if nova_stu_enabled:
             for obj in usage_obj:
@@ -163,4 +154,4 @@ class UsageViewTests(test.BaseAdminViewTests):
                                                             obj.memory_mb,
                                                             obj.disk_gb_hours,
                                                             obj.vcpu_hours)
-                self.assertContains(res, row)
+                self.assertIn(row, content)
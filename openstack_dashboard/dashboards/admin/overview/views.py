@@ -29,7 +29,7 @@ from openstack_dashboard import usage
 from openstack_dashboard.usage import base
 
 
-class GlobalUsageCsvRenderer(base.BaseCsvResponse):
+class GlobalUsageCsvRenderer(base.BaseCsvStreamingResponse):
 
     columns = [_("Project Name"), _("VCPUs"), _("Ram (MB)"),
                _("Disk (GB)"), _("Usage (Hours)")]
@@ -59,15 +59,13 @@ class GlobalOverview(usage.UsageView):
         data = super(GlobalOverview, self).get_data()
         # Pre-fill project names
         try:
-            projects, has_more = api.keystone.tenant_list(self.request)
+            project_dict = api.keystone.tenant_get_many(
+                self.request, [instance.tenant_id for instance in data])
         except Exception:
-            projects = []
+            project_dict = {}
             exceptions.handle(self.request,
                               _('Unable to retrieve project list.'))
         for instance in data:
-            project = filter(lambda t: t.id == instance.tenant_id, projects)
-            if project:
-                instance.project_name = getattr(project[0], "name", None)
-            else:
-                instance.project_name = None
+            project = project_dict.get(instance.tenant_id)
+            instance.project_name = getattr(project, "name", None)
         return data
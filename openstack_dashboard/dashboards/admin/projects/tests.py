@@ -1499,11 +1499,6 @@ class UsageViewTests(test.BaseAdminViewTests):
             api.nova.usage_get(IsA(http.HttpRequest),
                                self.tenant.id,
                                start, end).AndReturn(usage_obj)
-        api.nova.tenant_absolute_limits(IsA(http.HttpRequest))\
-            .AndReturn(self.limits['absolute'])
-        api.cinder.tenant_absolute_limits(IsA(http.HttpRequest)) \
-            .AndReturn(self.cinder_limits['absolute'])
-        self._stub_neutron_api_calls()
         self.mox.ReplayAll()
 
         project_id = self.tenants.first().id
@@ -1515,7 +1510,7 @@ class UsageViewTests(test.BaseAdminViewTests):
         self.assertTrue(isinstance(res.context['usage'], usage.ProjectUsage))
         hdr = ('Instance Name,VCPUs,Ram (MB),Disk (GB),Usage (Hours),'
                'Uptime(Seconds),State')
-        self.assertContains(res, '%s\r\n' % hdr)
+        self.assertIn('%s\r\n' % hdr, self.get_response_content(res))
 
 
 @unittest.skipUnless(os.environ.get('WITH_SELENIUM', False),
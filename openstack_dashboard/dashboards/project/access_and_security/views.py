@@ -32,3 +32,4 @@ from openstack_dashboard.dashboards.project.access_and_security \
 class IndexView(tabs.TabbedTableView):
     tab_group_class = project_tabs.AccessAndSecurityTabs
     template_name = 'project/access_and_security/index.html'
+    progressive_rendering = True
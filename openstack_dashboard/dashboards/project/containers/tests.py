@@ -256,16 +256,18 @@ class SwiftTests(test.TestCase):
         for container in self.containers.list():
             for obj in self.objects.list():
                 self.mox.ResetAll()  # mandatory in a for loop
-                api.swift.swift_get_object(IsA(http.HttpRequest),
-                                           container.name,
-                                           obj.name).AndReturn(obj)
+                api.swift.swift_get_object(
+                    IsA(http.HttpRequest),
+                    container.name,
+                    obj.name,
+                    resp_chunk_size=api.swift.CHUNK_SIZE).AndReturn(obj)
                 self.mox.ReplayAll()
 
                 download_url = reverse(
                     'horizon:project:containers:object_download',
                     args=[container.name, obj.name])
                 res = self.client.get(download_url)
-                self.assertEqual(res.content, obj.data)
+                self.assertEqual(self.get_response_content(res), obj.data)
                 self.assertTrue(res.has_header('Content-Disposition'))
                 # Check that the returned Content-Disposition filename is well
                 # surrounded by double quotes and with commas removed
@@ -276,6 +278,28 @@ class SwiftTests(test.TestCase):
                     'attachment; filename=%s' % expected_name
                 )
 
+    @test.create_stubs({api.swift: ('swift_get_object',)})
+    def test_download_range(self):
+        container = self.containers.first()
+        orig_obj = self.objects.first()
+        obj_info = dict(orig_obj._apidict, bytes=4,
+                        content_range='bytes 0-3/9')
+        obj = api.swift.StorageObject(obj_info, container.name,
+                                      data=orig_obj.data[:4])
+        api.swift.swift_get_object(IsA(http.HttpRequest),
+                                   container.name,
+                                   obj.name,
+                                   resp_chunk_size=api.swift.CHUNK_SIZE,
+                                   byte_range='bytes=0-3').AndReturn(obj)
+        self.mox.ReplayAll()
+
+        download_url = reverse('horizon:project:containers:object_download',
+                               args=[container.name, obj.name])
+        res = self.client.get(download_url, HTTP_RANGE='bytes=0-3')
+        self.assertEqual(res.status_code, 206)
+        self.assertEqual(res['Content-Range'], 'bytes 0-3/9')
+        self.assertEqual(res['Content-Length'], '4')
+
     @test.create_stubs({api.swift: ('swift_get_containers',)})
     def test_copy_index(self):
         ret = (self.containers.list(), False)
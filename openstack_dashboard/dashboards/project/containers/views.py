@@ -22,8 +22,9 @@
 Views for managing Swift containers.
 """
 
+import re
+
 from django.core.urlresolvers import reverse  # noqa
-from django import http
 from django.utils.functional import cached_property  # noqa
 from django.utils import http as utils_http
 from django.utils.translation import ugettext_lazy as _  # noqa
@@ -43,6 +44,16 @@ from openstack_dashboard.dashboards.project.containers import tables
 
 import os
 
+try:
+    from django.http import StreamingHttpResponse  # noqa
+except ImportError:
+    # Django < 1.5 streams an iterator passed to a regular response.
+    from django.http import HttpResponse as StreamingHttpResponse  # noqa
+
+
+# Only a single, simple byte range is passed on to Swift.
+BYTE_RANGE_RE = re.compile(r'^bytes=(\d+-\d*|-\d+)$')
+
 
 def for_url(container_name):
     """Build a URL friendly container name.
@@ -201,8 +212,15 @@ class UploadView(forms.ModalFormView):
 
 
 def object_download(request, container_name, object_path):
+    byte_range = request.META.get('HTTP_RANGE', '').replace(' ', '')
+    if not BYTE_RANGE_RE.match(byte_range):
+        byte_range = None
     try:
-        obj = api.swift.swift_get_object(request, container_name, object_path)
+        kwargs = {'resp_chunk_size': swift.CHUNK_SIZE}
+        if byte_range:
+            kwargs['byte_range'] = byte_range
+        obj = api.swift.swift_get_object(request, container_name, object_path,
+                                         **kwargs)
     except Exception:
         redirect = reverse("horizon:project:containers:index")
         exceptions.handle(request,
@@ -214,11 +232,18 @@ def object_download(request, container_name, object_path):
     if not os.path.splitext(obj.name)[1] and obj.orig_name:
         name, ext = os.path.splitext(obj.orig_name)
         filename = "%s%s" % (filename, ext)
-    response = http.HttpResponse()
+    # The object is streamed to the client chunk by chunk, so memory usage
+    # doesn't depend on the size of the object.
+    response = StreamingHttpResponse(obj.data)
     safe_name = filename.replace(",", "").encode('utf-8')
     response['Content-Disposition'] = 'attachment; filename="%s"' % safe_name
     response['Content-Type'] = 'application/octet-stream'
-    response.write(obj.data)
+    response['Accept-Ranges'] = 'bytes'
+    if obj.get('bytes') is not None:
+        response['Content-Length'] = obj.bytes
+    if byte_range and obj.get('content_range'):
+        response.status_code = 206
+        response['Content-Range'] = obj.content_range
     return response
 
 
@@ -45,6 +45,8 @@ class IndexView(tables.MultiTableView):
     table_classes = (images_tables.ImagesTable,
                      vol_snsh_tables.VolumeSnapshotsTable)
     template_name = 'project/images_and_snapshots/index.html'
+    concurrent_data_loading = True
+    progressive_rendering = True
 
     def has_more_data(self, table):
         return getattr(self, "_more_%s" % table.name, False)
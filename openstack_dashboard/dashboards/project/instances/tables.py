@@ -15,6 +15,7 @@
 #    under the License.
 
 
+import datetime
 import logging
 
 from django.core import urlresolvers
@@ -37,6 +38,7 @@ from openstack_dashboard import api
 from openstack_dashboard.dashboards.project.access_and_security.floating_ips \
     import workflows
 from openstack_dashboard.dashboards.project.instances import tabs
+from openstack_dashboard.openstack.common import timeutils
 
 
 LOG = logging.getLogger(__name__)
@@ -357,6 +359,12 @@ class AssociateIP(tables.LinkAction):
             return False
         return not is_deleting(instance)
 
+    def allowed_many(self, request, instances):
+        # Ask the network API once for the whole table rather than per row.
+        if api.network.floating_ip_simple_associate_supported(request):
+            return [False for instance in instances]
+        return [not is_deleting(instance) for instance in instances]
+
     def get_link_url(self, datum):
         base_url = urlresolvers.reverse(self.url)
         next = urlresolvers.reverse("horizon:project:instances:index")
@@ -376,6 +384,11 @@ class SimpleAssociateIP(tables.Action):
             return False
         return not is_deleting(instance)
 
+    def allowed_many(self, request, instances):
+        if not api.network.floating_ip_simple_associate_supported(request):
+            return [False for instance in instances]
+        return [not is_deleting(instance) for instance in instances]
+
     def single(self, table, request, instance_id):
         try:
             # target_id is port_id for Neutron and instance_id for Nova Network
@@ -455,6 +468,12 @@ def get_instance_error(instance):
 
 class UpdateRow(tables.Row):
     ajax = True
+    all_tenants = False
+    # Up to this many rows, instances are fetched one by one rather than
+    # listed.
+    list_threshold = 3
+    # Only the instances changed within this many seconds are listed.
+    list_changes_window = 300
 
     def get_data(self, request, instance_id):
         instance = api.nova.server_get(request, instance_id)
@@ -465,6 +484,52 @@ class UpdateRow(tables.Row):
             messages.error(request, error)
         return instance
 
+    def get_fingerprint(self, instance):
+        return (instance.status,
+                getattr(instance, "OS-EXT-STS:task_state", None),
+                getattr(instance, "OS-EXT-STS:power_state", None),
+                getattr(instance, "updated", None),
+                # Addresses can change without the update time changing.
+                getattr(instance, "addresses", None))
+
+    def get_data_many(self, request, instance_ids):
+        if len(instance_ids) <= self.list_threshold:
+            return {}
+        # Lists a page of the instances changed recently (transitioning
+        # ones are), rather than getting each instance. The instances
+        # missing from it (those deleted, unchanged for a while or beyond
+        # the first page) are then fetched individually.
+        changed_since = (timeutils.utcnow() -
+                         datetime.timedelta(seconds=self.list_changes_window))
+        search_opts = {'changes-since': timeutils.isotime(changed_since),
+                       'paginate': True}
+        instances, has_more = api.nova.server_list(
+            request, search_opts=search_opts, all_tenants=self.all_tenants)
+        instances = [instance for instance in instances
+                     if instance.id in instance_ids and
+                     instance.status != "DELETED"]
+        try:
+            flavors = api.nova.flavor_list(request)
+        except Exception:
+            flavors = []
+            exceptions.handle(request, ignore=True)
+        full_flavors = api.nova.flavor_get_many(
+            request, [instance.flavor["id"] for instance in instances],
+            flavors=flavors)
+        data = {}
+        for instance in instances:
+            try:
+                instance.full_flavor = full_flavors[
+                    instance.flavor["id"]].get()
+            except Exception:
+                # Fall back to get_data for this instance.
+                continue
+            error = get_instance_error(instance)
+            if error:
+                messages.error(request, error)
+            data[instance.id] = instance
+        return data
+
 
 class StartInstance(tables.BatchAction):
     name = "start"
@@ -606,6 +671,7 @@ class InstancesTable(tables.DataTable):
         verbose_name = _("Instances")
         status_columns = ["status", "task"]
         row_class = UpdateRow
+        compiled_rows = True
         table_actions = (LaunchLink, SoftRebootInstance, TerminateInstance,
                          InstancesFilterAction)
         row_actions = (StartInstance, ConfirmResize, RevertResize,
@@ -19,6 +19,9 @@
 #    under the License.
 
 import json
+import logging
+import os
+import time
 import uuid
 
 from django.core.urlresolvers import reverse  # noqa
@@ -26,9 +29,13 @@ from django import http
 from django.test import utils as test_utils
 from django.utils.datastructures import SortedDict  # noqa
 from django.utils.http import urlencode  # noqa
+from django.utils import unittest
 
+import mox
 from mox import IgnoreArg  # noqa
 from mox import IsA  # noqa
+from novaclient import exceptions as nova_exceptions
+from novaclient.v1_1 import servers as nova_servers
 
 from horizon.workflows import views
 
@@ -42,6 +49,8 @@ from openstack_dashboard.dashboards.project.instances import tabs
 from openstack_dashboard.dashboards.project.instances import workflows
 
 
+LOG = logging.getLogger(__name__)
+
 INDEX_URL = reverse('horizon:project:instances:index')
 SEC_GROUP_ROLE_PREFIX = \
     workflows.update_instance.INSTANCE_SEC_GROUP_SLUG + "_role_"
@@ -83,11 +92,17 @@ class InstanceTests(test.TestCase):
         self.assertItemsEqual(instances, self.servers.list())
 
     @test.create_stubs({api.nova: ('server_list',
-                                   'tenant_absolute_limits',)})
+                                   'flavor_list',
+                                   'tenant_absolute_limits',),
+                        api.glance: ('image_list_detailed',)})
     def test_index_server_list_exception(self):
         search_opts = {'marker': None, 'paginate': True}
         api.nova.server_list(IsA(http.HttpRequest), search_opts=search_opts) \
             .AndRaise(self.exceptions.nova)
+        api.nova.flavor_list(IsA(http.HttpRequest)) \
+            .AndReturn(self.flavors.list())
+        api.glance.image_list_detailed(IgnoreArg()) \
+            .AndReturn((self.images.list(), False))
         api.nova.tenant_absolute_limits(IsA(http.HttpRequest), reserved=True) \
            .MultipleTimes().AndReturn(self.limits['absolute'])
 
@@ -122,9 +137,10 @@ class InstanceTests(test.TestCase):
             .AndRaise(self.exceptions.nova)
         api.glance.image_list_detailed(IgnoreArg()) \
             .AndReturn((self.images.list(), False))
-        for server in servers:
-            api.nova.flavor_get(IsA(http.HttpRequest), server.flavor["id"]). \
-                AndReturn(full_flavors[server.flavor["id"]])
+        # Each missing flavor is only fetched once.
+        for flavor_id in set(server.flavor["id"] for server in servers):
+            api.nova.flavor_get(IsA(http.HttpRequest), flavor_id). \
+                AndReturn(full_flavors[flavor_id])
         api.nova.tenant_absolute_limits(IsA(http.HttpRequest), reserved=True) \
            .MultipleTimes().AndReturn(self.limits['absolute'])
         api.network.floating_ip_simple_associate_supported(
@@ -2216,6 +2232,31 @@ class InstanceAjaxTests(test.TestCase):
         res = self.client.get('?'.join((INDEX_URL, urlencode(params))),
                               HTTP_X_REQUESTED_WITH='XMLHttpRequest')
         self.assertContains(res, server.name)
+        self.assertTrue(res.has_header('ETag'))
+
+    @test.create_stubs({api.nova: ("server_get",
+                                   "flavor_get")})
+    def test_row_update_not_modified(self):
+        server = self.servers.first()
+        row = tables.InstancesTable._meta.row_class(None)
+        etag = tables.InstancesTable(self.request).get_row_etag(row, server)
+
+        # The row isn't rendered, so its actions aren't checked either.
+        api.nova.server_get(IsA(http.HttpRequest), server.id)\
+            .AndReturn(server)
+        api.nova.flavor_get(IsA(http.HttpRequest), server.flavor["id"])\
+            .AndReturn(self.flavors.first())
+
+        self.mox.ReplayAll()
+
+        params = {'action': 'row_update',
+                  'table': 'instances',
+                  'obj_id': server.id,
+                  }
+        res = self.client.get('?'.join((INDEX_URL, urlencode(params))),
+                              HTTP_X_REQUESTED_WITH='XMLHttpRequest',
+                              HTTP_IF_NONE_MATCH='"%s"' % etag)
+        self.assertEqual(res.status_code, 304)
 
     @test.create_stubs({api.nova: ("server_get",
                                    "flavor_get",
@@ -2268,3 +2309,156 @@ class InstanceAjaxTests(test.TestCase):
         # a different availability zone.', u'']]
         self.assertEqual(messages[0][0], 'error')
         self.assertTrue(messages[0][1].startswith('Failed'))
+
+    @test.create_stubs({api.nova: ("server_list",
+                                   "server_get",
+                                   "flavor_list",
+                                   "extension_supported"),
+                        api.neutron: ("is_extension_supported",)})
+    def test_rows_update(self):
+        self.mox.stubs.Set(tables.UpdateRow, 'list_threshold', 1)
+        servers = self.servers.list()[:2]
+        deleted_id = 'deleted-instance-id'
+
+        api.nova.extension_supported('AdminActions', IsA(http.HttpRequest))\
+            .MultipleTimes().AndReturn(True)
+        api.neutron.is_extension_supported(IsA(http.HttpRequest),
+                                           'security-group')\
+            .MultipleTimes().AndReturn(True)
+        api.nova.server_list(IsA(http.HttpRequest),
+                             search_opts=mox.And(
+                                 mox.ContainsKeyValue('paginate', True),
+                                 mox.In('changes-since')),
+                             all_tenants=False)\
+            .AndReturn([self.servers.list(), False])
+        api.nova.flavor_list(IsA(http.HttpRequest))\
+            .AndReturn(self.flavors.list())
+        api.nova.server_get(IsA(http.HttpRequest), deleted_id)\
+            .AndRaise(nova_exceptions.NotFound(404, 'Not Found'))
+
+        self.mox.ReplayAll()
+
+        obj_ids = [server.id for server in servers] + [deleted_id]
+        params = {'action': 'rows_update',
+                  'table': 'instances',
+                  'obj_ids': obj_ids}
+        res = self.client.get('?'.join((INDEX_URL,
+                                        urlencode(params, doseq=True))),
+                              HTTP_X_REQUESTED_WITH='XMLHttpRequest')
+        content = json.loads(res.content)
+        self.assertEqual(sorted(content['rows'].keys()),
+                         sorted(server.id for server in servers))
+        for server in servers:
+            self.assertIn(server.name, content['rows'][server.id])
+        self.assertEqual(content['removed'], [deleted_id])
+
+    @test.create_stubs({api.nova: ("server_get",
+                                   "flavor_get",
+                                   "extension_supported"),
+                        api.neutron: ("is_extension_supported",)})
+    def test_rows_update_few(self):
+        servers = self.servers.list()[:2]
+
+        api.nova.extension_supported('AdminActions', IsA(http.HttpRequest))\
+            .MultipleTimes().AndReturn(True)
+        api.neutron.is_extension_supported(IsA(http.HttpRequest),
+                                           'security-group')\
+            .MultipleTimes().AndReturn(True)
+        # Few rows are fetched one by one, without listing instances.
+        for server in servers:
+            api.nova.server_get(IsA(http.HttpRequest), server.id)\
+                .AndReturn(server)
+            api.nova.flavor_get(IsA(http.HttpRequest), server.flavor['id'])\
+                .AndReturn(self.flavors.first())
+
+        self.mox.ReplayAll()
+
+        params = {'action': 'rows_update',
+                  'table': 'instances',
+                  'obj_ids': [server.id for server in servers]}
+        res = self.client.get('?'.join((INDEX_URL,
+                                        urlencode(params, doseq=True))),
+                              HTTP_X_REQUESTED_WITH='XMLHttpRequest')
+        content = json.loads(res.content)
+        self.assertEqual(sorted(content['rows'].keys()),
+                         sorted(server.id for server in servers))
+
+
+def _render_instance_rows(request, instances, compiled):
+    meta = tables.InstancesTable._meta
+    old_compiled_rows = meta.compiled_rows
+    meta.compiled_rows = compiled
+    try:
+        table = tables.InstancesTable(request, instances)
+        return [row.render() for row in table.get_rows()]
+    finally:
+        meta.compiled_rows = old_compiled_rows
+
+
+class InstancesTableMixin(object):
+    def _get_instances(self, count=None):
+        server_list = self.servers.list()
+        if count is not None:
+            server_list = [nova_servers.Server(
+                nova_servers.ServerManager(None),
+                dict(server_list[i % len(server_list)]._info, id=str(i)))
+                for i in range(count)]
+        instances = []
+        for server in server_list:
+            instance = api.nova.Server(server, self.request)
+            instance.image = {'name': 'image_%s' % instance.id}
+            instance.full_flavor = self.flavors.first()
+            instances.append(instance)
+        return instances
+
+    def _stub_row_actions(self):
+        self.mox.StubOutWithMock(api.nova, 'extension_supported')
+        self.mox.StubOutWithMock(api.network,
+                                 'floating_ip_simple_associate_supported')
+        api.nova.extension_supported('AdminActions',
+                                     IsA(http.HttpRequest)) \
+            .MultipleTimes().AndReturn(True)
+        api.network.floating_ip_simple_associate_supported(
+            IsA(http.HttpRequest)).MultipleTimes().AndReturn(True)
+        self.mox.ReplayAll()
+
+
+class InstancesTableRenderingTests(InstancesTableMixin, test.TestCase):
+    def test_compiled_rows(self):
+        self._stub_row_actions()
+        instances = self._get_instances()
+
+        compiled = _render_instance_rows(self.request, instances, True)
+        expected = _render_instance_rows(self.request, instances, False)
+        self.assertEqual(compiled, expected)
+
+
+@unittest.skipUnless(os.environ.get('WITH_BENCHMARKS', False),
+                     "The WITH_BENCHMARKS env variable is not set.")
+class InstancesTableBenchmark(InstancesTableMixin, test.TestCase):
+    """Compares the time taken to render the rows of a large
+    ``InstancesTable`` through the templates and with ``compiled_rows``.
+    """
+    row_count = 1000
+    repeat = 3
+
+    def _time(self, instances, compiled):
+        timings = []
+        for i in range(self.repeat):
+            start = time.time()
+            _render_instance_rows(self.request, instances, compiled)
+            timings.append(time.time() - start)
+        return min(timings)
+
+    def test_benchmark_compiled_rows(self):
+        self._stub_row_actions()
+        instances = self._get_instances(self.row_count)
+
+        templates = self._time(instances, False)
+        compiled = self._time(instances, True)
+        timings = ("InstancesTable, %d rows: templates %.3fs, "
+                   "compiled rows %.3fs (%.1fx)"
+                   % (self.row_count, templates, compiled,
+                      templates / compiled))
+        LOG.info(timings)
+        self.assertLess(compiled, templates, timings)
@@ -21,6 +21,8 @@
 """
 Views for managing instances.
 """
+import functools
+
 from django.core.urlresolvers import reverse  # noqa
 from django.core.urlresolvers import reverse_lazy  # noqa
 from django import http
@@ -55,34 +57,42 @@ class IndexView(tables.DataTableView):
     def get_data(self):
         marker = self.request.GET.get(
             project_tables.InstancesTable._meta.pagination_param, None)
-        # Gather our instances
+        # Gather our instances, flavors and images at the same time.
+        results = api.base.call_concurrently({
+            'instances': functools.partial(
+                api.nova.server_list, self.request,
+                search_opts={'marker': marker, 'paginate': True}),
+            'flavors': functools.partial(api.nova.flavor_list, self.request),
+            # TODO(gabriel): Handle pagination.
+            'images': functools.partial(api.glance.image_list_detailed,
+                                        self.request)})
         try:
-            instances, self._more = api.nova.server_list(
-                self.request,
-                search_opts={'marker': marker,
-                             'paginate': True})
+            instances, self._more = results['instances'].get()
         except Exception:
             self._more = False
             instances = []
             exceptions.handle(self.request,
                               _('Unable to retrieve instances.'))
-        # Gather our flavors and images and correlate our instances to them
+        # Correlate our instances to their flavors and images
         if instances:
             try:
-                flavors = api.nova.flavor_list(self.request)
+                flavors = results['flavors'].get()
             except Exception:
                 flavors = []
                 exceptions.handle(self.request, ignore=True)
 
             try:
-                # TODO(gabriel): Handle pagination.
-                images, more = api.glance.image_list_detailed(self.request)
+                images, more = results['images'].get()
             except Exception:
                 images = []
                 exceptions.handle(self.request, ignore=True)
 
-            full_flavors = SortedDict([(str(flavor.id), flavor)
-                                       for flavor in flavors])
+            # Flavors missing from the list (e.g. deleted ones) are fetched
+            # individually, once per flavor.
+            full_flavors = api.nova.flavor_get_many(
+                self.request,
+                [instance.flavor["id"] for instance in instances],
+                flavors=flavors)
             image_map = SortedDict([(str(image.id), image)
                                     for image in images])
 
@@ -100,13 +110,7 @@ class IndexView(tables.DataTableView):
 
                 try:
                     flavor_id = instance.flavor["id"]
-                    if flavor_id in full_flavors:
-                        instance.full_flavor = full_flavors[flavor_id]
-                    else:
-                        # If the flavor_id is not in full_flavors list,
-                        # get it via nova api.
-                        instance.full_flavor = api.nova.flavor_get(
-                            self.request, flavor_id)
+                    instance.full_flavor = full_flavors[flavor_id].get()
                 except Exception:
                     msg = _('Unable to retrieve instance size information.')
                     exceptions.handle(self.request, msg)
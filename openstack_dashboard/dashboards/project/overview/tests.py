@@ -197,15 +197,16 @@ class UsageViewTests(test.TestCase):
             api.nova.usage_get(IsA(http.HttpRequest),
                                self.tenant.id,
                                start, end).AndReturn(usage_obj)
-        api.nova.tenant_absolute_limits(IsA(http.HttpRequest))\
-            .AndReturn(self.limits['absolute'])
-        self._stub_neutron_api_calls()
-        self._stub_cinder_api_calls()
         self.mox.ReplayAll()
         res = self.client.get(reverse('horizon:project:overview:index') +
                               "?format=csv")
         self.assertTemplateUsed(res, 'project/overview/usage.csv')
         self.assertTrue(isinstance(res.context['usage'], usage.ProjectUsage))
+        content = self.get_response_content(res)
+        self.assertIn('Instance Name,VCPUs,Ram (MB)', content)
+        if nova_stu_enabled:
+            self.assertIn(usage_obj.server_usages[0]['name'].encode('utf-8'),
+                          content)
 
     def test_usage_exception_usage(self):
         now = timezone.now()
@@ -28,7 +28,7 @@ from openstack_dashboard import usage
 from openstack_dashboard.usage import base
 
 
-class ProjectUsageCsvRenderer(base.BaseCsvResponse):
+class ProjectUsageCsvRenderer(base.BaseCsvStreamingResponse):
 
     columns = [_("Instance Name"), _("VCPUs"), _("Ram (MB)"),
                _("Disk (GB)"), _("Usage (Hours)"),
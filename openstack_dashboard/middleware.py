@@ -0,0 +1,142 @@
+# vim: tabstop=4 shiftwidth=4 softtabstop=4
+
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+"""
+Middleware provided and used by the OpenStack Dashboard.
+"""
+
+import json
+import logging
+import time
+
+from django.conf import settings  # noqa
+from django.core.exceptions import MiddlewareNotUsed  # noqa
+from django.template.loader import render_to_string  # noqa
+from django.utils.datastructures import SortedDict  # noqa
+
+from openstack_dashboard.api import tracing
+
+
+LOG = logging.getLogger(__name__)
+
+PANEL_TEMPLATE = "_api_tracing_panel.html"
+
+
+def summarize(calls):
+    """Returns the number of calls and their total duration for each
+    service, in the order in which the services were first called.
+    """
+    services = SortedDict()
+    for call in calls:
+        count, duration = services.get(call.service, (0, 0.0))
+        services[call.service] = (count + 1, duration + call.duration)
+    return services
+
+
+def repeated(calls):
+    """Returns the number of calls made to each function called more than
+    once, the usual sign of an API call made for each item of a list.
+    """
+    counts = SortedDict()
+    for call in calls:
+        name = "%s.%s" % (call.service, call.function)
+        counts[name] = counts.get(name, 0) + 1
+    return SortedDict((name, count) for name, count in counts.items()
+                      if count > 1)
+
+
+def server_timing(calls, elapsed):
+    """Returns the value of the ``Server-Timing`` header for ``calls``: the
+    total duration of the calls made to each service, then the time taken
+    to serve the request.
+    """
+    metrics = ['%s;dur=%.1f;desc="%d calls"' % (service, duration * 1000,
+                                                count)
+               for service, (count, duration) in summarize(calls).items()]
+    metrics.append('total;dur=%.1f' % (elapsed * 1000))
+    return ", ".join(metrics)
+
+
+class APITracingMiddleware(object):
+    """Traces the calls made to the API wrappers of ``openstack_dashboard.api``
+    while serving each request, when the ``API_TRACING`` setting is ``True``.
+
+    The calls made are summed up in the ``Server-Timing`` header of the
+    response and in a line logged, as JSON, at the ``INFO`` level. When the
+    ``API_TRACING_PANEL`` setting is ``True`` as well, the list of the calls
+    is added at the end of the pages.
+
+    Calls made concurrently overlap: the total duration of the calls made to
+    a service may be longer than the time taken to serve the request.
+    """
+    def __init__(self):
+        if not getattr(settings, 'API_TRACING', False):
+            raise MiddlewareNotUsed()
+        self.panel = getattr(settings, 'API_TRACING_PANEL', False)
+
+    def process_request(self, request):
+        tracing.start(request)
+        request.api_tracing_start = time.time()
+
+    def process_response(self, request, response):
+        start = getattr(request, 'api_tracing_start', None)
+        if start is None:
+            return response
+        calls = tracing.get_calls(request)
+        response['Server-Timing'] = server_timing(calls, time.time() - start)
+        if getattr(response, 'streaming', False):
+            # The data of the parts streamed in is loaded while the response
+            # is sent, the summary is logged once it's been sent.
+            response.streaming_content = self._stream(
+                request, response, response.streaming_content)
+            return response
+        if self.panel and 'text/html' in response.get('Content-Type', ''):
+            self._add_panel(request, response, calls)
+        self._log(request, response, calls, time.time() - start)
+        return response
+
+    def _stream(self, request, response, content):
+        for chunk in content:
+            yield chunk
+        self._log(request, response, tracing.get_calls(request),
+                  time.time() - request.api_tracing_start)
+
+    def _add_panel(self, request, response, calls):
+        head, sep, tail = response.content.rpartition("</body>")
+        if not sep:
+            return
+        panel = render_to_string(PANEL_TEMPLATE,
+                                 {"calls": calls,
+                                  "services": summarize(calls),
+                                  "repeated": repeated(calls)})
+        response.content = head + panel.encode('utf-8') + sep + tail
+
+    def _log(self, request, response, calls, elapsed):
+        if not LOG.isEnabledFor(logging.INFO):
+            return
+        summary = {
+            "path": request.path,
+            "method": request.method,
+            "status": response.status_code,
+            "duration": round(elapsed * 1000, 1),
+            "calls": len(calls),
+            "errors": len([call for call in calls if call.status != 'ok']),
+            "services": dict((service, {"calls": count,
+                                        "duration": round(duration * 1000,
+                                                          1)})
+                             for service, (count, duration)
+                             in summarize(calls).items()),
+            "repeated": repeated(calls),
+        }
+        LOG.info("API calls: %s", json.dumps(summary, sort_keys=True))
@@ -19,6 +19,7 @@
 
 import logging
 import os.path
+import time
 
 from django.conf import settings  # noqa
 
@@ -34,6 +35,10 @@ CONF = cfg.CONF
 
 _ENFORCER = None
 _BASE_PATH = getattr(settings, 'POLICY_FILES_PATH', '')
+# Policy files are checked for changes at most once per this many seconds.
+_CHECK_INTERVAL = getattr(settings, 'POLICY_CHECK_INTERVAL', 5)
+# Per service: (time of last check, compiled rules).
+_COMPILED = {}
 
 
 def _get_enforcer():
@@ -57,6 +62,110 @@ def _get_enforcer():
 def reset():
     global _ENFORCER
     _ENFORCER = None
+    _COMPILED.clear()
+
+
+def _compile_check(check, compiled_rules, enforcer):
+    """Turns a tree of policy Check objects into a single function taking
+    ``(target, credentials)``, avoiding the interpretive tree walk.
+    """
+    if isinstance(check, policy.TrueCheck):
+        return lambda target, creds: True
+    if isinstance(check, policy.FalseCheck):
+        return lambda target, creds: False
+    if isinstance(check, policy.NotCheck):
+        inner = _compile_check(check.rule, compiled_rules, enforcer)
+        return lambda target, creds: not inner(target, creds)
+    if isinstance(check, policy.AndCheck):
+        inners = [_compile_check(rule, compiled_rules, enforcer)
+                  for rule in check.rules]
+        return lambda target, creds: all(f(target, creds) for f in inners)
+    if isinstance(check, policy.OrCheck):
+        inners = [_compile_check(rule, compiled_rules, enforcer)
+                  for rule in check.rules]
+        return lambda target, creds: any(f(target, creds) for f in inners)
+    if isinstance(check, policy.RuleCheck):
+        # Referenced rules are looked up when called, which copes with
+        # rules referring to each other in any order.
+        name = check.match
+
+        def rule_check(target, creds):
+            # As RuleCheck, fails closed for undefined rules and for rules
+            # needing a key missing from the target.
+            if name not in compiled_rules.rules:
+                return False
+            try:
+                return compiled_rules.get(name)(target, creds)
+            except KeyError:
+                return False
+        return rule_check
+    if isinstance(check, policy.RoleCheck):
+        role = check.match.lower()
+        return lambda target, creds: role in [r.lower()
+                                              for r in creds['roles']]
+    if type(check) is policy.GenericCheck:
+        kind, match = check.kind, check.match
+        if '%' not in match:
+            return lambda target, creds: (kind in creds and
+                                          match == unicode(creds[kind]))
+        return lambda target, creds: (kind in creds and
+                                      match % target == unicode(creds[kind]))
+    # Anything else (e.g. http: checks) is called as is.
+    return lambda target, creds: check(target, creds, enforcer)
+
+
+class _CompiledRules(dict):
+    """Compiles the rules of an enforcer on first use."""
+    def __init__(self, enforcer):
+        super(_CompiledRules, self).__init__()
+        self.enforcer = enforcer
+        self.rules = enforcer.rules
+
+    def get(self, name):
+        try:
+            return self[name]
+        except KeyError:
+            try:
+                check = self.rules[name]
+            except KeyError:
+                # If the rule doesn't exist, fail closed
+                func = lambda target, creds: False
+            else:
+                func = _compile_check(check, self, self.enforcer)
+            self[name] = func
+            return func
+
+
+def _get_compiled_rules(scope, enforcer):
+    now = time.time()
+    last_check, compiled = _COMPILED.get(scope, (None, None))
+    if last_check is None or now - last_check >= _CHECK_INTERVAL:
+        enforcer.load_rules()
+        last_check = now
+    if compiled is None or compiled.rules is not enforcer.rules:
+        compiled = _CompiledRules(enforcer)
+    _COMPILED[scope] = (last_check, compiled)
+    return compiled
+
+
+def _enforce(scope, enforcer, action, target, credentials):
+    compiled = _get_compiled_rules(scope, enforcer)
+    if not compiled.rules:
+        # No rules to reference means we're going to fail closed
+        return False
+    try:
+        return compiled.get(action)(target, credentials)
+    except KeyError:
+        return False
+
+
+def _target_key(target):
+    try:
+        key = tuple(sorted(target.items()))
+        hash(key)
+        return key
+    except TypeError:
+        return None
 
 
 def check(actions, request, target={}):
@@ -95,11 +204,27 @@ def check(actions, request, target={}):
 
     enforcer = _get_enforcer()
 
+    # The same checks are typically repeated for every row of a table, so
+    # decisions are cached for the duration of the request.
+    if not hasattr(request, '_policy_decisions'):
+        request._policy_decisions = {}
+    decisions = request._policy_decisions
+    target_key = _target_key(target)
+    creds_key = (credentials['user_id'], credentials['project_id'])
+
     for action in actions:
         scope, action = action[0], action[1]
         if scope in enforcer:
+            key = (scope, action, target_key, creds_key)
+            if target_key is None or key not in decisions:
+                result = bool(_enforce(scope, enforcer[scope], action,
+                                       target, credentials))
+                if target_key is not None:
+                    decisions[key] = result
+            else:
+                result = decisions[key]
             # if any check fails return failure
-            if not enforcer[scope].enforce(action, target, credentials):
+            if not result:
                 return False
         # if no policy for scope, allow action, underlying API will
         # ultimately block the action if not permitted, treat as though
@@ -95,6 +95,7 @@ OPENSTACK_IMAGE_BACKEND = {
 }
 
 MIDDLEWARE_CLASSES = (
+    'openstack_dashboard.middleware.APITracingMiddleware',
     'django.middleware.common.CommonMiddleware',
     'django.middleware.csrf.CsrfViewMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
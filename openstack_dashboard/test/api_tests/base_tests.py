@@ -20,6 +20,12 @@
 
 from __future__ import absolute_import
 
+import ast
+import datetime
+import os
+
+from django.test.utils import override_settings  # noqa
+
 from horizon import exceptions
 
 from openstack_dashboard.api import base as api_base
@@ -170,6 +176,81 @@ class ApiHelperTests(test.TestCase):
         with self.assertRaises(exceptions.ServiceCatalogException):
             url = api_base.url_for(self.request, 'image')
 
+    def test_url_for_catalog_indexed(self):
+        url = api_base.url_for(self.request, 'image')
+        self.assertEqual(url, 'http://public.glance.example.com:9292/v1')
+        index = api_base.get_catalog_index(self.request.user)
+        self.assertIs(index, api_base.get_catalog_index(self.request.user))
+
+        # A new catalog is indexed again.
+        self.request.user.service_catalog = [
+            service for service in self.request.user.service_catalog
+            if service['type'] != 'image']
+        with self.assertRaises(exceptions.ServiceCatalogException):
+            api_base.url_for(self.request, 'image')
+        self.assertIsNot(index, api_base.get_catalog_index(self.request.user))
+
+    def test_is_service_enabled(self):
+        self.assertTrue(api_base.is_service_enabled(self.request, 'compute'))
+        self.assertTrue(api_base.is_service_enabled(self.request, 'image'))
+        self.assertFalse(api_base.is_service_enabled(self.request,
+                                                     'notAnApi'))
+        service_name = api_base.get_service_from_catalog(
+            self.request.user.service_catalog, 'compute')['name']
+        self.assertTrue(api_base.is_service_enabled(self.request, 'compute',
+                                                    service_name))
+        self.assertFalse(api_base.is_service_enabled(self.request, 'compute',
+                                                     'bogus_name'))
+
+        self.request.user.services_region = "RegionTwo"
+        self.assertFalse(api_base.is_service_enabled(self.request, 'image'))
+        self.assertTrue(api_base.is_service_enabled(self.request, 'identity'))
+
+
+class PooledClientTests(test.TestCase):
+    def setUp(self):
+        super(PooledClientTests, self).setUp()
+        api_base.clear_client_pool()
+        self.addCleanup(api_base.clear_client_pool)
+
+    def _pooled_client(self, service, key=()):
+        return api_base.pooled_client(self.request, service, key, object)
+
+    @override_settings(API_CLIENT_POOL_SIZE=8)
+    def test_client_reused(self):
+        key = ('http://nova/',)
+        client = self._pooled_client('compute', key)
+        self.assertIs(client, self._pooled_client('compute', key))
+        self.assertIsNot(client, self._pooled_client('compute',
+                                                     ('http://nova2/',)))
+        self.assertIsNot(client, self._pooled_client('network', key))
+
+        self.request.user.token.id = 'another_token_id'
+        self.assertIsNot(client, self._pooled_client('compute', key))
+
+    @override_settings(API_CLIENT_POOL_SIZE=2)
+    def test_least_recently_used_client_dropped(self):
+        compute = self._pooled_client('compute')
+        network = self._pooled_client('network')
+        self.assertIs(compute, self._pooled_client('compute'))
+        image = self._pooled_client('image')
+
+        self.assertIs(compute, self._pooled_client('compute'))
+        self.assertIs(image, self._pooled_client('image'))
+        self.assertIsNot(network, self._pooled_client('network'))
+
+    @override_settings(API_CLIENT_POOL_SIZE=8)
+    def test_expired_token_client_dropped(self):
+        compute = self._pooled_client('compute')
+        self.request.user.token.expires = (datetime.datetime.utcnow() -
+                                           datetime.timedelta(minutes=1))
+        self._pooled_client('network')
+        self.assertIsNot(compute, self._pooled_client('compute'))
+
+    def test_pooling_disabled(self):
+        self.assertIsNot(self._pooled_client('compute'),
+                         self._pooled_client('compute'))
+
 
 class QuotaSetTests(test.TestCase):
 
@@ -213,3 +294,34 @@ class QuotaSetTests(test.TestCase):
     def test_quotaset_add_with_wrong_type(self):
         quota_set = api_base.QuotaSet({'foo': 1, 'bar': 10})
         self.assertRaises(ValueError, quota_set.add, {'test': 7})
+
+
+class LazyLoggingTests(test.TestCase):
+    def _eager_log_calls(self, path):
+        """Returns the line numbers of the ``LOG`` calls in the module at
+        ``path`` whose message is formatted with ``%`` before the call,
+        rather than by the logger, and only when the message is emitted.
+        """
+        with open(path) as module:
+            tree = ast.parse(module.read(), path)
+        return [node.lineno for node in ast.walk(tree)
+                if isinstance(node, ast.Call) and
+                isinstance(node.func, ast.Attribute) and
+                isinstance(node.func.value, ast.Name) and
+                node.func.value.id == 'LOG' and
+                node.args and
+                isinstance(node.args[0], ast.BinOp) and
+                isinstance(node.args[0].op, ast.Mod)]
+
+    def test_api_log_calls_are_lazy(self):
+        api_dir = os.path.dirname(api_base.__file__)
+        eager = []
+        for name in sorted(os.listdir(api_dir)):
+            if name.endswith('.py'):
+                path = os.path.join(api_dir, name)
+                eager.extend("%s:%s" % (name, lineno)
+                             for lineno in self._eager_log_calls(path))
+        self.assertEqual(eager, [],
+                         "Pass the arguments of these log messages to the "
+                         "logger instead of formatting them with %%: %s"
+                         % ", ".join(eager))
@@ -14,8 +14,12 @@
 # License for the specific language governing permissions and limitations
 # under the License.
 
+import datetime
+
+from ceilometerclient.v2 import statistics as ceilometer_statistics
 from django import http
 
+from mox import Func  # noqa
 from mox import IsA  # noqa
 
 from openstack_dashboard import api
@@ -159,8 +163,8 @@ class CeilometerApiTests(test.APITestCase):
     #TODO(lsmola)
     #test resource aggregates
 
-    @test.create_stubs({api.ceilometer.CeilometerUsage: ("get_user",
-                                                         "get_tenant")})
+    @test.create_stubs({api.keystone: ("user_get_many",
+                                       "tenant_get_many")})
     def test_global_data_get(self):
         class TempUsage(api.base.APIResourceWrapper):
             _attrs = ["id", "tenant", "user", "resource", "fake_meter_1",
@@ -191,10 +195,11 @@ class CeilometerApiTests(test.APITestCase):
                                          period=None, q=IsA(list)).\
             AndReturn(statistics)
 
-        api.ceilometer.CeilometerUsage\
-                .get_user(IsA(str)).AndReturn(user)
-        api.ceilometer.CeilometerUsage\
-                .get_tenant(IsA(str)).AndReturn(tenant)
+        # The owners are resolved once for all the resources.
+        api.keystone.user_get_many(http.HttpRequest, ['fake_user_id']) \
+            .AndReturn({'fake_user_id': user})
+        api.keystone.tenant_get_many(http.HttpRequest, ['fake_project_id']) \
+            .AndReturn({'fake_project_id': tenant})
 
         self.mox.ReplayAll()
 
@@ -215,8 +220,8 @@ class CeilometerApiTests(test.APITestCase):
         # check that only one resource is returned
         self.assertEqual(len(data), 1)
 
-    @test.create_stubs({api.ceilometer.CeilometerUsage: ("get_user",
-                                                         "get_tenant")})
+    @test.create_stubs({api.keystone: ("user_get_many",
+                                       "tenant_get_many")})
     def test_global_data_get_without_statistic_data(self):
         class TempUsage(api.base.APIResourceWrapper):
             _attrs = ["id", "tenant", "user", "resource", "fake_meter_1",
@@ -236,10 +241,11 @@ class CeilometerApiTests(test.APITestCase):
         ceilometerclient.resources = self.mox.CreateMockAnything()
         ceilometerclient.resources.list(q=IsA(list)).AndReturn(resources)
 
-        api.ceilometer.CeilometerUsage\
-                .get_user(IsA(str)).MultipleTimes().AndReturn(user)
-        api.ceilometer.CeilometerUsage\
-                .get_tenant(IsA(str)).MultipleTimes().AndReturn(tenant)
+        # The owners are resolved once for all the resources.
+        api.keystone.user_get_many(http.HttpRequest, ['fake_user_id']) \
+            .AndReturn({'fake_user_id': user})
+        api.keystone.tenant_get_many(http.HttpRequest, ['fake_project_id']) \
+            .AndReturn({'fake_project_id': tenant})
 
         self.mox.ReplayAll()
 
@@ -260,8 +266,8 @@ class CeilometerApiTests(test.APITestCase):
 
         self.assertEqual(len(data), len(resources))
 
-    @test.create_stubs({api.ceilometer.CeilometerUsage: ("get_user",
-                                                         "get_tenant")})
+    @test.create_stubs({api.keystone: ("user_get_many",
+                                       "tenant_get_many")})
     def test_global_data_get_all_statistic_data(self):
         class TempUsage(api.base.APIResourceWrapper):
             _attrs = ["id", "tenant", "user", "resource", "fake_meter_1",
@@ -289,10 +295,11 @@ class CeilometerApiTests(test.APITestCase):
             MultipleTimes().\
             AndReturn(statistics)
 
-        api.ceilometer.CeilometerUsage\
-                .get_user(IsA(str)).MultipleTimes().AndReturn(user)
-        api.ceilometer.CeilometerUsage\
-                .get_tenant(IsA(str)).MultipleTimes().AndReturn(tenant)
+        # The owners are resolved once for all the resources.
+        api.keystone.user_get_many(http.HttpRequest, ['fake_user_id']) \
+            .AndReturn({'fake_user_id': user})
+        api.keystone.tenant_get_many(http.HttpRequest, ['fake_project_id']) \
+            .AndReturn({'fake_project_id': tenant})
 
         self.mox.ReplayAll()
 
@@ -314,3 +321,86 @@ class CeilometerApiTests(test.APITestCase):
         self.assertEqual(vars(first.fake_meter_2[0]), vars(statistic_obj))
 
         self.assertEqual(len(data), len(resources))
+
+    def test_update_many_with_statistics_partial_failure(self):
+        resources = [api.ceilometer.Resource(resource)
+                     for resource in self.resources.list()[:2]]
+        statistics = self.statistics.list()
+
+        ceilometerclient = self.stub_ceilometerclient()
+        ceilometerclient.statistics = self.mox.CreateMockAnything()
+        ceilometerclient.statistics.list(meter_name="fake_meter_1",
+                                         period=None, q=IsA(list)).\
+            AndReturn(statistics)
+        ceilometerclient.statistics.list(meter_name="fake_meter_2",
+                                         period=None, q=IsA(list)).\
+            AndRaise(self.exceptions.ceilometer)
+        ceilometerclient.statistics.list(meter_name="fake_meter_1",
+                                         period=None, q=IsA(list)).\
+            AndRaise(self.exceptions.ceilometer)
+        ceilometerclient.statistics.list(meter_name="fake_meter_2",
+                                         period=None, q=IsA(list)).\
+            AndReturn(statistics)
+        self.mox.ReplayAll()
+
+        ceilometer_usage = api.ceilometer.CeilometerUsage(http.HttpRequest)
+        ceilometer_usage.update_many_with_statistics(
+            resources, meter_names=["fake_meter_1", "fake_meter_2"],
+            stats_attr="max")
+
+        self.assertEqual(resources[0].fake_meter_1, 9)
+        self.assertEqual(resources[0].fake_meter_2, None)
+        self.assertEqual(resources[1].fake_meter_1, None)
+        self.assertEqual(resources[1].fake_meter_2, 9)
+
+    def test_update_many_with_statistics_failure(self):
+        resources = [api.ceilometer.Resource(self.resources.first())]
+
+        ceilometerclient = self.stub_ceilometerclient()
+        ceilometerclient.statistics = self.mox.CreateMockAnything()
+        ceilometerclient.statistics.list(meter_name="fake_meter_1",
+                                         period=None, q=IsA(list)).\
+            AndRaise(self.exceptions.ceilometer)
+        self.mox.ReplayAll()
+
+        ceilometer_usage = api.ceilometer.CeilometerUsage(http.HttpRequest)
+        self.assertRaises(type(self.exceptions.ceilometer),
+                          ceilometer_usage.update_many_with_statistics,
+                          resources, meter_names=["fake_meter_1"])
+
+    def test_statistic_list_cached(self):
+        def statistic(period_start):
+            return ceilometer_statistics.Statistics(
+                ceilometer_statistics.StatisticsManager(None),
+                {'period': 3600, 'period_start': period_start, 'avg': 1})
+        statistics = [statistic('2013-01-01T00:00:00'),
+                      statistic('2013-01-01T01:00:00')]
+        start = datetime.datetime(2013, 1, 1)
+        query = [{'field': 'resource_id', 'op': 'eq', 'value': 'id'},
+                 {'field': 'timestamp', 'op': 'ge', 'value': start}]
+
+        def starts_at(timestamp):
+            return lambda q: q[-1]['value'] == timestamp
+
+        def starts_after(timestamp):
+            return lambda q: q[-1]['value'] > timestamp
+
+        ceilometerclient = self.stub_ceilometerclient()
+        ceilometerclient.statistics = self.mox.CreateMockAnything()
+        ceilometerclient.statistics.list(meter_name="memory", period=3600,
+                                         q=Func(starts_at(start))).\
+            AndReturn(statistics)
+        # Only the periods which weren't over are fetched again.
+        ceilometerclient.statistics.list(meter_name="memory", period=3600,
+                                         q=Func(starts_after(start))).\
+            AndReturn([])
+        self.mox.ReplayAll()
+
+        self.assertEqual(api.ceilometer.align_to_period(
+            datetime.datetime(2013, 1, 1, 0, 59), 3600), start)
+        ceilometer_usage = api.ceilometer.CeilometerUsage(self.request)
+        for i in range(2):
+            ret_list = ceilometer_usage.statistic_list("memory", query=query,
+                                                       period=3600)
+            self.assertEqual([s.period_start for s in ret_list],
+                             ['2013-01-01T00:00:00', '2013-01-01T01:00:00'])
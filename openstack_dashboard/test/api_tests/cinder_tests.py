@@ -14,6 +14,7 @@
 #    License for the specific language governing permissions and limitations
 #    under the License.
 
+from cinderclient.v1.contrib import list_extensions as cinder_list_extensions
 
 from openstack_dashboard import api
 from openstack_dashboard.test import helpers as test
@@ -54,3 +55,21 @@ class CinderApiTests(test.APITestCase):
         self.mox.ReplayAll()
 
         api.cinder.volume_snapshot_list(self.request)
+
+    def test_list_extensions_shared(self):
+        self.stub_cinderclient()
+        manager = cinder_list_extensions.ListExtManager(None)
+        extension = cinder_list_extensions.ListExtResource(
+            manager, {'name': 'SchedulerHints'})
+        self.mox.StubOutWithMock(cinder_list_extensions.ListExtManager,
+                                 'show_all')
+        cinder_list_extensions.ListExtManager.show_all() \
+            .AndReturn([extension])
+        self.mox.ReplayAll()
+
+        self.assertTrue(api.cinder.extension_supported(self.request,
+                                                       'SchedulerHints'))
+        # The extensions shared between users don't keep their client.
+        extensions = api.cinder.list_extensions(self.request)
+        self.assertEqual([ext.name for ext in extensions], ['SchedulerHints'])
+        self.assertTrue(all(ext.manager is None for ext in extensions))
@@ -20,6 +20,7 @@
 
 from __future__ import absolute_import
 
+from django.test.utils import override_settings  # noqa
 from keystoneclient.v2_0 import client as keystone_client
 
 from openstack_dashboard import api
@@ -85,6 +86,38 @@ class RoleAPITests(test.APITestCase):
         role = api.keystone.get_default_role(self.request)
 
 
+class TenantGetManyTests(test.APITestCase):
+    def test_tenant_get_many(self):
+        tenants = self.tenants.list()[:2]
+        keystoneclient = self.stub_keystoneclient()
+        keystoneclient.projects = self.mox.CreateMockAnything()
+        for tenant in tenants:
+            keystoneclient.projects.get(tenant.id).AndReturn(tenant)
+        keystoneclient.projects.get('missing') \
+            .AndRaise(self.exceptions.keystone)
+        self.mox.ReplayAll()
+
+        ids = [tenants[0].id, tenants[1].id, tenants[0].id, 'missing']
+        ret_val = api.keystone.tenant_get_many(self.request, ids)
+        self.assertEqual(ret_val, dict((t.id, t) for t in tenants))
+        # The tenants found are cached, a second call doesn't hit the API
+        # (it would show up in mox as an unexpected method call).
+        ret_val = api.keystone.tenant_get_many(self.request, ids[:2])
+        self.assertEqual(ret_val, dict((t.id, t) for t in tenants))
+
+    @override_settings(KEYSTONE_BULK_LOOKUP_THRESHOLD=1)
+    def test_tenant_get_many_lists_tenants(self):
+        tenants = self.tenants.list()
+        keystoneclient = self.stub_keystoneclient()
+        keystoneclient.projects = self.mox.CreateMockAnything()
+        keystoneclient.projects.list(domain=None, user=None).AndReturn(tenants)
+        self.mox.ReplayAll()
+
+        ids = [tenants[0].id, tenants[1].id, 'missing']
+        ret_val = api.keystone.tenant_get_many(self.request, ids)
+        self.assertEqual(ret_val, dict((t.id, t) for t in tenants[:2]))
+
+
 class ServiceAPITests(test.APITestCase):
     def test_service_wrapper(self):
         catalog = self.service_catalog
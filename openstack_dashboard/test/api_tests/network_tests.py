@@ -416,14 +416,21 @@ class NetworkApiNeutronFloatingIpTests(NetworkApiNeutronTestBase):
     def test_floating_ip_list(self):
         fips = self.api_q_floating_ips.list()
         filters = {'tenant_id': self.request.user.tenant_id}
+        assoc_port = self.api_ports.list()[1]
+        self.qclient.list_floatingips(**filters) \
+            .AndReturn({'floatingips': fips})
+        # Only the associated ports are fetched, once per request.
+        self.qclient.list_ports(id=[assoc_port['id']]) \
+            .AndReturn({'ports': [assoc_port]})
         self.qclient.list_floatingips(**filters) \
             .AndReturn({'floatingips': fips})
-        self.qclient.list_ports(**filters) \
-            .AndReturn({'ports': self.api_ports.list()})
         self.mox.ReplayAll()
 
         rets = api.network.tenant_floating_ip_list(self.request)
-        assoc_port = self.api_ports.list()[1]
+        self.assertEqual(
+            [ret.instance_id for ret in rets],
+            [ret.instance_id for ret in
+             api.neutron.FloatingIpManager(self.request).list()])
         self.assertEqual(len(fips), len(rets))
         for ret, exp in zip(rets, fips):
             for attr in ['id', 'ip', 'pool', 'fixed_ip', 'port_id']:
@@ -523,8 +530,9 @@ class NetworkApiNeutronFloatingIpTests(NetworkApiNeutronTestBase):
         servers = self.servers.list()
         novaclient = self.stub_novaclient()
         novaclient.servers = self.mox.CreateMockAnything()
-        search_opts = {'project_id': self.request.user.tenant_id}
-        novaclient.servers.list(True, search_opts).AndReturn(servers)
+        # Only the servers of the ports are fetched.
+        for server in servers[:2]:
+            novaclient.servers.get(server.id).AndReturn(server)
         self.mox.ReplayAll()
 
         rets = api.network.floating_ip_target_list(self.request)
@@ -533,6 +541,22 @@ class NetworkApiNeutronFloatingIpTests(NetworkApiNeutronTestBase):
             self.assertEqual(ret.id, exp[0])
             self.assertEqual(ret.name, exp[1])
 
+    def test_floating_ip_target_list_many_servers(self):
+        self.mox.stubs.Set(api.neutron, 'SERVER_GET_THRESHOLD', 1)
+        ports = self.api_ports.list()
+        filters = {'tenant_id': self.request.user.tenant_id}
+        self.qclient.list_ports(**filters).AndReturn({'ports': ports})
+        servers = self.servers.list()
+        novaclient = self.stub_novaclient()
+        novaclient.servers = self.mox.CreateMockAnything()
+        search_opts = {'project_id': self.request.user.tenant_id}
+        novaclient.servers.list(True, search_opts).AndReturn(servers)
+        self.mox.ReplayAll()
+
+        rets = api.network.floating_ip_target_list(self.request)
+        self.assertEqual([ret.name.split(':')[0] for ret in rets],
+                         ['server_1', 'server_2'])
+
     def test_floating_ip_target_get_by_instance(self):
         ports = self.api_ports.list()
         candidates = [p for p in ports if p['device_id'] == '1']
@@ -14,6 +14,9 @@
 #    License for the specific language governing permissions and limitations
 #    under the License.
 
+from django.contrib import messages
+from django.contrib.messages.storage import default_storage  # noqa
+
 from openstack_dashboard import api
 from openstack_dashboard.test import helpers as test
 
@@ -22,15 +25,69 @@ class NeutronApiTests(test.APITestCase):
     def test_network_list(self):
         networks = {'networks': self.api_networks.list()}
         subnets = {'subnets': self.api_subnets.list()}
+        subnet_ids = [s for n in self.api_networks.list()
+                      for s in n['subnets']]
 
         neutronclient = self.stub_neutronclient()
         neutronclient.list_networks().AndReturn(networks)
-        neutronclient.list_subnets().AndReturn(subnets)
+        # Only the subnets of the networks are fetched, all at once.
+        neutronclient.list_subnets(id=subnet_ids).AndReturn(subnets)
         self.mox.ReplayAll()
 
         ret_val = api.neutron.network_list(self.request)
         for n in ret_val:
             self.assertIsInstance(n, api.neutron.Network)
+            for subnet in n.subnets:
+                self.assertIsInstance(subnet, api.neutron.Subnet)
+
+    def test_network_list_subnets_not_accessed(self):
+        networks = {'networks': self.api_networks.list()}
+
+        neutronclient = self.stub_neutronclient()
+        neutronclient.list_networks().AndReturn(networks)
+        self.mox.ReplayAll()
+
+        ret_val = api.neutron.network_list(self.request)
+        self.assertEqual([n.name for n in ret_val],
+                         [n['name'] for n in self.api_networks.list()])
+
+    def test_network_list_for_tenant(self):
+        api_networks = self.api_networks.list()
+        subnets = {'subnets': self.api_subnets.list()}
+        subnet_ids = [s for n in api_networks for s in n['subnets']]
+
+        neutronclient = self.stub_neutronclient()
+        neutronclient.list_networks(tenant_id=self.tenant.id, shared=False) \
+            .AndReturn({'networks': api_networks[:1]})
+        neutronclient.list_networks(shared=True) \
+            .AndReturn({'networks': api_networks[1:]})
+        # The subnets of both lists are only fetched once.
+        neutronclient.list_subnets(id=subnet_ids).AndReturn(subnets)
+        self.mox.ReplayAll()
+
+        ret_val = api.neutron.network_list_for_tenant(self.request,
+                                                      self.tenant.id)
+        for n in ret_val:
+            for subnet in n.subnets:
+                self.assertIsInstance(subnet, api.neutron.Subnet)
+
+    def test_network_list_subnets_error(self):
+        api_networks = self.api_networks.list()
+        subnet_ids = [s for n in api_networks for s in n['subnets']]
+
+        neutronclient = self.stub_neutronclient()
+        neutronclient.list_networks().AndReturn({'networks': api_networks})
+        neutronclient.list_subnets(id=subnet_ids) \
+            .AndRaise(self.exceptions.neutron)
+        self.mox.ReplayAll()
+
+        self.request._messages = default_storage(self.request)
+        ret_val = api.neutron.network_list(self.request)
+        # The subnets are left out and the error is reported.
+        for n in ret_val:
+            self.assertEqual(n.subnets, [])
+        self.assertEqual([m.level for m in self.request._messages],
+                         [messages.ERROR])
 
     def test_network_get(self):
         network = {'network': self.api_networks.first()}
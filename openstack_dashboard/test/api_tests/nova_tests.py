@@ -26,6 +26,7 @@ from django import http
 from django.test.utils import override_settings  # noqa
 
 from mox import IsA  # noqa
+from novaclient.v1_1.contrib import list_extensions as nova_list_extensions
 from novaclient.v1_1 import servers
 
 from openstack_dashboard import api
@@ -196,6 +197,62 @@ class ComputeApiTests(test.APITestCase):
         ret_val = api.nova.server_get(self.request, server.id)
         self.assertIsInstance(ret_val, api.nova.Server)
 
+    def test_flavor_get_many(self):
+        flavors = self.flavors.list()
+        missing = flavors[2]
+
+        novaclient = self.stub_novaclient()
+        novaclient.flavors = self.mox.CreateMockAnything()
+        novaclient.flavors.get(missing.id).AndReturn(missing)
+        novaclient.flavors.get('unknown').AndRaise(self.exceptions.nova)
+        self.mox.ReplayAll()
+
+        flavor_ids = [flavors[0].id, missing.id, 'unknown', missing.id]
+        ret_val = api.nova.flavor_get_many(self.request, flavor_ids,
+                                           flavors=flavors[:2])
+        self.assertEqual(ret_val[flavors[0].id].get(), flavors[0])
+        self.assertEqual(ret_val[missing.id].get(), missing)
+        self.assertTrue(ret_val['unknown'].failed)
+
+        # Flavors that were found are cached across requests.
+        ret_val = api.nova.flavor_get_many(self.request, [missing.id])
+        self.assertEqual(ret_val[missing.id].get(), missing)
+
+    def test_flavor_list_shared(self):
+        flavors = self.flavors.list()
+
+        novaclient = self.stub_novaclient()
+        novaclient.flavors = self.mox.CreateMockAnything()
+        novaclient.flavors.list(is_public=True).AndReturn(flavors)
+        novaclient.flavors.list(is_public=True).AndReturn(flavors)
+        self.mox.ReplayAll()
+
+        ret_val = api.nova.flavor_list(self.request)
+        self.assertEqual(ret_val, flavors)
+        # The flavors shared between users don't keep their client.
+        self.assertTrue(all(flavor.manager is None for flavor in ret_val))
+        self.assertEqual(api.nova.flavor_list(self.request), flavors)
+        # The shared list can be bypassed.
+        self.assertEqual(api.nova.flavor_list(self.request, shared=False),
+                         flavors)
+
+    def test_list_extensions_shared(self):
+        self.stub_novaclient()
+        manager = nova_list_extensions.ListExtManager(None)
+        extension = nova_list_extensions.ListExtResource(
+            manager, {'name': 'AdminActions'})
+        self.mox.StubOutWithMock(nova_list_extensions.ListExtManager,
+                                 'show_all')
+        nova_list_extensions.ListExtManager.show_all().AndReturn([extension])
+        self.mox.ReplayAll()
+
+        self.assertTrue(api.nova.extension_supported('AdminActions',
+                                                     self.request))
+        # The extensions shared between users don't keep their client.
+        extensions = api.nova.list_extensions(self.request)
+        self.assertEqual([ext.name for ext in extensions], ['AdminActions'])
+        self.assertTrue(all(ext.manager is None for ext in extensions))
+
     def test_absolute_limits_handle_unlimited(self):
         values = {"maxTotalCores": -1, "maxTotalInstances": 10}
         limits = self.mox.CreateMockAnything()
@@ -20,6 +20,12 @@
 
 from __future__ import absolute_import
 
+import tempfile
+import urllib
+
+from django.test.utils import override_settings  # noqa
+
+import mox
 from mox import IsA  # noqa
 
 from horizon import exceptions
@@ -125,6 +131,36 @@ class SwiftApiTests(test.APITestCase):
         self.assertEqual(len(objs), len(objects))
         self.assertFalse(more)
 
+    @override_settings(API_RESULT_LIMIT=2)
+    def test_swift_filter_objects(self):
+        container = self.containers.first()
+        page_1 = [{'name': 'dir/abc.txt'}, {'subdir': 'dir/abd/'}]
+        page_2 = [{'name': 'dir/abe.jpg'}]
+
+        swift_api = self.stub_swiftclient()
+        swift_api.get_container(container.name,
+                                prefix='dir/ab',
+                                marker=None,
+                                limit=2,
+                                delimiter='/').AndReturn([{}, page_1])
+        swift_api.get_container(container.name,
+                                prefix='dir/ab',
+                                marker='dir/abd/',
+                                limit=2,
+                                delimiter='/').AndReturn([{}, page_2])
+        self.mox.ReplayAll()
+
+        objs = api.swift.swift_filter_objects(self.request,
+                                              'ab*t',
+                                              container.name,
+                                              prefix='dir/')
+        self.assertEqual([obj.name for obj in objs], ['dir/abc.txt'])
+
+    def test_wildcard_search(self):
+        self.assertTrue(api.swift.wildcard_search('abcdef', 'b*e'))
+        self.assertTrue(api.swift.wildcard_search('abcdef', ''))
+        self.assertFalse(api.swift.wildcard_search('abcdef', 'e*b'))
+
     def test_swift_get_object_with_data(self):
         container = self.containers.first()
         object = self.objects.first()
@@ -140,6 +176,49 @@ class SwiftApiTests(test.APITestCase):
                                          object.name)
         self.assertEqual(obj.name, object.name)
 
+    def test_swift_get_object_chunked(self):
+        container = self.containers.first()
+        object = self.objects.first()
+        chunks = iter([object.data[:4], object.data[4:]])
+        headers = {'content-length': len(object.data),
+                   'content-range': 'bytes 0-8/9'}
+
+        swift_api = self.stub_swiftclient()
+        swift_api.get_object(container.name, object.name,
+                             resp_chunk_size=4,
+                             headers={'Range': 'bytes=0-'}) \
+            .AndReturn([headers, chunks])
+
+        self.mox.ReplayAll()
+
+        obj = api.swift.swift_get_object(self.request,
+                                         container.name,
+                                         object.name,
+                                         resp_chunk_size=4,
+                                         byte_range='bytes=0-')
+        self.assertEqual(''.join(obj.data), object.data)
+        self.assertEqual(obj.content_range, 'bytes 0-8/9')
+
+    @override_settings(API_CLIENT_POOL_SIZE=4)
+    def test_swift_get_object_chunked_not_pooled(self):
+        container = self.containers.first()
+        object = self.objects.first()
+        api.base.clear_client_pool()
+
+        # Each streamed download gets a connection of its own.
+        swift_api = self.stub_swiftclient(expected_calls=2)
+        for i in range(2):
+            swift_api.get_object(container.name, object.name,
+                                 resp_chunk_size=4) \
+                .AndReturn([{}, iter([object.data])])
+
+        self.mox.ReplayAll()
+
+        for i in range(2):
+            api.swift.swift_get_object(self.request, container.name,
+                                       object.name, resp_chunk_size=4)
+        api.base.clear_client_pool()
+
     def test_swift_get_object_without_data(self):
         container = self.containers.first()
         object = self.objects.first()
@@ -174,6 +253,8 @@ class SwiftApiTests(test.APITestCase):
         swift_api.put_object(container.name,
                              obj.name,
                              IsA(FakeFile),
+                             content_length=len(obj.data),
+                             chunk_size=api.swift.CHUNK_SIZE,
                              headers=headers)
         self.mox.ReplayAll()
 
@@ -182,6 +263,100 @@ class SwiftApiTests(test.APITestCase):
                                       obj.name,
                                       FakeFile())
 
+    @override_settings(SWIFT_SEGMENT_UPLOAD_CONCURRENCY=1)
+    def test_swift_upload_object_segmented(self):
+        container = self.containers.first()
+        obj = self.objects.first()
+        segments_name = '%s_segments' % container.name
+        fake_name = 'fake_object.jpg'
+        temp_file = tempfile.NamedTemporaryFile()
+        temp_file.write(obj.data)
+        temp_file.flush()
+
+        class FakeFile(object):
+            def __init__(self):
+                self.name = fake_name
+                self.size = len(obj.data)
+
+            def temporary_file_path(self):
+                return temp_file.name
+
+        self.mox.stubs.Set(api.swift, 'SEGMENT_SIZE', 5)
+        uploaded = []
+
+        def upload(container_name, segment_name, segment, **kwargs):
+            uploaded.append(segment.read())
+            return True
+
+        swift_api = self.stub_swiftclient(expected_calls=4)
+        swift_api.put_container(segments_name)
+        for i in range(2):
+            swift_api.put_object(segments_name,
+                                 mox.StrContains('/%08d' % i),
+                                 mox.IgnoreArg(),
+                                 content_length=mox.IgnoreArg(),
+                                 chunk_size=api.swift.CHUNK_SIZE) \
+                .WithSideEffects(upload)
+        swift_api.put_object(container.name,
+                             obj.name,
+                             '',
+                             content_length=0,
+                             headers=mox.ContainsKeyValue(
+                                 'X-Object-Manifest',
+                                 mox.StrContains(urllib.quote(
+                                     segments_name.encode('utf-8')))))
+        self.mox.ReplayAll()
+
+        api.swift.swift_upload_object(self.request,
+                                      container.name,
+                                      obj.name,
+                                      FakeFile())
+        self.assertEqual(''.join(uploaded), obj.data)
+
+    @override_settings(SWIFT_SEGMENT_UPLOAD_CONCURRENCY=1)
+    def test_swift_upload_object_segmented_error(self):
+        container = self.containers.first()
+        obj = self.objects.first()
+        segments_name = '%s_segments' % container.name
+        temp_file = tempfile.NamedTemporaryFile()
+        temp_file.write(obj.data)
+        temp_file.flush()
+
+        class FakeFile(object):
+            def __init__(self):
+                self.name = 'fake_object.jpg'
+                self.size = len(obj.data)
+
+            def temporary_file_path(self):
+                return temp_file.name
+
+        self.mox.stubs.Set(api.swift, 'SEGMENT_SIZE', 5)
+
+        swift_api = self.stub_swiftclient(expected_calls=4)
+        swift_api.put_container(segments_name)
+        swift_api.put_object(segments_name,
+                             mox.StrContains('/%08d' % 0),
+                             mox.IgnoreArg(),
+                             content_length=mox.IgnoreArg(),
+                             chunk_size=api.swift.CHUNK_SIZE)
+        swift_api.put_object(segments_name,
+                             mox.StrContains('/%08d' % 1),
+                             mox.IgnoreArg(),
+                             content_length=mox.IgnoreArg(),
+                             chunk_size=api.swift.CHUNK_SIZE) \
+            .AndRaise(self.exceptions.swift)
+        # The segment uploaded is deleted, and no manifest is created.
+        swift_api.delete_object(segments_name,
+                                mox.StrContains('/%08d' % 0))
+        self.mox.ReplayAll()
+
+        self.assertRaises(self.exceptions.swift.__class__,
+                          api.swift.swift_upload_object,
+                          self.request,
+                          container.name,
+                          obj.name,
+                          FakeFile())
+
     def test_swift_object_exists(self):
         container = self.containers.first()
         obj = self.objects.first()
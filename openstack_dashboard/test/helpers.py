@@ -49,6 +49,7 @@ from openstack_auth import utils
 
 from horizon import middleware
 from horizon.test import helpers as horizon_helpers
+from horizon.utils import memoized
 
 from openstack_dashboard import api
 from openstack_dashboard import context_processors
@@ -117,6 +118,7 @@ class TestCase(horizon_helpers.TestCase):
       * Several handy additional assertion methods.
     """
     def setUp(self):
+        memoized.clear_shared_caches()
         test_utils.load_test_data(self)
         self.mox = mox.Mox()
         self.factory = RequestFactoryWithMessages()
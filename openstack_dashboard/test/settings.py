@@ -92,6 +92,18 @@ AVAILABLE_REGIONS = [
     ('http://remote:5000/v2.0', 'remote'),
 ]
 
+# Make independent API calls one after the other, so that the order in which
+# stubbed out calls are made is deterministic.
+API_CONCURRENCY = 1
+
+# Build a new client for every API call, so that tests may expect (and stub
+# out) each of them.
+API_CLIENT_POOL_SIZE = 0
+
+# Render pages in one piece, so that the stubbed out calls are all made, and
+# the messages all added, by the time the view returns.
+PROGRESSIVE_RENDERING = False
+
 OPENSTACK_API_VERSIONS = {
     "identity": 3
 }
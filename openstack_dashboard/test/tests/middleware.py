@@ -0,0 +1,121 @@
+# vim: tabstop=4 shiftwidth=4 softtabstop=4
+
+#    Licensed under the Apache License, Version 2.0 (the "License"); you may
+#    not use this file except in compliance with the License. You may obtain
+#    a copy of the License at
+#
+#         http://www.apache.org/licenses/LICENSE-2.0
+#
+#    Unless required by applicable law or agreed to in writing, software
+#    distributed under the License is distributed on an "AS IS" BASIS, WITHOUT
+#    WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied. See the
+#    License for the specific language governing permissions and limitations
+#    under the License.
+
+import json
+
+from django.core.exceptions import MiddlewareNotUsed  # noqa
+from django import http
+from django.test.utils import override_settings  # noqa
+
+from openstack_dashboard import api
+from openstack_dashboard.api import tracing
+from openstack_dashboard import middleware
+from openstack_dashboard.test import helpers as test
+
+
+def server_list(request, fail=False):
+    if fail:
+        raise ValueError()
+    flavor_list(request)
+    return ['server'] * 3, False
+
+
+def flavor_list(request):
+    return ['flavor']
+
+
+server_list = tracing.trace(server_list, 'nova')
+flavor_list = tracing.trace(flavor_list, 'nova')
+
+
+class APITracingTests(test.TestCase):
+    def test_api_functions_traced(self):
+        self.assertTrue(getattr(api.nova.flavor_list, 'traced', False))
+        self.assertTrue(getattr(api.network.tenant_floating_ip_list,
+                                'traced', False))
+        self.assertFalse(getattr(api.base.url_for, 'traced', False))
+
+    def test_not_traced(self):
+        request = self.factory.get('/')
+        self.assertEqual(flavor_list(request), ['flavor'])
+        self.assertEqual(tracing.get_calls(request), [])
+
+    def test_trace(self):
+        request = self.factory.get('/')
+        tracing.start(request)
+        server_list(request)
+        flavor_list(request=request)
+        self.assertRaises(ValueError, server_list, request, fail=True)
+
+        calls = tracing.get_calls(request)
+        # The nested call to flavor_list() isn't recorded.
+        self.assertEqual([(call.service, call.function, call.status,
+                           call.size) for call in calls],
+                         [('nova', 'server_list', 'ok', 3),
+                          ('nova', 'flavor_list', 'ok', 1),
+                          ('nova', 'server_list', 'ValueError', None)])
+
+    @override_settings(API_TRACING=False)
+    def test_middleware_not_used(self):
+        self.assertRaises(MiddlewareNotUsed, middleware.APITracingMiddleware)
+
+    @override_settings(API_TRACING=True, API_TRACING_PANEL=True)
+    def test_middleware(self):
+        tracing_middleware = middleware.APITracingMiddleware()
+        request = self.factory.get('/')
+        tracing_middleware.process_request(request)
+        server_list(request)
+        server_list(request)
+        flavor_list(request)
+        logged = []
+        self.mox.stubs.Set(middleware.LOG, 'isEnabledFor', lambda level: True)
+        self.mox.stubs.Set(middleware.LOG, 'info',
+                           lambda msg, summary: logged.append(summary))
+
+        response = tracing_middleware.process_response(
+            request, http.HttpResponse("<html><body></body></html>"))
+
+        self.assertTrue(response['Server-Timing'].startswith(
+            'nova;dur='))
+        self.assertIn(';desc="3 calls", total;dur=', response['Server-Timing'])
+        self.assertIn('id="api_tracing"', response.content)
+        self.assertTrue(response.content.endswith("</body></html>"))
+        summary = json.loads(logged[0])
+        self.assertEqual(summary['calls'], 3)
+        self.assertEqual(summary['services']['nova']['calls'], 3)
+        self.assertEqual(summary['repeated'], {'nova.server_list': 2})
+
+    @override_settings(API_TRACING=True)
+    def test_middleware_streaming(self):
+        tracing_middleware = middleware.APITracingMiddleware()
+        request = self.factory.get('/')
+        tracing_middleware.process_request(request)
+        logged = []
+        self.mox.stubs.Set(middleware.LOG, 'isEnabledFor', lambda level: True)
+        self.mox.stubs.Set(middleware.LOG, 'info',
+                           lambda msg, summary: logged.append(summary))
+
+        def content():
+            yield "<html><body>"
+            # Called while the response is sent.
+            flavor_list(request)
+            yield "</body></html>"
+
+        response = tracing_middleware.process_response(
+            request, http.StreamingHttpResponse(content()))
+
+        self.assertEqual(logged, [])
+        self.assertEqual("".join(response.streaming_content),
+                         "<html><body></body></html>")
+        self.assertEqual(json.loads(logged[0])['calls'], 1)
@@ -14,6 +14,12 @@
 #    License for the specific language governing permissions and limitations
 #    under the License.
 
+import json
+
+from mox import IgnoreArg  # noqa
+
+from openstack_auth import utils as auth_utils
+
 from openstack_dashboard import policy
 from openstack_dashboard.test import helpers as test
 
@@ -77,3 +83,48 @@ class PolicyTestCaseAdmin(test.BaseAdminViewTests):
         value = policy.check((("compute", "admin__or_owner"),),
                              request=self.request)
         self.assertTrue(value)
+
+    def test_compiled_rules_match_enforcer(self):
+        policy.reset()
+        enforcer = policy._get_enforcer()['compute']
+        enforcer.load_rules()
+        credentials = policy._user_to_credentials(
+            self.request, auth_utils.get_user(self.request))
+        targets = ({}, {'project_id': credentials['project_id']},
+                   {'project_id': 'other_project'})
+        for rule in enforcer.rules:
+            for target in targets:
+                self.assertEqual(
+                    bool(enforcer.enforce(rule, target, credentials)),
+                    bool(policy._enforce('compute', enforcer, rule, target,
+                                         credentials)),
+                    "Mismatch for rule %s and target %s" % (rule, target))
+
+    def test_compiled_rule_check_fails_closed(self):
+        rules = policy.policy.Rules.load_json(json.dumps({
+            "owner": "project_id:%(project_id)s",
+            "a": "rule:owner or role:admin",
+            "b": "rule:undefined or role:admin"}))
+        enforcer = policy.policy.Enforcer(rules=rules)
+        self.mox.stubs.Set(enforcer, 'load_rules', lambda *args: None)
+        credentials = policy._user_to_credentials(
+            self.request, auth_utils.get_user(self.request))
+        for rule in ("a", "b"):
+            # The target lacks the project_id the owner rule needs.
+            interpreted = enforcer.enforce(rule, {}, credentials)
+            compiled = policy._CompiledRules(enforcer).get(rule)
+            self.assertTrue(interpreted)
+            self.assertEqual(bool(compiled({}, credentials)),
+                             bool(interpreted))
+
+    def test_check_decisions_cached(self):
+        policy.reset()
+        self.mox.StubOutWithMock(policy, '_enforce')
+        policy._enforce('identity', IgnoreArg(), 'admin_required', {},
+                        IgnoreArg()).AndReturn(False)
+        self.mox.ReplayAll()
+
+        for i in range(3):
+            value = policy.check((("identity", "admin_required"),),
+                                 request=self.request)
+            self.assertFalse(value)
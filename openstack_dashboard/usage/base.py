@@ -392,6 +392,8 @@ if VERSION >= (1, 5, 0):
             return buf
 
         def get_content(self):
+            # The header is sent straight away, and each row as soon as it
+            # is produced, so the whole file is never held in memory.
             if self.header:
                 self.out.write(self.encode(self.header))
 
@@ -405,3 +407,8 @@ if VERSION >= (1, 5, 0):
         def get_row_data(self):
             raise NotImplementedError("You must define a get_row_data method "
                                       "on %s" % self.__class__.__name__)
+
+else:
+    # StreamingHttpResponse is only available as of Django 1.5, older
+    # versions build the whole file before sending it.
+    BaseCsvStreamingResponse = BaseCsvResponse
@@ -195,18 +195,19 @@ def tenant_quota_usages(request):
 
     # Get our usages.
     floating_ips = network.tenant_floating_ip_list(request)
-    flavors = dict([(f.id, f) for f in nova.flavor_list(request)])
+    flavors = nova.flavor_list(request)
     instances, has_more = nova.server_list(request)
     # Fetch deleted flavors if necessary.
-    missing_flavors = [instance.flavor['id'] for instance in instances
-                       if instance.flavor['id'] not in flavors]
-    for missing in missing_flavors:
-        if missing not in flavors:
-            try:
-                flavors[missing] = nova.flavor_get(request, missing)
-            except Exception:
-                flavors[missing] = {}
-                exceptions.handle(request, ignore=True)
+    flavor_results = nova.flavor_get_many(
+        request, [instance.flavor['id'] for instance in instances],
+        flavors=flavors)
+    flavors = {}
+    for flavor_id, result in flavor_results.items():
+        try:
+            flavors[flavor_id] = result.get()
+        except Exception:
+            flavors[flavor_id] = {}
+            exceptions.handle(request, ignore=True)
 
     usages.tally('instances', len(instances))
     usages.tally('floating_ips', len(floating_ips))
@@ -41,7 +41,10 @@ class UsageView(tables.DataTableView):
         project_id = self.kwargs.get('project_id', self.request.user.tenant_id)
         self.usage = self.usage_class(self.request, project_id)
         self.usage.summarize(*self.usage.get_date_range())
-        self.usage.get_limits()
+        # Limits are only displayed on the HTML page, don't hold up the
+        # start of CSV downloads with them.
+        if self.request.GET.get('format', 'html') != 'csv':
+            self.usage.get_limits()
         self.kwargs['usage'] = self.usage
         return self.usage.usage_list
 